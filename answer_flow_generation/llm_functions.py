@@ -1,13 +1,20 @@
-from openai import OpenAI
 from dotenv import load_dotenv
 import yaml
 import os
+import sys
 import json
 import re
 
+# 프로젝트 루트를 path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from llm_gateway import create_client
+
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # load prompt
 try:
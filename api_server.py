@@ -0,0 +1,367 @@
+"""
+헤드리스 HTTP API (ASGI)
+
+Gradio 화면 없이 각 llm_functions 진입점을 JSON / SSE로 제공하는 서비스입니다.
+백엔드 서비스가 화면을 긁거나 모듈을 직접 import해 초기화 부작용(클라이언트 생성, 프롬프트 로드)을 떠안지 않도록
+한 프로세스가 모듈을 한 번만 로드하고, Gradio와 같은 게이트웨이(레이트 리미터), 응답 캐시, 워크로드 스케줄러를 공유합니다.
+Gradio 큐/웹소켓과 컴포넌트 직렬화를 거치지 않으므로 비 UI 클라이언트의 처리량이 높습니다.
+
+엔드포인트:
+    GET  /health                 상태 확인
+    GET  /v1/status              워크로드 클래스별 대기/실행 현황과 모델별 호출 메트릭
+    POST /v1/{name}              JSON 요청 -> JSON 결과 (JSON_ENDPOINTS)
+    POST /v1/batch/{name}        {"items": [요청, ...]} -> 항목별 결과 (동시 실행, 일부 실패 허용)
+    POST /v1/stream/{name}       SSE 스트리밍 (STREAM_ENDPOINTS)
+        event: queued  {"position", "eta_seconds"}
+        event: delta   {"text"}  (dossier는 event: snapshot, 지금까지의 전체 문서)
+        event: done    {"text"}  최종 전체 텍스트
+        event: error   {"error"}
+    대기열이 가득 차면 429, 필수 필드가 없으면 422를 반환합니다.
+    SSE 연결이 끊기면 업스트림 LLM 스트림을 바로 닫습니다.
+
+사용법:
+    python api_server.py --port 8000
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+
+설정: API_BATCH_MAX_ITEMS (기본 100), API_BATCH_CONCURRENCY (기본: 워크로드 클래스 동시 실행 수)
+"""
+
+import os
+import sys
+import json
+import uuid
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import yaml
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from feature_modules import feature_dir, load_feature_module
+from workload_scheduler import FEATURE_WORKLOADS, QueueFullError, get_scheduler
+from llm_gateway import cancel_streams, create_client
+from llm_policy import get_metrics
+
+load_dotenv()
+
+API_BATCH_MAX_ITEMS = int(os.getenv("API_BATCH_MAX_ITEMS", "100"))
+API_BATCH_CONCURRENCY = int(os.getenv("API_BATCH_CONCURRENCY", "0"))
+
+scheduler = get_scheduler()
+
+
+class MissingFieldsError(ValueError):
+    """요청 본문에 필수 필드가 없는 경우"""
+
+    def __init__(self, fields):
+        super().__init__(f"필수 필드가 없습니다: {', '.join(fields)}")
+        self.fields = fields
+
+
+def _require(payload, fields):
+    missing = [field for field in fields if payload.get(field) in (None, "")]
+    if missing:
+        raise MissingFieldsError(missing)
+
+
+def _module(feature):
+    module = load_feature_module(feature)
+    if module is None:
+        raise RuntimeError(f"{feature} 기능 모듈을 불러오지 못했습니다.")
+    return module
+
+
+# --- JSON 엔드포인트 ---
+
+def _industry(payload):
+    markdown, tags = _module("industry").classify_industry(
+        payload["job_title"], payload["company_name"], use_local=payload.get("use_local", True))
+    return {"markdown": markdown, "tags": tags}
+
+
+def _company_size(payload):
+    markdown, category = _module("company_size").analyze_company_size(
+        payload["company_name"], force_refresh=payload.get("force_refresh", False))
+    return {"markdown": markdown, "category": category}
+
+
+def _context_report(payload):
+    result = _module("jasoseo").generate_context_report(
+        payload["job_title"], payload["company_name"], payload.get("experience_level", "신입"))
+    return {"markdown": result[0], "report": result[1] if len(result) > 1 else {}}
+
+
+def _jd_recommendation(payload):
+    result = _module("jd_rec").generate_jd_recommendation(
+        payload["job_title"], payload["company_name"], payload.get("experience_level", "신입"))
+    return {"markdown": result[0], "jd": result[1]}
+
+
+def _interview_questions(payload):
+    result = _module("commonly_asked").generate_interview_questions(
+        payload["company_name"], payload["job_title"], payload.get("experience_level", "신입"),
+        payload.get("selected_questions", []), payload.get("num_questions", 3))
+    return {"markdown": result[0], "questions": result[1]}
+
+
+_question_rec_lock = threading.Lock()
+_question_rec = {}
+
+
+def _question_recommendation(payload):
+    with _question_rec_lock:
+        if not _question_rec:
+            with open(feature_dir("question_rec") / "prompt.yaml", "r", encoding="utf-8") as f:
+                _question_rec["prompts"] = yaml.safe_load(f)
+            _question_rec["client"] = create_client(api_key=os.getenv("OPENAI_API_KEY"))
+    module = _module("question_rec")
+    result, _ = module.generate_question_recommendation(
+        _question_rec["client"], _question_rec["prompts"],
+        payload["job_title"], payload["company_name"], payload.get("experience_level", "신입"))
+    return module.parse_question_recommendation(result)
+
+
+def _guide(payload):
+    from guide_generation.llm_functions import generate_guide
+    guide, _ = generate_guide(payload["question"], payload["jd"], payload["company_name"], payload.get("experience_level", "신입"))
+    return guide
+
+
+def _answer_flow(payload):
+    from answer_flow_generation.llm_functions import generate_answer_flow
+    flow, _ = generate_answer_flow(payload["question"], payload["jd"], payload["company_name"],
+                                   payload.get("experience_level", "신입"), payload.get("conversation", ""))
+    return flow
+
+
+def _company_context(payload):
+    from company_context import build_company_context
+    return build_company_context(payload["company_name"], payload["job_title"], payload.get("experience_level", "신입"))
+
+
+# 이름 -> (워크로드 클래스, 필수 필드, 처리 함수)
+JSON_ENDPOINTS = {
+    "industry": (FEATURE_WORKLOADS["industry"], ("job_title", "company_name"), _industry),
+    "company_size": (FEATURE_WORKLOADS["company_size"], ("company_name",), _company_size),
+    "context_report": (FEATURE_WORKLOADS["jasoseo"], ("job_title", "company_name"), _context_report),
+    "jd_recommendation": (FEATURE_WORKLOADS["jd_rec"], ("job_title", "company_name"), _jd_recommendation),
+    "interview_questions": (FEATURE_WORKLOADS["commonly_asked"], ("job_title", "company_name"), _interview_questions),
+    "question_recommendation": (FEATURE_WORKLOADS["question_rec"], ("job_title", "company_name"), _question_recommendation),
+    "guide": ("generation", ("question", "jd", "company_name"), _guide),
+    "answer_flow": ("generation", ("question", "jd", "company_name"), _answer_flow),
+    "company_context": ("web_search", ("job_title", "company_name"), _company_context),
+}
+
+
+# --- SSE 엔드포인트 ---
+
+def _interviewer(payload, cancel_key):
+    from chat.llm_functions import get_interviewer_response
+    return get_interviewer_response(payload["example_info"], cancel_key=cancel_key)
+
+
+def _student(payload, cancel_key):
+    from chat.llm_functions import get_student_response
+    return get_student_response(payload["example_info"], cancel_key=cancel_key)
+
+
+def _cover_letter(payload, cancel_key):
+    from chat.llm_functions import generate_cover_letter_response
+    return generate_cover_letter_response(
+        payload["question"], payload.get("conversation_history", []), payload["example_info"],
+        payload.get("flow", ""), payload.get("word_limit", 300), cancel_key=cancel_key)
+
+
+def _memory(payload, cancel_key):
+    from chat.llm_functions import generate_memory
+    return generate_memory(payload["conversation_history"], payload.get("current_memory", ""), cancel_key=cancel_key)
+
+
+def _dossier(payload, cancel_key):
+    from dossier import generate_dossier
+    return generate_dossier(payload["job_title"], payload["company_name"],
+                            payload.get("experience_level", "신입"), payload.get("force_refresh", False))
+
+
+# 이름 -> (워크로드 클래스, 필수 필드, 생성기 함수, 출력 방식: delta=조각 / snapshot=전체 문서)
+STREAM_ENDPOINTS = {
+    "interviewer": ("chat_stream", ("example_info",), _interviewer, "delta"),
+    "student": ("chat_stream", ("example_info",), _student, "delta"),
+    "cover_letter": ("chat_stream", ("question", "example_info"), _cover_letter, "delta"),
+    "memory": ("chat_stream", ("conversation_history",), _memory, "delta"),
+    "dossier": (FEATURE_WORKLOADS["dossier"], ("job_title", "company_name"), _dossier, "snapshot"),
+}
+
+
+def run_json_endpoint(name, payload):
+    """
+    JSON 엔드포인트 하나를 워크로드 클래스 슬롯 안에서 실행합니다. (배치에서도 사용)
+    """
+    workload, required, handler = JSON_ENDPOINTS[name]
+    _require(payload, required)
+    return scheduler.run(workload, handler, payload)
+
+
+def run_batch(name, items, concurrency=None):
+    """
+    항목별 결과 [{"ok": True, "result": ...} | {"ok": False, "error": ...}]를 입력 순서대로 반환합니다.
+    동시 실행 수는 워크로드 클래스의 동시 실행 수를 넘지 않아 배치 하나가 대기열을 가득 채우지 않습니다.
+    """
+    workload = JSON_ENDPOINTS[name][0]
+    limit = concurrency or API_BATCH_CONCURRENCY or scheduler.classes[workload].concurrency
+    limit = max(1, min(limit, scheduler.classes[workload].concurrency, len(items) or 1))
+
+    def run_one(item):
+        try:
+            return {"ok": True, "result": run_json_endpoint(name, item)}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+        return list(executor.map(run_one, items))
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+app = FastAPI(title="jasoseo-agent API")
+
+
+async def _read_json(request):
+    try:
+        payload = await request.json()
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _error(status, message):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+@app.on_event("startup")
+async def configure_thread_pool():
+    # 동기 핸들러와 SSE의 next() 호출은 스레드 풀에서 돌므로 워크로드 클래스 전체 용량만큼 스레드를 둡니다.
+    from anyio import to_thread
+    to_thread.current_default_thread_limiter().total_tokens = scheduler.total_capacity() + 10
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/v1/status")
+async def status():
+    workloads = {name: workload.snapshot() for name, workload in scheduler.classes.items()}
+    return {"workloads": workloads, "models": get_metrics()}
+
+
+@app.post("/v1/batch/{name}")
+async def batch(name: str, request: Request):
+    if name not in JSON_ENDPOINTS:
+        return _error(404, f"알 수 없는 엔드포인트: {name}")
+    payload = await _read_json(request)
+    items = payload.get("items") if payload else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return _error(422, "items는 요청 객체의 목록이어야 합니다.")
+    if len(items) > API_BATCH_MAX_ITEMS:
+        return _error(413, f"배치는 최대 {API_BATCH_MAX_ITEMS}건까지 가능합니다.")
+    results = await run_in_threadpool(run_batch, name, items, payload.get("concurrency"))
+    return {"results": results, "succeeded": sum(1 for r in results if r["ok"]), "failed": sum(1 for r in results if not r["ok"])}
+
+
+@app.post("/v1/stream/{name}")
+async def stream(name: str, request: Request):
+    if name not in STREAM_ENDPOINTS:
+        return _error(404, f"알 수 없는 스트리밍 엔드포인트: {name}")
+    payload = await _read_json(request)
+    if payload is None:
+        return _error(422, "JSON 객체 본문이 필요합니다.")
+    workload, required, factory, mode = STREAM_ENDPOINTS[name]
+    try:
+        _require(payload, required)
+    except MissingFieldsError as e:
+        return _error(422, str(e))
+
+    cancel_key = f"api-{uuid.uuid4().hex}"
+    frames = scheduler.stream(workload, factory, payload, cancel_key, iterate=True)
+    # 첫 프레임(대기 순번 또는 첫 조각)을 미리 받아 대기열 초과를 SSE 시작 전에 429로 알립니다.
+    try:
+        first = await run_in_threadpool(next, frames, None)
+    except QueueFullError as e:
+        return _error(429, str(e))
+    except Exception as e:
+        cancel_streams(cancel_key)
+        return _error(500, str(e))
+
+    async def events():
+        text = ""
+        item = first
+        try:
+            while item is not None:
+                kind, value = item
+                if kind == "queued":
+                    yield _sse("queued", {"position": value[0], "eta_seconds": round(value[1], 1)})
+                elif mode == "snapshot":
+                    text = value
+                    yield _sse("snapshot", {"text": value})
+                elif value:
+                    text += value
+                    yield _sse("delta", {"text": value})
+                if await request.is_disconnected():
+                    return
+                item = await run_in_threadpool(next, frames, None)
+            yield _sse("done", {"text": text})
+        except Exception as e:
+            yield _sse("error", {"error": str(e)})
+        finally:
+            # 클라이언트가 끊었거나 오류가 나면 업스트림 스트림을 닫고 슬롯을 돌려줍니다.
+            cancel_streams(cancel_key)
+            try:
+                await run_in_threadpool(frames.close)
+            except ValueError:
+                # 다른 스레드에서 아직 next()가 돌고 있으면 취소된 스트림이 곧 끝나며 슬롯을 돌려줍니다.
+                pass
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/v1/{name}")
+async def call(name: str, request: Request):
+    if name not in JSON_ENDPOINTS:
+        return _error(404, f"알 수 없는 엔드포인트: {name}")
+    payload = await _read_json(request)
+    if payload is None:
+        return _error(422, "JSON 객체 본문이 필요합니다.")
+    try:
+        return {"result": await run_in_threadpool(run_json_endpoint, name, payload)}
+    except MissingFieldsError as e:
+        return _error(422, str(e))
+    except QueueFullError as e:
+        return _error(429, str(e))
+    except Exception as e:
+        return _error(500, str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="헤드리스 HTTP API 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8000")))
+    args = parser.parse_args()
+
+    import uvicorn
+    print(f"🚀 API 서버 시작: http://{args.host}:{args.port} (JSON {len(JSON_ENDPOINTS)}개, SSE {len(STREAM_ENDPOINTS)}개)")
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,17 @@ import gradio as gr
 import yaml
 import json
 import re
+import uuid
 from chat.llm_functions import get_interviewer_response, get_student_response, generate_cover_letter_response, generate_memory
 from utils import parse_json_from_response
 from guide_generation.llm_functions import generate_guide as create_guide_from_llm
 from answer_flow_generation.llm_functions import generate_answer_flow
+from workload_scheduler import get_scheduler
+from session_store import get_session_store
+from stream_coalescer import coalesced
+from llm_gateway import cancel_streams
+from company_context import CONTEXT_FIELDS, build_company_context
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Load environment variables and initial data
@@ -30,12 +37,50 @@ with open("example_info.json", "r", encoding='utf-8') as f:
     if 'word_limit' not in default_info:
         default_info['word_limit'] = 300
 
-def user_submit(message, history):
-    """사용자 입력을 처리하고, 챗봇 기록을 업데이트합니다."""
-    if not message.strip():
-        return "", history
-    history.append([message, None])
-    return "", history
+# 채팅 상태(shared_info, history)는 프로세스 밖의 세션 저장소에 두고, 브라우저는 세션 ID만 들고 다닙니다.
+# 따라서 로드 밸런서 뒤의 어느 워커가 요청을 받아도 같은 세션을 이어갈 수 있습니다.
+session_store = get_session_store()
+
+def load_session(session_id):
+    """세션 저장소에서 {"info": shared_info, "history": history}를 읽습니다. 없으면 기본값."""
+    session = (session_store.load(session_id) if session_id else None) or {}
+    session.setdefault("info", default_info.copy())
+    session.setdefault("history", [])
+    return session
+
+def save_session(session_id, info=None, history=None):
+    """
+    바뀐 필드만 저장합니다. (None으로 둔 필드는 저장소 값을 그대로 둡니다)
+    다른 워커가 같은 세션의 다른 필드를 동시에 저장해도 서로 덮어쓰지 않습니다.
+    """
+    fields = {}
+    if info is not None:
+        fields["info"] = info
+    if history is not None:
+        fields["history"] = history
+    if session_id and fields:
+        session_store.save(session_id, fields)
+
+def init_session(request: gr.Request):
+    """
+    페이지 로드 시 세션 ID를 정합니다. URL에 ?session=<id>가 있고 저장소에 남아 있으면 그 세션을 복원합니다.
+    """
+    session_id = request.query_params.get("session") if request else None
+    session = session_store.load(session_id) if session_id else None
+    if session is None:
+        session_id = uuid.uuid4().hex
+        session = {"info": default_info.copy(), "history": []}
+        save_session(session_id, session["info"], session["history"])
+    guide = session["info"].get("guide", "")
+    return session_id, session["history"], f"**가이드:**\n{guide}"
+
+def user_submit(message, session_id):
+    """사용자 입력을 서버 쪽 대화 기록에 추가합니다. (화면 갱신은 이어지는 bot_response가 합니다)"""
+    if message.strip():
+        session = load_session(session_id)
+        session["history"].append([message, None])
+        save_session(session_id, history=session["history"])
+    return ""
 
 def clean_markdown_response(text):
     """
@@ -66,10 +111,20 @@ def clean_markdown_response(text):
     # 코드 블록이 없으면 원본 반환
     return text.strip()
 
-def bot_response(history, shared_info, progress=gr.Progress()):
-    """면접관의 응답을 생성하고 진행률을 업데이트합니다."""
+def bot_response(session_id, progress=gr.Progress(), history=None, request: gr.Request = None):
+    """
+    면접관의 응답을 생성하고 진행률을 업데이트합니다.
+
+    대화 기록은 브라우저에서 받지 않고 세션 저장소에서 읽습니다. 첫 프레임 이후의 스트리밍 yield는
+    Gradio가 이전 값과의 차이(diff)만 전송하므로, 턴마다 기록 전체가 오가지 않습니다.
+    """
+    session = load_session(session_id)
+    shared_info = session["info"]
+    if history is None:
+        history = session["history"]
     if not history or history[-1][1] is not None:
-        return history, gr.update(), gr.update()
+        yield history, gr.update(), gr.update()
+        return
     
     conversation_str = ""
     for h in history:
@@ -88,7 +143,7 @@ def bot_response(history, shared_info, progress=gr.Progress()):
 
     history[-1][1] = ""
     full_response = ""
-    for chunk in get_interviewer_response(format_info):
+    for chunk in get_interviewer_response(format_info, cancel_key=cancel_key(request, CHAT_STREAMS)):
         full_response += chunk
         history[-1][1] = full_response
         yield history, gr.update(), gr.update()
@@ -112,13 +167,17 @@ def bot_response(history, shared_info, progress=gr.Progress()):
         if final_progress >= 100:
              history.append([None, "면접이 종료되었습니다. 자기소개서 생성 탭으로 이동하세요."])
     
+    save_session(session_id, history=history)
     yield history, final_progress_update, final_reason_update
 
 
-def generate_ai_reply(history, shared_info, progress=gr.Progress()):
+def generate_ai_reply(session_id, progress=gr.Progress(), request: gr.Request = None):
     """학생의 AI 답변을 생성하고, 그에 대한 면접관의 후속 질문을 받습니다."""
+    session = load_session(session_id)
+    shared_info, history = session["info"], session["history"]
     if not history or not history[-1][1]:
-        return history, gr.update(), gr.update()
+        yield history, gr.update(), gr.update()
+        return
     
     conversation_str = ""
     for h in history:
@@ -137,7 +196,7 @@ def generate_ai_reply(history, shared_info, progress=gr.Progress()):
 
     student_answer_json = ""
     history.append(["", None])
-    for chunk in get_student_response(format_info):
+    for chunk in get_student_response(format_info, cancel_key=cancel_key(request, CHAT_STREAMS)):
         student_answer_json += chunk
         parsed_data = parse_json_from_response(student_answer_json)
         if parsed_data:
@@ -151,14 +210,17 @@ def generate_ai_reply(history, shared_info, progress=gr.Progress()):
         history[-1][0] = final_data.get("answer", "응답을 처리하는 데 실패했습니다.")
     yield history, gr.update(), gr.update()
 
-    yield from bot_response(history, shared_info, progress=progress)
+    yield from bot_response(session_id, progress=progress, history=history, request=request)
 
-def generate_all_cover_letters(history, shared_info, progress=gr.Progress()):
+def generate_all_cover_letters(session_id, progress=gr.Progress(), request: gr.Request = None):
     """모든 자기소개서 문항에 대한 답변을 생성하고 진행률을 표시합니다."""
+    session = load_session(session_id)
+    shared_info, history = session["info"], session["history"]
     if not history:
-        empty_outputs = [gr.update(value="면접 대화가 없습니다.")] * len(shared_info.get('questions', []))
-        empty_guidelines = [gr.update(value="")] * len(shared_info.get('questions', []))
-        return empty_outputs + empty_guidelines + [gr.update(), gr.update()]
+        empty_outputs = [gr.update(value="면접 대화가 없습니다.")] * len(cover_letter_outputs)
+        empty_guidelines = [gr.update(value="")] * len(guideline_outputs)
+        yield empty_outputs + empty_guidelines + [gr.update(), gr.update()]
+        return
 
     # history -> conversation_history 형식 변환
     conversation_str = ""
@@ -195,7 +257,7 @@ def generate_all_cover_letters(history, shared_info, progress=gr.Progress()):
         
         full_response = ""
         word_limit = shared_info.get('word_limit', 300)  # shared_info에서 word_limit 가져오기
-        for chunk in generate_cover_letter_response(question, [], format_info, flow_text, word_limit):
+        for chunk in generate_cover_letter_response(question, [], format_info, flow_text, word_limit, cancel_key=cancel_key(request, COVER_LETTER_STREAMS)):
             full_response += chunk
             parsed_data = parse_json_from_response(full_response)
             if parsed_data and 'answer' in parsed_data:
@@ -228,7 +290,7 @@ def generate_all_cover_letters(history, shared_info, progress=gr.Progress()):
     
     memory_content = ""
     current_memory = shared_info.get('memory', '')
-    for chunk in generate_memory(conversation_str, current_memory):
+    for chunk in generate_memory(conversation_str, current_memory, cancel_key=cancel_key(request, COVER_LETTER_STREAMS)):
         memory_content += chunk
     
     # Memory JSON 파싱
@@ -239,6 +301,10 @@ def generate_all_cover_letters(history, shared_info, progress=gr.Progress()):
             memory_text = parsed_memory['memory']
     except:
         pass
+    # 생성하는 동안 가이드 갱신으로 info가 바뀌었을 수 있으므로 최신 info에 memory만 반영합니다.
+    latest_info = load_session(session_id)["info"]
+    latest_info['memory'] = memory_text
+    save_session(session_id, info=latest_info)
     
     progress_text = "자기소개서 생성 진행률: 100% (완료)"
     yield [gr.update(value=o) for o in outputs] + [gr.update(value=g) for g in guidelines] + [gr.update(value=progress_text, visible=True), gr.update(value=memory_text)]
@@ -246,8 +312,18 @@ def generate_all_cover_letters(history, shared_info, progress=gr.Progress()):
     # 완료
     yield [gr.update(value=o) for o in outputs] + [gr.update(value=g) for g in guidelines] + [gr.update(visible=False), gr.update(value=memory_text)]
 
-def update_guide_and_info(company, position, jd, questions_str, word_limit):
-    guide_json, _ = create_guide_from_llm(questions_str, jd, company, "신입") # experience_level is hardcoded for now
+def update_guide_and_info(company, position, jd, questions_str, word_limit, session_id):
+    # 가이드 생성과 회사 컨텍스트(산업/규모/핵심가치/리포트/최근 이슈) 채우기를 동시에 실행합니다.
+    # 컨텍스트는 응답 캐시에 있는 분석 결과를 먼저 쓰고 빠진 분석만 실행하므로, 대기 시간은 둘 중 긴 쪽입니다.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        guide_future = executor.submit(create_guide_from_llm, questions_str, jd, company, "신입") # experience_level is hardcoded for now
+        context_future = executor.submit(build_company_context, company, position, "신입")
+        guide_json, _ = guide_future.result()
+        try:
+            company_context = context_future.result()
+        except Exception as e:
+            print(f"❌ 회사 컨텍스트 채우기 실패, 기본값 사용: {e}")
+            company_context = {}
     
     if guide_json and "guide" in guide_json:
         guide_text = guide_json["guide"]
@@ -255,6 +331,9 @@ def update_guide_and_info(company, position, jd, questions_str, word_limit):
         guide_text = "가이드 생성에 실패했습니다. 입력값을 확인해주세요."
 
     new_info = default_info.copy()
+    # example_info.json의 예시 회사 값이 다른 회사 면접에 섞이지 않도록 채우지 못한 필드는 비웁니다.
+    new_info.update({field: "" for field in CONTEXT_FIELDS})
+    new_info.update(company_context)
     new_info.update({
         "company_name": company,
         "position_title": position,
@@ -265,12 +344,34 @@ def update_guide_and_info(company, position, jd, questions_str, word_limit):
         "memory": ""
     })
     
-    # Return new state and update for the guide display
-    return new_info, guide_text
+    # 가이드가 바뀌어도 진행 중인 대화는 유지합니다.
+    save_session(session_id, info=new_info)
+    return guide_text
+
+# 취소 키의 이벤트 종류. 대화 초기화는 대화 스트림만 닫고, 진행 중인 자기소개서 생성은 그대로 둡니다.
+CHAT_STREAMS = "chat"
+COVER_LETTER_STREAMS = "cover_letter"
+
+def cancel_key(request, event):
+    """업스트림 스트림을 묶는 취소 키 (Gradio 브라우저 세션 + 이벤트 종류 단위)"""
+    return f"{request.session_hash}:{event}" if request else None
+
+def cancel_session_streams(request: gr.Request):
+    """탭을 닫거나 세션이 끝나면 그 세션에서 열린 LLM 스트림을 모두 닫습니다."""
+    for event in (CHAT_STREAMS, COVER_LETTER_STREAMS):
+        cancel_streams(cancel_key(request, event))
+
+def clear_chat(session_id, request: gr.Request = None):
+    """대화 기록을 비웁니다. (가이드와 입력 정보는 유지)"""
+    # 진행 중인 스트림을 먼저 닫아야 취소된 생성이 비운 기록을 다시 덮어쓰지 않습니다.
+    cancel_streams(cancel_key(request, CHAT_STREAMS))
+    save_session(session_id, history=[])
+    return [], "자기소개서 완성도: 0%", ""
 
 # --- Gradio UI ---
 with gr.Blocks(theme=gr.themes.Soft()) as demo:
-    shared_info = gr.State(default_info)
+    # 세션 ID는 브라우저 쪽 값으로 매 요청에 함께 전송되므로 어느 워커에서도 같은 세션을 찾을 수 있습니다.
+    session_id = gr.Textbox(visible=False)
 
     with gr.Tabs() as tabs:
         with gr.TabItem("가이드 생성", id=0):
@@ -345,17 +446,32 @@ with gr.Blocks(theme=gr.themes.Soft()) as demo:
                 memory_display = gr.Markdown(value="대화 메모리가 생성되면 여기에 표시됩니다.", label="대화 메모리")
 
     # Event Handlers
+    # 워크로드 클래스별 동시 실행 그룹: 가이드 생성은 회사 컨텍스트 웹 검색을 기다리므로 웹 검색,
+    # 대화/자소서 스트리밍은 채팅 스트리밍
+    scheduler = get_scheduler()
+    web_search_options = {"concurrency_id": "web_search", "concurrency_limit": scheduler.classes["web_search"].concurrency}
+    chat_options = {"concurrency_id": "chat_stream", "concurrency_limit": scheduler.classes["chat_stream"].concurrency}
+
     generate_guide_btn.click(
         fn=update_guide_and_info,
-        inputs=[company_name_input, position_title_input, jd_input, questions_input, word_limit_input],
-        outputs=[shared_info, guide_output]
+        inputs=[company_name_input, position_title_input, jd_input, questions_input, word_limit_input, session_id],
+        outputs=guide_output,
+        api_name="generate_guide",
+        **web_search_options
     )
     
-    submit_btn.click(user_submit, [msg, chatbot], [msg, chatbot]).then(bot_response, [chatbot, shared_info], [chatbot, progress_display, reason_display])
-    msg.submit(user_submit, [msg, chatbot], [msg, chatbot]).then(bot_response, [chatbot, shared_info], [chatbot, progress_display, reason_display])
-    ai_reply_btn.click(generate_ai_reply, [chatbot, shared_info], [chatbot, progress_display, reason_display])
-    clear_btn.click(lambda: ([], "자기소개서 완성도: 0%", ""), None, [chatbot, progress_display, reason_display], queue=False)
-    generate_btn.click(generate_all_cover_letters, [chatbot, shared_info], cover_letter_outputs + guideline_outputs + [cover_letter_progress_display, memory_display])
+    # chatbot은 출력 전용입니다. 대화 기록은 세션 저장소에 있고 요청에는 세션 ID만 실립니다.
+    submit_event = submit_btn.click(user_submit, [msg, session_id], msg, queue=False).then(coalesced(bot_response), session_id, [chatbot, progress_display, reason_display], api_name="bot_response", **chat_options)
+    msg_event = msg.submit(user_submit, [msg, session_id], msg, queue=False).then(coalesced(bot_response), session_id, [chatbot, progress_display, reason_display], **chat_options)
+    ai_reply_event = ai_reply_btn.click(coalesced(generate_ai_reply), session_id, [chatbot, progress_display, reason_display], api_name="ai_reply", **chat_options)
+    # 초기화는 진행 중인 대화 생성을 취소하고(cancels) 업스트림 스트림도 닫습니다(clear_chat).
+    clear_btn.click(clear_chat, session_id, [chatbot, progress_display, reason_display], queue=False, cancels=[submit_event, msg_event, ai_reply_event])
+    generate_btn.click(coalesced(generate_all_cover_letters), session_id, cover_letter_outputs + guideline_outputs + [cover_letter_progress_display, memory_display], api_name="generate_cover_letters", **chat_options)
+    demo.load(init_session, None, [session_id, chatbot, guide_output], queue=False)
+    demo.unload(cancel_session_streams)
 
 if __name__ == "__main__":
-    demo.launch(share=True)
\ No newline at end of file
+    # 대기열 길이는 워크로드 클래스의 최대 대기열 합으로 제한합니다 (초과 시 Gradio가 바로 거절).
+    scheduler = get_scheduler()
+    demo.queue(max_size=sum(workload.max_queue for workload in scheduler.classes.values()))
+    demo.launch(share=os.getenv("GRADIO_SHARE", "1") != "0")
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+여러 항목을 한 번의 LLM 요청으로 분류하는 배치 실행 도우미
+
+산업 분류 / 기업 규모처럼 프롬프트 고정부(분류 기준, 태그 목록)가 긴 작업은 항목을 K개씩 묶으면
+고정 토큰을 K개가 나눠 냅니다. run_batched()는
+- 항목을 최대 K개씩 묶어 request(chunk)를 호출하고
+- 응답에서 빠진 항목만 둘로 나눠 다시 요청하며(분할 재시도)
+- 한 개까지 줄어도 실패하면 단건 경로(fallback)로 처리합니다.
+요청 자체가 예외로 실패하면(재시도는 llm_policy가 이미 수행) 나누지 않고 그 묶음을 실패로 기록합니다.
+단건 대체 호출은 응답 객체가 없으므로 토큰/비용 대신 fallbacks 횟수로만 집계합니다.
+
+request(chunk)는 ({id: 결과}, response)를 반환해야 합니다.
+"""
+
+from collections import deque
+
+from search_policy import last_call_record, reset_last_call_record
+
+MISSING_RESULT_ERROR = "응답에 이 항목의 결과가 없습니다."
+
+
+class BatchStats:
+    """요청 수, 토큰, 분할/단건 대체 횟수와 비용 집계"""
+
+    def __init__(self):
+        self.requests = 0
+        self.entities = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.splits = 0
+        self.fallbacks = 0
+        self.cost = 0.0
+
+    def add(self, response, entities):
+        self.requests += 1
+        self.entities += entities
+        usage = getattr(response, "usage", None)
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+        # 같은 스레드에서 방금 기록된 웹 검색 호출의 비용 (run_batched가 요청마다 초기화)
+        record = last_call_record()
+        self.cost += record["cost"] if record else 0.0
+
+    def merge(self, other):
+        for name in ("requests", "entities", "input_tokens", "output_tokens", "splits", "fallbacks", "cost"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def chunked(items, size):
+    """
+    items를 최대 size개씩 나눈 목록
+    """
+    size = max(1, size)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def run_batched(items, request, max_batch_size, fallback=None, stats=None):
+    """
+    ({id: 결과}, {id: 오류 메시지})를 반환합니다.
+
+    items: [{"id", ...}, ...] (id는 고유해야 함)
+    fallback(item): 단건 경로. 결과 또는 None(실패)을 반환합니다.
+    """
+    stats = stats if stats is not None else BatchStats()
+    results, errors = {}, {}
+    queue = deque(chunked(list(items), max_batch_size))
+    while queue:
+        chunk = queue.popleft()
+        reset_last_call_record()
+        try:
+            found, response = request(chunk)
+        except Exception as e:
+            print(f"❌ 배치 요청 실패 ({len(chunk)}개): {e}")
+            for item in chunk:
+                errors[item["id"]] = str(e)
+            continue
+        stats.add(response, len(chunk))
+        missing = []
+        for item in chunk:
+            if item["id"] in found:
+                results[item["id"]] = found[item["id"]]
+            else:
+                missing.append(item)
+        if not missing:
+            continue
+        if len(missing) > 1:
+            # 일부만 빠졌으면 빠진 항목을 둘로 나눠 다시 요청
+            stats.splits += 1
+            half = (len(missing) + 1) // 2
+            queue.append(missing[:half])
+            queue.append(missing[half:])
+            continue
+        item = missing[0]
+        if fallback is None:
+            errors[item["id"]] = MISSING_RESULT_ERROR
+            continue
+        stats.fallbacks += 1
+        try:
+            value = fallback(item)
+        except Exception as e:
+            errors[item["id"]] = str(e)
+            continue
+        if value:
+            results[item["id"]] = value
+        else:
+            errors[item["id"]] = MISSING_RESULT_ERROR
+    return results, errors
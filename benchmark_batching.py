@@ -0,0 +1,163 @@
+"""
+다건 배치 분류 벤치마크 (산업 분류 / 기업 규모)
+
+eval.json 예제를 단건 경로(classify_industry / analyze_company_size)와
+K개씩 묶는 배치 경로(classify_industry_batch / analyze_company_size_batch)로 각각 분류해
+항목당 입력/출력 토큰, 항목당 비용, 초당 처리 항목 수, 정확도, 실패 수를 비교합니다.
+캐시/로컬 분류기는 건너뛰고 모든 항목을 실제로 호출합니다. (같은 search_context_size로 고정)
+실행 중의 캐시/인덱스/로그 쓰기는 임시 디렉터리에만 남습니다. (state_sandbox)
+
+사용법:
+    python benchmark_batching.py --task industry --limit 40 --batch-sizes 5 10 20
+    python benchmark_batching.py --task company_size --concurrency 4 --fallback
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# 벤치마크 호출이 운영 응답 캐시 / 로컬 분류기 / 기업 규모 인덱스 / 별칭 / 검색 로그에 쓰지 않도록
+# 모듈을 불러오기 전에 빈 임시 상태로 격리합니다. (모든 항목을 실제로 호출하므로 운영 캐시는 필요 없음)
+from state_sandbox import isolate_state
+STATE_DIR = isolate_state("benchmark_batching_")
+
+from batching import BatchStats, chunked
+from feature_modules import feature_dir, load_feature_module
+from llm_gateway import track_usage
+
+# 작업 -> (기능 키, eval.json 최상위 키)
+TASKS = {
+    "industry": ("industry", "industry_classification_eval"),
+    "company_size": ("company_size", None),
+}
+
+
+def load_items(task, limit):
+    feature, root_key = TASKS[task]
+    with open(feature_dir(feature) / "eval.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    examples = data[root_key]["examples"] if root_key else data["examples"]
+    items = []
+    for index, example in enumerate(examples[:limit]):
+        inputs = example["input"]
+        if isinstance(inputs, dict):
+            item = {"id": str(index), "company_name": inputs["company_name"], "job_title": inputs.get("job_title", "")}
+        else:
+            item = {"id": str(index), "company_name": inputs, "job_title": ""}
+        items.append(dict(item, expected=example["output"]))
+    return items
+
+
+def score(task, expected, predicted):
+    """
+    산업은 태그 Jaccard, 규모는 정확히 일치하면 1
+    """
+    if task == "industry":
+        union = set(expected) | set(predicted or [])
+        return len(set(expected) & set(predicted or [])) / len(union) if union else 0.0
+    return 1.0 if predicted == expected else 0.0
+
+
+def _single(task, module, item, size):
+    if task == "industry":
+        _, tags = module.classify_industry(item["job_title"], item["company_name"], use_local=False, search_context_size=size)
+        return tags or None
+    _, category = module.analyze_company_size(item["company_name"], force_refresh=True, search_context_size=size)
+    return category if category in module.company_size_index.SIZE_CATEGORIES else None
+
+
+def _batch(task, module, chunk, size, fallback, stats):
+    if task == "industry":
+        results = module.classify_industry_batch(chunk, max_batch_size=len(chunk), search_context_size=size,
+                                                 fallback_single=fallback, stats=stats)
+        return {r["id"]: r["tags"] for r in results if not r["error"]}
+    results = module.analyze_company_size_batch(chunk, max_batch_size=len(chunk), search_context_size=size,
+                                                fallback_single=fallback, stats=stats)
+    return {r["id"]: r["category"] for r in results if not r["error"]}
+
+
+def run(task, items, batch_size, concurrency, size, fallback):
+    """
+    batch_size가 0이면 단건 경로. 작업 스레드마다 track_usage로 토큰/비용을 모아 합칩니다.
+    """
+    module = load_feature_module(TASKS[task][0])
+    chunks = [[item] for item in items] if batch_size == 0 else chunked(items, batch_size)
+
+    def work(chunk):
+        stats = BatchStats()
+        with track_usage() as usage:
+            if batch_size == 0:
+                predicted = {chunk[0]["id"]: _single(task, module, chunk[0], size)}
+            else:
+                predicted = _batch(task, module, chunk, size, fallback, stats)
+        return predicted, usage, stats
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(work, chunks))
+    wall = time.perf_counter() - start
+
+    predicted, stats = {}, BatchStats()
+    totals = {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+    for chunk_predicted, usage, chunk_stats in outcomes:
+        predicted.update(chunk_predicted)
+        stats.merge(chunk_stats)
+        for key in totals:
+            totals[key] += usage[key]
+    n = len(items)
+    return {
+        "mode": "single" if batch_size == 0 else f"batch K={batch_size}",
+        "entities": n,
+        "calls": totals["calls"],
+        "input_tokens_per_entity": totals["input_tokens"] / n,
+        "output_tokens_per_entity": totals["output_tokens"] / n,
+        "cost_per_entity": totals["cost"] / n,
+        "entities_per_second": n / wall if wall else 0.0,
+        "wall": wall,
+        "accuracy": sum(score(task, item["expected"], predicted.get(item["id"])) for item in items) / n,
+        "failed": sum(1 for item in items if not predicted.get(item["id"])),
+        "splits": stats.splits,
+        "fallbacks": stats.fallbacks,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다건 배치 분류 벤치마크")
+    parser.add_argument("--task", choices=list(TASKS), default="industry")
+    parser.add_argument("--limit", type=int, default=40, help="eval.json에서 사용할 예제 수")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[5, 10, 20], help="비교할 K 목록")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요청 수 (단건/배치 공통)")
+    parser.add_argument("--search-context-size", default="low", choices=["low", "medium", "high"])
+    parser.add_argument("--fallback", action="store_true", help="배치에서 끝까지 빠진 항목을 단건 경로로 처리")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    items = load_items(args.task, args.limit)
+    print(f"🚀 {args.task}: 예제 {len(items)}개, 동시 요청 {args.concurrency}, search_context_size={args.search_context_size}")
+    rows = []
+    for batch_size in [0] + args.batch_sizes:
+        row = run(args.task, items, batch_size, args.concurrency, args.search_context_size, args.fallback)
+        rows.append(row)
+        print(f"  ✅ {row['mode']} 완료 ({row['wall']:.1f}초)")
+
+    print(f"\n{'mode':<12}{'calls':>7}{'in tok/ent':>12}{'out tok/ent':>13}{'$/ent':>10}{'ent/s':>8}{'acc':>7}{'fail':>6}{'split':>7}{'fb':>5}")
+    for row in rows:
+        print(f"{row['mode']:<12}{row['calls']:>7}{row['input_tokens_per_entity']:>12.0f}{row['output_tokens_per_entity']:>13.0f}"
+              f"{row['cost_per_entity']:>10.5f}{row['entities_per_second']:>8.2f}{row['accuracy']:>7.2f}"
+              f"{row['failed']:>6}{row['splits']:>7}{row['fallbacks']:>5}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
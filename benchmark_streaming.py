@@ -0,0 +1,101 @@
+"""
+스트리밍 UI 갱신 묶기 벤치마크
+
+동시 스트림 N개가 면접관 응답을 토큰 단위로 내보낼 때, 청크마다 yield하는 방식(raw)과
+stream_coalescer.coalesce()로 묶는 방식의 서버 CPU(프레임 직렬화 포함)와 전송 프레임 수를 비교합니다.
+각 스트림이 끝났을 때 브라우저 쪽 컴포넌트 상태가 두 방식에서 같은지도 확인합니다.
+
+사용법:
+    python benchmark_streaming.py --streams 1 10 50 --tokens 400 --token-interval 0.01 --fps 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from stream_coalescer import coalesce
+
+PRIOR_TURNS = 10
+TOKEN_TEXT = "지원자 "
+
+
+def _history_frames(tokens, token_interval):
+    """
+    직전 대화 PRIOR_TURNS턴 뒤에 면접관 응답을 토큰 단위로 채우는 bot_response 모양의 프레임 생성기
+    """
+    history = [["학생 답변 " * 40, "면접관 질문 " * 30] for _ in range(PRIOR_TURNS)]
+    history.append(["마지막 답변입니다.", ""])
+    for _ in range(tokens):
+        time.sleep(token_interval)
+        history[-1][1] += TOKEN_TEXT
+        yield history, {"__type__": "update"}, {"__type__": "update"}
+    yield history, "자기소개서 완성도: 50%", {"__type__": "update", "value": "**진행 상황 분석:** 구체성 보강", "visible": True}
+
+
+def _consume(frames, stats):
+    """
+    Gradio가 하듯 프레임마다 JSON으로 직렬화하고, 브라우저 쪽 컴포넌트 상태를 재구성합니다.
+    ('변경 없음' 표시는 이전 값을 유지)
+    """
+    state = None
+    count = 0
+    for frame in frames:
+        encoded = json.loads(json.dumps(frame, ensure_ascii=False))
+        count += 1
+        if state is None:
+            state = encoded
+        else:
+            state = [previous if value == {"__type__": "update"} else value for previous, value in zip(state, encoded)]
+    stats.append((count, json.dumps(state, ensure_ascii=False)))
+
+
+def run(streams, tokens, token_interval, fps, coalesced):
+    stats = []
+
+    def worker():
+        frames = _history_frames(tokens, token_interval)
+        if coalesced:
+            frames = coalesce(frames, fps=fps, min_chars=0)
+        _consume(frames, stats)
+
+    threads = [threading.Thread(target=worker) for _ in range(streams)]
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "cpu": time.process_time() - cpu_start,
+        "wall": time.perf_counter() - wall_start,
+        "frames": sum(count for count, _ in stats) / max(streams, 1),
+        "final": stats[0][1] if stats else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스트리밍 UI 갱신 묶기 벤치마크")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 10, 50], help="동시 스트림 수 목록")
+    parser.add_argument("--tokens", type=int, default=400, help="스트림당 토큰 수")
+    parser.add_argument("--token-interval", type=float, default=0.01, help="토큰 간격(초)")
+    parser.add_argument("--fps", type=float, default=20, help="묶기 기준 초당 프레임 수")
+    args = parser.parse_args()
+
+    print(f"🚀 토큰 {args.tokens}개 x 간격 {args.token_interval * 1000:.0f}ms, 묶기 {args.fps:.0f}Hz")
+    print(f"{'streams':>8}{'raw frames':>12}{'coal frames':>13}{'raw CPU/stream':>16}{'coal CPU/stream':>17}{'final same':>12}")
+    for streams in args.streams:
+        raw = run(streams, args.tokens, args.token_interval, args.fps, coalesced=False)
+        coal = run(streams, args.tokens, args.token_interval, args.fps, coalesced=True)
+        print(f"{streams:>8}{raw['frames']:>12.0f}{coal['frames']:>13.0f}"
+              f"{raw['cpu'] / streams * 1000:>14.1f}ms{coal['cpu'] / streams * 1000:>15.1f}ms"
+              f"{'✅' if raw['final'] == coal['final'] else '❌':>12}")
+
+
+if __name__ == "__main__":
+    main()
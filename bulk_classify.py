@@ -0,0 +1,269 @@
+"""
+CSV 대량 기업 분류 (산업 태그 + 기업 규모)
+
+수천 개 회사 목록을 단건 classify_industry / analyze_company_size 호출 없이 처리합니다.
+1. 회사명을 company_names.company_key(정규화 + 별칭)로 묶어 (회사, 직무) 기준으로 중복을 제거합니다.
+   LLM에는 처음 나온 표기를 그대로 보냅니다.
+2. 응답 캐시 / 로컬 산업 분류기 / 기업 규모 인덱스에 있는 회사는 LLM 호출 없이 채웁니다.
+3. 남은 회사만 BULK_BATCH_SIZE개씩 묶어 여러 회사를 한 번에 분류하는 프롬프트로 보냅니다.
+   호출은 게이트웨이(레이트 리미터)를 거치며 BULK_CONCURRENCY개까지 동시에 실행합니다.
+   배치 호출마다 workload_scheduler의 web_search 슬롯을 받으므로, 대량 분류가 단건 웹 검색 기능의
+   동시 실행 한도를 넘겨 쓰지 않습니다.
+4. 묶음이 끝날 때마다 결과 CSV를 다시 써서, 진행 중에도 지금까지의 결과를 받을 수 있습니다.
+
+입력 CSV: 회사명 열(company_name / company / 회사명 / 기업명, 없으면 첫 번째 열)과
+선택적 직무 열(job_title / job / 직무)을 사용합니다.
+
+사용법:
+    python bulk_classify.py companies.csv -o classified.csv
+    python bulk_classify.py companies.csv --only size --batch-size 30
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from feature_modules import load_feature_module
+from batching import BatchStats, chunked
+from company_names import company_key
+from workload_scheduler import get_scheduler
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "20"))
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "4"))
+
+COMPANY_COLUMNS = ("company_name", "company", "회사명", "기업명", "회사")
+JOB_COLUMNS = ("job_title", "job", "직무", "position")
+
+RESULT_COLUMNS = ["normalized_company", "industry_tags", "industry_labels", "industry_source", "company_size", "size_source"]
+
+
+def clean_text(value):
+    """
+    CSV 셀 공백 정리
+    """
+    return " ".join(str(value or "").split())
+
+
+def read_rows(path):
+    """
+    CSV를 읽어 (행 목록, 열 이름 목록, 회사명 열, 직무 열)을 반환합니다. (UTF-8 BOM 허용)
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        fieldnames = list(reader.fieldnames or [])
+    if not fieldnames:
+        raise ValueError("CSV에 헤더가 없습니다.")
+    lowered = {name.strip().lower(): name for name in fieldnames}
+    company_column = next((lowered[c] for c in COMPANY_COLUMNS if c in lowered), fieldnames[0])
+    job_column = next((lowered[c] for c in JOB_COLUMNS if c in lowered), None)
+    return rows, fieldnames, company_column, job_column
+
+
+def write_rows(path, rows, fieldnames, entities, keys):
+    """
+    입력 행 순서대로 결과 열을 붙여 CSV로 씁니다. 아직 끝나지 않은 항목은 빈 칸.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames + [c for c in RESULT_COLUMNS if c not in fieldnames])
+        writer.writeheader()
+        for row, key in zip(rows, keys):
+            entity = entities.get(key, {}) if key else {}
+            writer.writerow({**row, **{c: entity.get(c, "") for c in RESULT_COLUMNS}})
+    os.replace(tmp_path, path)
+
+
+class BulkSummary:
+    """진행 상황과 비용 집계"""
+
+    def __init__(self, total_rows, unique, blank=0):
+        self.total_rows = total_rows
+        self.unique = unique
+        self.blank = blank
+        self.cached = {"industry": 0, "size": 0}
+        self.classified = {"industry": 0, "size": 0}
+        self.failed = {"industry": 0, "size": 0}
+        self.stats = BatchStats()
+        self.start = time.time()
+
+    def format(self, pending=0):
+        elapsed = time.time() - self.start
+        lines = [
+            f"**📑 행 {self.total_rows}개 → 고유 회사 {self.unique}개** "
+            f"(중복 {self.total_rows - self.blank - self.unique}개 제거, 회사명 없음 {self.blank}개)",
+            "",
+            "| 작업 | 캐시/인덱스 | 배치 분류 | 실패 |",
+            "|---|---|---|---|",
+            f"| 🏷️ 산업 | {self.cached['industry']} | {self.classified['industry']} | {self.failed['industry']} |",
+            f"| 🏢 규모 | {self.cached['size']} | {self.classified['size']} | {self.failed['size']} |",
+            "",
+            f"- 🔁 배치 요청 {self.stats.requests}회 (분할 재요청 {self.stats.splits}회, 단건 대체 {self.stats.fallbacks}회), 남은 배치 {pending}개",
+            f"- 💰 비용 ${self.stats.cost:.4f}",
+            f"- ⏱️ 경과 {elapsed:.1f}초",
+        ]
+        return "\n".join(lines)
+
+
+def _lookup_cached(entity, do_industry, do_size):
+    """
+    캐시 / 로컬 분류기 / 인덱스로 채울 수 있는 값을 채우고, 아직 남은 작업 집합을 반환합니다.
+    """
+    remaining = set()
+    if do_industry:
+        industry = load_feature_module("industry")
+        tags, source = industry.cached_industry_tags(entity["company_name"], entity["job_title"]), "cache"
+        if not tags:
+            tags, _ = industry.classify_locally(entity["company_name"], entity["job_title"])
+            source = "local"
+        if tags:
+            _set_industry(entity, tags, source, industry)
+        else:
+            remaining.add("industry")
+    if do_size:
+        size = load_feature_module("company_size")
+        size.company_size_index.ensure_seeded()
+        entry, is_fresh = size.company_size_index.lookup(entity["company_name"])
+        if entry and is_fresh:
+            entity.update(company_size=entry["category"], size_source="index")
+        else:
+            remaining.add("size")
+    return remaining
+
+
+def _set_industry(entity, tags, source, module):
+    entity.update(
+        industry_tags=" ".join(tags),
+        industry_labels=", ".join(module.TAG_LABELS.get(tag, tag) for tag in tags),
+        industry_source=source,
+    )
+
+
+def _run_batch(task, batch, batch_size):
+    """
+    web_search 워크로드 슬롯 안에서 배치 하나를 분류합니다. (작업 스레드에서 실행)
+    단건 웹 검색 요청과 같은 FIFO 대기열에 서며, 이미 받아들인 작업이므로 대기열이 가득 차도 거절하지 않습니다.
+    """
+    return get_scheduler().run("web_search", _classify_batch, task, batch, batch_size, reject_when_full=False)
+
+
+def _classify_batch(task, batch, batch_size):
+    """
+    배치 하나를 분류하고 ({id: 결과}, BatchStats)를 반환합니다.
+    빠진 항목의 분할 재요청 / 단건 대체는 모듈의 배치 함수가 처리합니다.
+    """
+    stats = BatchStats()
+    if task == "industry":
+        results = load_feature_module("industry").classify_industry_batch(
+            [{"id": e["id"], "company_name": e["company_name"], "job_title": e["job_title"]} for e in batch],
+            max_batch_size=batch_size, stats=stats)
+        return {r["id"]: r["tags"] for r in results if not r["error"]}, stats
+    results = load_feature_module("company_size").analyze_company_size_batch(
+        [{"id": e["id"], "company_name": e["company_name"]} for e in batch],
+        max_batch_size=batch_size, stats=stats)
+    return {r["id"]: r["category"] for r in results if not r["error"]}, stats
+
+
+def classify_bulk(path, output_path, do_industry=True, do_size=True, batch_size=None, concurrency=None):
+    """
+    CSV를 분류하며 진행 상황 마크다운을 yield하는 생성기. 결과 CSV는 배치마다 output_path에 다시 씁니다.
+    """
+    batch_size = max(1, batch_size or BULK_BATCH_SIZE)
+    concurrency = max(1, concurrency or BULK_CONCURRENCY)
+    rows, fieldnames, company_column, job_column = read_rows(path)
+
+    entities = {}
+    keys = []
+    for row in rows:
+        name = clean_text(row.get(company_column))
+        job = clean_text(row.get(job_column)) if job_column else ""
+        if not name:
+            keys.append(None)
+            continue
+        key = (company_key(name), job)
+        if key not in entities:
+            entities[key] = {"id": str(len(entities)), "company_name": name, "job_title": job, "normalized_company": key[0]}
+        keys.append(key)
+
+    summary = BulkSummary(len(rows), len(entities), keys.count(None))
+    pending = {"industry": [], "size": []}
+    for entity in entities.values():
+        remaining = _lookup_cached(entity, do_industry, do_size)
+        for task in ("industry", "size"):
+            if task in remaining:
+                pending[task].append(entity)
+            elif (task == "industry" and do_industry) or (task == "size" and do_size):
+                summary.cached[task] += 1
+
+    # 규모는 회사 단위라 직무가 달라도 한 번만 분류합니다.
+    size_by_company = {}
+    for entity in pending["size"]:
+        size_by_company.setdefault(entity["normalized_company"], []).append(entity)
+    size_targets = [group[0] for group in size_by_company.values()]
+
+    write_rows(output_path, rows, fieldnames, entities, keys)
+    batches = [("industry", batch) for batch in chunked(pending["industry"], batch_size)]
+    batches += [("size", batch) for batch in chunked(size_targets, batch_size)]
+    yield summary.format(len(batches))
+    if not batches:
+        return
+
+    industry = load_feature_module("industry") if do_industry else None
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(_run_batch, task, batch, batch_size): (task, batch) for task, batch in batches}
+        remaining_batches = len(futures)
+        for future in as_completed(futures):
+            task, batch = futures[future]
+            remaining_batches -= 1
+            try:
+                results, stats = future.result()
+                summary.stats.merge(stats)
+            except Exception as e:
+                print(f"❌ {task} 배치 실패 ({len(batch)}개): {e}")
+                results = {}
+            for entity in batch:
+                value = results.get(entity["id"])
+                if task == "industry":
+                    if value:
+                        _set_industry(entity, value, "batch", industry)
+                        summary.classified[task] += 1
+                    else:
+                        entity.update(industry_source="failed")
+                        summary.failed[task] += 1
+                    continue
+                for same_company in size_by_company[entity["normalized_company"]]:
+                    same_company.update(company_size=value or "", size_source="batch" if value else "failed")
+                    summary.classified[task] += 1 if value else 0
+                    summary.failed[task] += 0 if value else 1
+            write_rows(output_path, rows, fieldnames, entities, keys)
+            yield summary.format(remaining_batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV 대량 기업 분류 (산업 + 규모)")
+    parser.add_argument("input", help="회사 목록 CSV")
+    parser.add_argument("-o", "--output", help="결과 CSV (기본: <입력>_classified.csv)")
+    parser.add_argument("--only", choices=["industry", "size"], help="한 가지 분류만 실행")
+    parser.add_argument("--batch-size", type=int, default=None, help=f"요청당 회사 수 (기본 {BULK_BATCH_SIZE})")
+    parser.add_argument("--concurrency", type=int, default=None, help=f"동시 배치 요청 수 (기본 {BULK_CONCURRENCY})")
+    args = parser.parse_args()
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}_classified.csv"
+    print(f"🚀 대량 분류 시작: {args.input}")
+    progress = ""
+    for progress in classify_bulk(args.input, output, do_industry=args.only != "size", do_size=args.only != "industry",
+                                  batch_size=args.batch_size, concurrency=args.concurrency):
+        print(progress.splitlines()[-3], progress.splitlines()[-1])
+    print(progress)
+    print(f"✅ 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+예제 회사 × 직무 캐시 예열
+
+배포 직후 첫 사용자가 예제 버튼(삼성전자 × 백엔드 개발 등)을 누르면 매번 웹 검색 대기 시간을 그대로 치릅니다.
+이 모듈은 설정된 회사/직무 목록에 대해 결과 캐시가 있는 탭을 미리 채워 둡니다.
+1. (회사, 직무)마다 기업 종합 분석의 공유 조사 자료를 한 번 만들고 (웹 검색 1회)
+2. 기업 규모(회사당 1회), 산업 분류, 컨텍스트 리포트는 그 자료를 근거로 채웁니다. (추가 웹 검색 없음)
+3. 이미 신선한 항목은 건너뛰고, 끝나면 탭별 커버리지(예열된 항목 / 전체)를 보고합니다.
+호출은 llm_gateway.low_priority() 안에서 나가므로 레이트 리미터 버킷 일부를 사용자 요청 몫으로 남겨둡니다.
+
+면접 질문 생성 / 면접 질문 추천 / 직무기술서 탭은 선택 항목에 따라 매번 새로 생성하는 결과라 예열 대상이 아닙니다.
+
+사용법:
+    python cache_warmer.py                        # 한 번 예열
+    python cache_warmer.py --interval 6           # 6시간마다 반복
+    python cache_warmer.py --report               # 호출 없이 커버리지만 확인
+    python cache_warmer.py --companies 토스 카카오 --jobs "백엔드 개발"
+    WARMUP_ON_STARTUP=1 python main.py            # 앱 시작 시 백그라운드로 예열
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from example_inputs import EXAMPLE_COMPANIES, EXAMPLE_JOBS, EXAMPLE_SIZE_COMPANIES
+from feature_modules import load_feature_module
+from response_cache import get_cache, make_cache_key
+from company_names import company_key
+from llm_gateway import low_priority, track_usage
+
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "2"))
+WARMUP_INTERVAL_HOURS = float(os.getenv("WARMUP_INTERVAL_HOURS", "0"))
+REPORT_PATH = os.getenv("WARMUP_REPORT_PATH", os.path.join(project_root, ".cache", "warmup_report.json"))
+
+# 예열하는 작업 -> 표시 이름
+TASK_LABELS = {
+    "research": "🗂️ 종합 분석 조사 자료",
+    "company_size": "🏢 기업 규모",
+    "industry": "🏷️ 산업 분류",
+    "context_report": "📊 컨텍스트 리포트",
+}
+
+# 결과 캐시가 없어 예열하지 않는 탭
+UNCACHED_FEATURES = {
+    "commonly_asked": "🎯 면접 질문 생성",
+    "question_rec": "💡 면접 질문 추천",
+    "jd_rec": "📋 직무기술서",
+}
+
+_run_lock = threading.Lock()
+
+
+def _env_list(name, default):
+    value = os.getenv(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def default_targets():
+    """
+    (회사 목록, 직무 목록, 경력 수준 목록, 기업 규모만 예열할 추가 회사 목록)
+    환경 변수 WARMUP_COMPANIES / WARMUP_JOBS / WARMUP_EXPERIENCE_LEVELS / WARMUP_SIZE_COMPANIES(쉼표 구분)로 바꿀 수 있습니다.
+    """
+    return (
+        _env_list("WARMUP_COMPANIES", EXAMPLE_COMPANIES),
+        _env_list("WARMUP_JOBS", EXAMPLE_JOBS),
+        _env_list("WARMUP_EXPERIENCE_LEVELS", ["신입"]),
+        _env_list("WARMUP_SIZE_COMPANIES", EXAMPLE_SIZE_COMPANIES),
+    )
+
+
+def is_warm(task, company_name, job_title=None, experience_level=None):
+    """
+    예제 버튼을 눌렀을 때 웹 검색 없이 결과가 나오는 상태인지 (탭의 실제 조회 경로와 같은 기준)
+    """
+    if task == "research":
+        from dossier import RESEARCH_NAMESPACE, RESEARCH_MAX_AGE_SECONDS
+        key = make_cache_key(company_key(company_name), job_title)
+        return get_cache().get(RESEARCH_NAMESPACE, key, max_age=RESEARCH_MAX_AGE_SECONDS) is not None
+    if task == "company_size":
+        module = load_feature_module("company_size")
+        entry, is_fresh = module.company_size_index.lookup(company_name)
+        return bool(entry and is_fresh)
+    if task == "industry":
+        # 산업 분류 탭은 응답 캐시의 (정규화 회사 키, 직무) 결과를 먼저 읽습니다.
+        # 로컬 분류기는 프로세스마다 한 번 학습되므로 실행 중인 앱 기준의 예열 여부로 쓰지 않습니다.
+        return load_feature_module("industry").cached_industry_tags(company_name, job_title) is not None
+    if task == "context_report":
+        return load_feature_module("jasoseo").cached_context_report(job_title, company_name, experience_level) is not None
+    raise ValueError(f"알 수 없는 예열 작업: {task}")
+
+
+def warm_targets(companies, jobs, experience_levels, size_companies=()):
+    """
+    예열 대상 [(task, company_name, job_title, experience_level), ...]
+    """
+    targets = []
+    for company in companies:
+        for job in jobs:
+            targets.append(("research", company, job, None))
+            targets.append(("industry", company, job, None))
+            targets += [("context_report", company, job, level) for level in experience_levels]
+    for company in dict.fromkeys(list(companies) + list(size_companies)):
+        targets.append(("company_size", company, None, None))
+    return targets
+
+
+def coverage(companies, jobs, experience_levels, size_companies=()):
+    """
+    작업별 {"warm", "total", "missing": [[회사, 직무, 경력], ...]}
+    """
+    report = {task: {"warm": 0, "total": 0, "missing": []} for task in TASK_LABELS}
+    for task, company, job, level in warm_targets(companies, jobs, experience_levels, size_companies):
+        entry = report[task]
+        entry["total"] += 1
+        try:
+            warm = is_warm(task, company, job, level)
+        except Exception as e:
+            print(f"⚠️ 커버리지 확인 실패 ({task}, {company}, {job}): {e}")
+            warm = False
+        if warm:
+            entry["warm"] += 1
+        else:
+            entry["missing"].append([company, job, level])
+    return report
+
+
+def _warm_company(company, jobs, experience_levels, force):
+    """
+    한 회사의 모든 직무를 순서대로 예열합니다. (작업 스레드에서 실행)
+    조사 자료는 (회사, 직무)마다 한 번 만들고, 기업 규모는 첫 조사 자료로 한 번만 분류합니다.
+    """
+    industry = load_feature_module("industry")
+    size = load_feature_module("company_size")
+    jasoseo = load_feature_module("jasoseo")
+    from dossier import research_company
+
+    done = {task: 0 for task in TASK_LABELS}
+    need_size = force or not is_warm("company_size", company)
+    with low_priority(), track_usage() as usage:
+        for job in jobs:
+            need_industry = force or not is_warm("industry", company, job)
+            levels = [level for level in experience_levels if force or not is_warm("context_report", company, job, level)]
+            if not (need_size or need_industry or levels or not is_warm("research", company, job)):
+                continue
+            try:
+                research = research_company(company, job, force_refresh=force)
+                done["research"] += 0 if research["cached"] else 1
+                notes = research["notes"]
+                if need_size:
+                    size.analyze_company_size(company, force_refresh=force, research=notes)
+                    need_size = False
+                    done["company_size"] += 1
+                if need_industry:
+                    industry.classify_industry(job, company, use_local=not force, research=notes)
+                    done["industry"] += 1
+                for level in levels:
+                    jasoseo.generate_context_report(job, company, level, research=notes, force_refresh=force)
+                    done["context_report"] += 1
+                print(f"🔥 예열 완료: {company} × {job}")
+            except Exception as e:
+                print(f"❌ 예열 실패 ({company} × {job}): {e}")
+    return done, usage
+
+
+def _warm_size_only(company, force):
+    """
+    기업 규모 탭에만 있는 예제 회사 (직무 없이 기업 규모만 예열)
+    """
+    done = {task: 0 for task in TASK_LABELS}
+    with low_priority(), track_usage() as usage:
+        if force or not is_warm("company_size", company):
+            try:
+                load_feature_module("company_size").analyze_company_size(company, force_refresh=force)
+                done["company_size"] += 1
+            except Exception as e:
+                print(f"❌ 예열 실패 ({company} 기업 규모): {e}")
+    return done, usage
+
+
+def format_coverage(report):
+    """
+    예열 결과를 마크다운 표로 만듭니다.
+    """
+    lines = ["| 작업 | 예열 전 | 예열 후 | 커버리지 |", "|---|---|---|---|"]
+    for task, label in TASK_LABELS.items():
+        before, after = report["before"][task], report["after"][task]
+        rate = after["warm"] / after["total"] if after["total"] else 0.0
+        lines.append(f"| {label} | {before['warm']}/{before['total']} | {after['warm']}/{after['total']} | {rate:.0%} |")
+    lines.append("")
+    lines.append(f"- 🔁 호출 {report['usage']['calls']}회, 💰 비용 ${report['usage']['cost']:.4f}, ⏱️ {report['elapsed']:.1f}초")
+    lines.append(f"- ⏭️ 예열 대상 아님(결과 캐시 없음): {', '.join(UNCACHED_FEATURES.values())}")
+    missing = sum(len(entry["missing"]) for entry in report["after"].values())
+    if missing:
+        lines.append(f"- ⚠️ 아직 비어 있는 항목 {missing}개 (자세한 목록: {REPORT_PATH})")
+    return "\n".join(lines)
+
+
+def run_warmup(companies=None, jobs=None, experience_levels=None, size_companies=None, concurrency=None, force=False):
+    """
+    예열을 한 번 실행하고 커버리지 보고서(dict)를 반환합니다. 보고서는 REPORT_PATH에도 저장합니다.
+    이미 다른 예열이 실행 중이면 None을 반환합니다.
+    """
+    if not _run_lock.acquire(blocking=False):
+        print("⏭️ 이미 캐시 예열이 실행 중입니다.")
+        return None
+    try:
+        default_companies, default_jobs, default_levels, default_size_companies = default_targets()
+        companies = companies or default_companies
+        jobs = jobs or default_jobs
+        experience_levels = experience_levels or default_levels
+        size_companies = default_size_companies if size_companies is None else size_companies
+        concurrency = max(1, concurrency or WARMUP_CONCURRENCY)
+
+        start = time.time()
+        print(f"🔥 캐시 예열 시작: 회사 {len(companies)}개 × 직무 {len(jobs)}개, 동시 {concurrency}개")
+        before = coverage(companies, jobs, experience_levels, size_companies)
+
+        # 기업 규모만 예열하는 회사는 직무 없이 처리
+        size_only = [company for company in dict.fromkeys(size_companies) if company not in companies]
+        work = [(company, jobs) for company in companies]
+        done = {task: 0 for task in TASK_LABELS}
+        usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(_warm_company, company, company_jobs, experience_levels, force)
+                       for company, company_jobs in work]
+            futures += [executor.submit(_warm_size_only, company, force) for company in size_only]
+            for future in futures:
+                company_done, company_usage = future.result()
+                for task, count in company_done.items():
+                    done[task] += count
+                for key in usage:
+                    usage[key] += company_usage[key]
+
+        report = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "companies": list(companies),
+            "jobs": list(jobs),
+            "experience_levels": list(experience_levels),
+            "size_companies": list(size_companies),
+            "before": before,
+            "after": coverage(companies, jobs, experience_levels, size_companies),
+            "attempted": done,
+            "usage": usage,
+            "elapsed": time.time() - start,
+        }
+        os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+        with open(REPORT_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✅ 캐시 예열 완료\n{format_coverage(report)}")
+        return report
+    finally:
+        _run_lock.release()
+
+
+def run_periodically(interval_hours=None, **kwargs):
+    """
+    interval_hours마다 예열을 반복합니다. 0 이하면 한 번만 실행합니다.
+    """
+    interval_hours = WARMUP_INTERVAL_HOURS if interval_hours is None else interval_hours
+    while True:
+        try:
+            run_warmup(**kwargs)
+        except Exception as e:
+            print(f"❌ 캐시 예열 중 오류: {e}")
+        if interval_hours <= 0:
+            return
+        time.sleep(interval_hours * 3600)
+
+
+def start_background_warmer(interval_hours=None, **kwargs):
+    """
+    앱 시작 시 호출: 데몬 스레드에서 예열(과 주기 반복)을 시작하고 스레드를 반환합니다.
+    """
+    thread = threading.Thread(target=run_periodically, args=(interval_hours,), kwargs=kwargs,
+                              name="cache-warmer", daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="예제 회사 × 직무 캐시 예열")
+    parser.add_argument("--companies", nargs="+", help="예열할 회사 (기본: 예제 회사 목록)")
+    parser.add_argument("--jobs", nargs="+", help="예열할 직무 (기본: 예제 직무 목록)")
+    parser.add_argument("--experience-levels", nargs="+", help="컨텍스트 리포트 경력 수준 (기본: 신입)")
+    parser.add_argument("--concurrency", type=int, default=None, help=f"동시에 예열할 회사 수 (기본 {WARMUP_CONCURRENCY})")
+    parser.add_argument("--interval", type=float, default=None, help="반복 주기(시간). 0이면 한 번만 실행")
+    parser.add_argument("--force", action="store_true", help="신선한 항목도 다시 생성")
+    parser.add_argument("--report", action="store_true", help="호출 없이 현재 커버리지만 출력")
+    args = parser.parse_args()
+
+    if args.report:
+        companies, jobs, levels, size_companies = default_targets()
+        current = coverage(args.companies or companies, args.jobs or jobs, args.experience_levels or levels, size_companies)
+        for task, label in TASK_LABELS.items():
+            entry = current[task]
+            rate = entry["warm"] / entry["total"] if entry["total"] else 0.0
+            print(f"{label}: {entry['warm']}/{entry['total']} ({rate:.0%})")
+        return
+
+    run_periodically(args.interval, companies=args.companies, jobs=args.jobs,
+                     experience_levels=args.experience_levels, concurrency=args.concurrency, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
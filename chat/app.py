@@ -11,9 +11,16 @@ import gradio as gr
 import yaml
 import json
 import re
+import uuid
 from llm_functions import get_interviewer_response, get_student_response, generate_cover_letter_response
 from utils import parse_json_from_response
 from guide_generation.llm_functions import generate_guide as create_guide_from_llm
+from workload_scheduler import get_scheduler
+from session_store import get_session_store
+from stream_coalescer import coalesced
+from llm_gateway import cancel_streams
+from company_context import CONTEXT_FIELDS, build_company_context
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Load environment variables and initial data
@@ -26,17 +33,51 @@ with open("example_info.json", "r", encoding='utf-8') as f:
     # This now serves as the default values for the UI
     default_info = json.load(f)
 
-def user_submit(message, history):
-    """사용자 입력을 처리하고, 챗봇 기록을 업데이트합니다."""
-    if not message.strip():
-        return "", history
-    history.append([message, None])
-    return "", history
+# 대화 기록과 shared_info는 세션 저장소에 두고, 브라우저와는 세션 ID만 주고받습니다.
+session_store = get_session_store()
 
-def bot_response(history, shared_info, progress=gr.Progress()):
+def load_session(session_id):
+    """세션 저장소에서 {"info": shared_info, "history": history}를 읽습니다. 없으면 기본값."""
+    session = (session_store.load(session_id) if session_id else None) or {}
+    session.setdefault("info", default_info.copy())
+    session.setdefault("history", [])
+    return session
+
+def save_session(session_id, info=None, history=None):
+    """
+    바뀐 필드만 저장합니다. (None으로 둔 필드는 저장소 값을 그대로 둡니다)
+    다른 워커가 같은 세션의 다른 필드를 동시에 저장해도 서로 덮어쓰지 않습니다.
+    """
+    fields = {}
+    if info is not None:
+        fields["info"] = info
+    if history is not None:
+        fields["history"] = history
+    if session_id and fields:
+        session_store.save(session_id, fields)
+
+def init_session():
+    session_id = uuid.uuid4().hex
+    save_session(session_id, default_info.copy(), [])
+    return session_id
+
+def user_submit(message, session_id):
+    """사용자 입력을 서버 쪽 대화 기록에 추가합니다. (화면 갱신은 이어지는 bot_response가 합니다)"""
+    if message.strip():
+        session = load_session(session_id)
+        session["history"].append([message, None])
+        save_session(session_id, history=session["history"])
+    return ""
+
+def bot_response(session_id, progress=gr.Progress(), history=None, request: gr.Request = None):
     """면접관의 응답을 생성하고 진행률을 업데이트합니다."""
+    session = load_session(session_id)
+    shared_info = session["info"]
+    if history is None:
+        history = session["history"]
     if not history or history[-1][1] is not None:
-        return history, gr.update()
+        yield history, gr.update()
+        return
     
     conversation_str = ""
     for h in history:
@@ -49,7 +90,7 @@ def bot_response(history, shared_info, progress=gr.Progress()):
 
     history[-1][1] = ""
     full_response = ""
-    for chunk in get_interviewer_response(format_info):
+    for chunk in get_interviewer_response(format_info, cancel_key=cancel_key(request, CHAT_STREAMS)):
         full_response += chunk
         history[-1][1] = full_response
         yield history, gr.update()
@@ -66,13 +107,17 @@ def bot_response(history, shared_info, progress=gr.Progress()):
         if final_progress >= 100:
              history.append([None, "면접이 종료되었습니다. 자기소개서 생성 탭으로 이동하세요."])
     
+    save_session(session_id, history=history)
     yield history, final_progress_update
 
 
-def generate_ai_reply(history, shared_info, progress=gr.Progress()):
+def generate_ai_reply(session_id, progress=gr.Progress(), request: gr.Request = None):
     """학생의 AI 답변을 생성하고, 그에 대한 면접관의 후속 질문을 받습니다."""
+    session = load_session(session_id)
+    shared_info, history = session["info"], session["history"]
     if not history or not history[-1][1]:
-        return history, gr.update()
+        yield history, gr.update()
+        return
     
     conversation_str = ""
     for h in history:
@@ -85,7 +130,7 @@ def generate_ai_reply(history, shared_info, progress=gr.Progress()):
 
     student_answer_json = ""
     history.append(["", None])
-    for chunk in get_student_response(format_info):
+    for chunk in get_student_response(format_info, cancel_key=cancel_key(request, CHAT_STREAMS)):
         student_answer_json += chunk
         parsed_data = parse_json_from_response(student_answer_json)
         if parsed_data:
@@ -99,12 +144,14 @@ def generate_ai_reply(history, shared_info, progress=gr.Progress()):
         history[-1][0] = final_data.get("answer", "응답을 처리하는 데 실패했습니다.")
     yield history, gr.update()
 
-    yield from bot_response(history, shared_info, progress=progress)
+    yield from bot_response(session_id, progress=progress, history=history, request=request)
 
-def generate_all_cover_letters(history, shared_info, word_limit, progress=gr.Progress()):
+def generate_all_cover_letters(session_id, word_limit, progress=gr.Progress(), request: gr.Request = None):
     """모든 자기소개서 문항에 대한 답변을 생성하고 진행률을 표시합니다."""
+    session = load_session(session_id)
+    shared_info, history = session["info"], session["history"]
     if not history:
-        yield [gr.update(value="면접 대화가 없습니다.")] * len(shared_info.get('questions', [])) + [gr.update()]
+        yield [gr.update(value="면접 대화가 없습니다.")] * len(cover_letter_outputs) + [gr.update()]
         return
 
     conversation_str = ""
@@ -121,7 +168,7 @@ def generate_all_cover_letters(history, shared_info, word_limit, progress=gr.Pro
     for i, question in enumerate(shared_info.get('questions', [])):
         full_response = ""
         flow = shared_info.get('guide', '')
-        for chunk in generate_cover_letter_response(question, [], format_info, flow, word_limit):
+        for chunk in generate_cover_letter_response(question, [], format_info, flow, word_limit, cancel_key=cancel_key(request, COVER_LETTER_STREAMS)):
             full_response += chunk
             parsed_data = parse_json_from_response(full_response)
             if parsed_data and 'answer' in parsed_data:
@@ -144,8 +191,18 @@ def generate_all_cover_letters(history, shared_info, word_limit, progress=gr.Pro
             
     yield final_outputs + [gr.update(visible=False)]
 
-def update_guide_and_info(company, position, jd, questions_str):
-    guide_json, _ = create_guide_from_llm(questions_str, jd, company, "신입") # experience_level is hardcoded for now
+def update_guide_and_info(company, position, jd, questions_str, session_id):
+    # 가이드 생성과 회사 컨텍스트(산업/규모/핵심가치/리포트/최근 이슈) 채우기를 동시에 실행합니다.
+    # 컨텍스트는 응답 캐시에 있는 분석 결과를 먼저 쓰고 빠진 분석만 실행하므로, 대기 시간은 둘 중 긴 쪽입니다.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        guide_future = executor.submit(create_guide_from_llm, questions_str, jd, company, "신입") # experience_level is hardcoded for now
+        context_future = executor.submit(build_company_context, company, position, "신입")
+        guide_json, _ = guide_future.result()
+        try:
+            company_context = context_future.result()
+        except Exception as e:
+            print(f"❌ 회사 컨텍스트 채우기 실패, 기본값 사용: {e}")
+            company_context = {}
     
     if guide_json and "guide" in guide_json:
         guide_text = guide_json["guide"]
@@ -153,6 +210,9 @@ def update_guide_and_info(company, position, jd, questions_str):
         guide_text = "가이드 생성에 실패했습니다. 입력값을 확인해주세요."
 
     new_info = default_info.copy()
+    # example_info.json의 예시 회사 값이 다른 회사 면접에 섞이지 않도록 채우지 못한 필드는 비웁니다.
+    new_info.update({field: "" for field in CONTEXT_FIELDS})
+    new_info.update(company_context)
     new_info.update({
         "company_name": company,
         "position_title": position,
@@ -161,12 +221,30 @@ def update_guide_and_info(company, position, jd, questions_str):
         "guide": guide_text
     })
     
-    # Return new state and update for the guide display
-    return new_info, guide_text
+    save_session(session_id, info=new_info)
+    return guide_text
+
+# 취소 키의 이벤트 종류. 대화 초기화는 대화 스트림만 닫고, 진행 중인 자기소개서 생성은 그대로 둡니다.
+CHAT_STREAMS = "chat"
+COVER_LETTER_STREAMS = "cover_letter"
+
+def cancel_key(request, event):
+    """업스트림 스트림을 묶는 취소 키 (Gradio 브라우저 세션 + 이벤트 종류 단위)"""
+    return f"{request.session_hash}:{event}" if request else None
+
+def cancel_session_streams(request: gr.Request):
+    """탭을 닫거나 세션이 끝나면 그 세션에서 열린 LLM 스트림을 모두 닫습니다."""
+    for event in (CHAT_STREAMS, COVER_LETTER_STREAMS):
+        cancel_streams(cancel_key(request, event))
+
+def clear_chat(session_id, request: gr.Request = None):
+    cancel_streams(cancel_key(request, CHAT_STREAMS))
+    save_session(session_id, history=[])
+    return [], "자기소개서 완성도: 0%"
 
 # --- Gradio UI ---
 with gr.Blocks(theme=gr.themes.Soft()) as demo:
-    shared_info = gr.State(default_info)
+    session_id = gr.Textbox(visible=False)
 
     with gr.Tabs() as tabs:
         with gr.TabItem("가이드 생성", id=0):
@@ -201,17 +279,24 @@ with gr.Blocks(theme=gr.themes.Soft()) as demo:
             cover_letter_outputs = [gr.Textbox(label=f"답변 {i+1}", lines=8, interactive=False) for i, q in enumerate(default_info.get('questions',[]))]
 
     # Event Handlers
+    # 가이드 생성은 회사 컨텍스트 웹 검색을 기다리므로 웹 검색 동시 실행 그룹에서 실행합니다.
+    scheduler = get_scheduler()
+    web_search_options = {"concurrency_id": "web_search", "concurrency_limit": scheduler.classes["web_search"].concurrency}
     generate_guide_btn.click(
         fn=update_guide_and_info,
-        inputs=[company_name_input, position_title_input, jd_input, questions_input],
-        outputs=[shared_info, guide_output]
+        inputs=[company_name_input, position_title_input, jd_input, questions_input, session_id],
+        outputs=guide_output,
+        **web_search_options
     )
     
-    submit_btn.click(user_submit, [msg, chatbot], [msg, chatbot]).then(bot_response, [chatbot, shared_info], [chatbot, progress_display])
-    msg.submit(user_submit, [msg, chatbot], [msg, chatbot]).then(bot_response, [chatbot, shared_info], [chatbot, progress_display])
-    ai_reply_btn.click(generate_ai_reply, [chatbot, shared_info], [chatbot, progress_display])
-    clear_btn.click(lambda: ([], "자기소개서 완성도: 0%"), None, [chatbot, progress_display], queue=False)
-    generate_btn.click(generate_all_cover_letters, [chatbot, shared_info, word_limit_input], cover_letter_outputs + [cover_letter_progress_display])
+    # chatbot은 출력 전용입니다. 대화 기록은 세션 저장소에 있고 요청에는 세션 ID만 실립니다.
+    submit_event = submit_btn.click(user_submit, [msg, session_id], msg, queue=False).then(coalesced(bot_response), session_id, [chatbot, progress_display])
+    msg_event = msg.submit(user_submit, [msg, session_id], msg, queue=False).then(coalesced(bot_response), session_id, [chatbot, progress_display])
+    ai_reply_event = ai_reply_btn.click(coalesced(generate_ai_reply), session_id, [chatbot, progress_display])
+    clear_btn.click(clear_chat, session_id, [chatbot, progress_display], queue=False, cancels=[submit_event, msg_event, ai_reply_event])
+    generate_btn.click(coalesced(generate_all_cover_letters), [session_id, word_limit_input], cover_letter_outputs + [cover_letter_progress_display])
+    demo.load(init_session, None, session_id, queue=False)
+    demo.unload(cancel_session_streams)
 
 if __name__ == "__main__":
     demo.launch(share=True)
\ No newline at end of file
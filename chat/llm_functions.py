@@ -1,13 +1,20 @@
-from openai import OpenAI
 import yaml
 import os
+import sys
 import json
 from dotenv import load_dotenv
 
+# 프로젝트 루트를 path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from llm_gateway import create_client
+
 load_dotenv()
 
-# 클라이언트 및 프롬프트 초기화
-client = OpenAI()
+# 클라이언트 및 프롬프트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client()
 
 try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,7 +30,7 @@ except Exception as e:
         "Memory": "Create a memory based on the conversation history."
     }
 
-def get_interviewer_response(example_info):
+def get_interviewer_response(example_info, cancel_key=None):
     """
     진행률(progress)을 포함한 면접관의 응답을 스트리밍으로 생성합니다.
     """
@@ -42,12 +49,17 @@ def get_interviewer_response(example_info):
     response_stream = client.chat.completions.create(
         model="gpt-4o",
         messages=conversation,
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
-    for chunk in response_stream:
-        yield chunk.choices[0].delta.content or ""
+    # 소비하던 쪽이 생성기를 닫으면(사용자 취소) 남은 응답을 받지 않고 연결을 닫습니다.
+    try:
+        for chunk in response_stream:
+            yield chunk.choices[0].delta.content or ""
+    finally:
+        response_stream.close()
 
-def get_student_response(example_info):
+def get_student_response(example_info, cancel_key=None):
     """학생의 AI 답변을 스트리밍으로 생성합니다."""
     system_prompt = prompts.get("Student", "").format(**example_info)
     
@@ -63,12 +75,17 @@ def get_student_response(example_info):
     response_stream = client.chat.completions.create(
         model="gpt-4o",
         messages=conversation,
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
-    for chunk in response_stream:
-        yield chunk.choices[0].delta.content or ""
+    # 소비하던 쪽이 생성기를 닫으면(사용자 취소) 남은 응답을 받지 않고 연결을 닫습니다.
+    try:
+        for chunk in response_stream:
+            yield chunk.choices[0].delta.content or ""
+    finally:
+        response_stream.close()
 
-def generate_cover_letter_response(question, conversation_history, example_info, flow, word_limit):
+def generate_cover_letter_response(question, conversation_history, example_info, flow, word_limit, cancel_key=None):
     """
     진행률을 포함하여 자기소개서 답변을 스트리밍으로 생성합니다.
     """
@@ -97,12 +114,17 @@ def generate_cover_letter_response(question, conversation_history, example_info,
     response_stream = client.chat.completions.create(
         model="gpt-4o",
         messages=[{"role": "user", "content": prompt}],
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
-    for chunk in response_stream:
-        yield chunk.choices[0].delta.content or ""
+    # 소비하던 쪽이 생성기를 닫으면(사용자 취소) 남은 응답을 받지 않고 연결을 닫습니다.
+    try:
+        for chunk in response_stream:
+            yield chunk.choices[0].delta.content or ""
+    finally:
+        response_stream.close()
 
-def generate_memory(conversation_history, current_memory=""):
+def generate_memory(conversation_history, current_memory="", cancel_key=None):
     """
     대화 기록을 바탕으로 메모리를 생성합니다.
     """
@@ -121,14 +143,18 @@ def generate_memory(conversation_history, current_memory=""):
     response_stream = client.chat.completions.create(
         model="gpt-4o",
         messages=[{"role": "user", "content": prompt}],
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
     
     full_response = ""
-    for chunk in response_stream:
-        chunk_content = chunk.choices[0].delta.content or ""
-        full_response += chunk_content
-        yield chunk_content
+    try:
+        for chunk in response_stream:
+            chunk_content = chunk.choices[0].delta.content or ""
+            full_response += chunk_content
+            yield chunk_content
+    finally:
+        response_stream.close()
         
     # 최종 응답에서 JSON 파싱 시도
     try:
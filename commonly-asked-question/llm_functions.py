@@ -1,13 +1,22 @@
 import os
+import sys
 import json
 import re
+import time
 import yaml
-from openai import OpenAI
 from dotenv import load_dotenv
 load_dotenv()
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 프로젝트 루트를 path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from search_policy import choose_search_context_size, record_search_call
+from llm_gateway import create_client
+
+# OpenAI 클라이언트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 프롬프트 템플릿 로드
 import os
@@ -178,7 +187,7 @@ def parse_prediction_complex(content):
         print(f"파싱 실패한 컨텐츠: {repr(content)}")
         return []
 
-def generate_interview_questions(company_name, job_title, experience_level, selected_questions, num_questions=3):
+def generate_interview_questions(company_name, job_title, experience_level, selected_questions, num_questions=3, search_context_size=None):
     """
     OpenAI API를 사용하여 맞춤형 면접 질문을 생성하는 함수
     """
@@ -203,15 +212,29 @@ def generate_interview_questions(company_name, job_title, experience_level, sele
         )
         
         print(prompt)
+        # search_context_size는 회사 조사 이력에 따라 선택 (명시값 우선)
+        if search_context_size:
+            size_reason = "explicit"
+        else:
+            search_context_size, size_reason = choose_search_context_size("commonly_asked", company_name)
+        
         # OpenAI Responses API 호출 (Web Search Preview 사용)
-        response = client.responses.create(
-            model="gpt-4o",
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": "high",
-            }],
-            input=f"당신은 면접 질문 생성 전문가입니다. 웹 검색을 통해 최신 기업 정보와 채용 동향을 확인하고 주어진 조건에 맞는 구체적이고 실용적인 면접 질문을 생성해주세요.\n\n{prompt}"
-        )
+        start_time = time.time()
+        try:
+            response = client.responses.create(
+                model="gpt-4o",
+                tools=[{
+                    "type": "web_search_preview",
+                    "search_context_size": search_context_size,
+                }],
+                input=f"당신은 면접 질문 생성 전문가입니다. 웹 검색을 통해 최신 기업 정보와 채용 동향을 확인하고 주어진 조건에 맞는 구체적이고 실용적인 면접 질문을 생성해주세요.\n\n{prompt}"
+            )
+        except Exception:
+            # 실패한 호출도 기록 (성공률 집계)
+            record_search_call("commonly_asked", company_name, search_context_size, size_reason,
+                               time.time() - start_time, None, "gpt-4o", success=False)
+            raise
+        latency = time.time() - start_time
         
         content = response.output_text
         print(f"=== AI 응답 원본 ===")
@@ -230,6 +253,8 @@ def generate_interview_questions(company_name, job_title, experience_level, sele
         
         print(f"=== AI 응답 끝 ===")
         questions = parse_prediction(content)
+        record_search_call("commonly_asked", company_name, search_context_size, size_reason,
+                           latency, response, "gpt-4o", success=bool(questions))
         
         if not questions:
             return "질문 생성에 실패했습니다. 다시 시도해주세요.", []
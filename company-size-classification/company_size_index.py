@@ -0,0 +1,100 @@
+"""
+기업 규모 로컬 인덱스
+
+정규화된 회사명 -> 기업 규모 카테고리(대기업/중견기업/.../금융업)와 인용 자료를
+응답 캐시(response_cache의 "company_size" namespace)에 저장합니다.
+eval.json 예제로 초기 데이터를 채우고, LLM 분류가 성공할 때마다 갱신합니다.
+"""
+
+import os
+import sys
+import json
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from response_cache import get_cache
+from company_names import company_key
+
+CACHE_NAMESPACE = "company_size"
+eval_path = os.path.join(current_dir, 'eval.json')
+
+# 이 기간이 지난 항목은 stale로 보고 재검증합니다.
+FRESH_TTL_SECONDS = float(os.getenv("COMPANY_SIZE_TTL_DAYS", "30")) * 24 * 3600
+
+with open(eval_path, 'r', encoding='utf-8') as f:
+    _eval_data = json.load(f)
+
+SIZE_CATEGORIES = _eval_data['company_size_classification']['enum']
+
+
+def canonical_company_name(company_name):
+    """
+    인덱스 키로 쓰는 회사명 (company_names.company_key: 정규화 + 별칭)
+    """
+    return company_key(company_name)
+
+
+def seed_from_eval(cache=None):
+    """
+    eval.json 예제 중 인덱스에 없는 회사를 추가합니다. 추가된 개수를 반환합니다.
+    """
+    cache = cache or get_cache()
+    added = 0
+    for example in _eval_data['examples']:
+        key = canonical_company_name(example['input'])
+        if cache.get_entry(CACHE_NAMESPACE, key) is None:
+            cache.set(CACHE_NAMESPACE, key, {
+                "company_name": example['input'],
+                "category": example['output'],
+                "citations": [],
+                "content": "",
+                "source": "eval"
+            })
+            added += 1
+    return added
+
+
+def lookup(company_name, cache=None):
+    """
+    (entry, is_fresh)를 반환합니다. 인덱스에 없으면 (None, False).
+    """
+    cache = cache or get_cache()
+    found = cache.get_entry(CACHE_NAMESPACE, canonical_company_name(company_name))
+    if found is None:
+        return None, False
+    entry, updated_at = found
+    return entry, (time.time() - updated_at) <= FRESH_TTL_SECONDS
+
+
+def update(company_name, category, citations, content, cache=None):
+    """
+    LLM 분류 결과로 인덱스를 갱신합니다. 유효한 카테고리만 저장합니다.
+    """
+    if category not in SIZE_CATEGORIES:
+        return False
+    cache = cache or get_cache()
+    cache.set(CACHE_NAMESPACE, canonical_company_name(company_name), {
+        "company_name": company_name,
+        "category": category,
+        "citations": citations,
+        "content": content,
+        "source": "llm"
+    })
+    return True
+
+
+_seeded = False
+
+
+def ensure_seeded():
+    """
+    프로세스당 한 번만 eval.json 시드를 적용합니다.
+    """
+    global _seeded
+    if not _seeded:
+        seed_from_eval()
+        _seeded = True
@@ -1,17 +1,57 @@
-import openai
 import yaml
 import re
-
-# OpenAI client 초기화
-client = openai.OpenAI()
+import json
+import sys
+import time
 
 # 프롬프트 템플릿 로드
 import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+import company_size_index
+from search_policy import choose_batch_search_context_size, choose_search_context_size, record_search_call
+from llm_gateway import create_client
+from batching import run_batched
+from company_names import learn_aliases_from_text
+
+# OpenAI client 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client()
+
 prompt_path = os.path.join(current_dir, 'prompt.yaml')
 with open(prompt_path, 'r', encoding='utf-8') as f:
     prompt_data = yaml.safe_load(f)
     prompt_template = prompt_data['prompt']
+    batch_prompt_template = prompt_data['prompt_batch']
+
+# 배치 분류 시 요청 하나에 넣는 최대 기업 수
+COMPANY_SIZE_BATCH_SIZE = int(os.getenv("COMPANY_SIZE_BATCH_SIZE", "20"))
+
+# 여러 기업을 한 번에 분류할 때의 스키마 (입력 id별 카테고리와 근거)
+BATCH_SIZE_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "category": {"type": "string", "enum": company_size_index.SIZE_CATEGORIES},
+                    "reason": {"type": "string"}
+                },
+                "required": ["id", "category", "reason"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["results"],
+    "additionalProperties": False
+}
 
 
 def parse_prediction(content):
@@ -34,22 +74,82 @@ def parse_prediction(content):
     
     return predicted_category
 
-def analyze_company_size(company_name):
+def format_size_result(company_name, content, citations, note=""):
+    """
+    분석 내용과 인용 자료를 최종 마크다운 결과로 포맷팅하는 함수
+    """
+    # 참조 URL 형식화
+    reference_text = ""
+    if citations:
+        reference_text = "\n\n📚 **참고 자료:**\n"
+        for i, citation in enumerate(citations, 1):
+            reference_text += f"{i}. [{citation['title']}]({citation['url']})\n"
+    
+    return f"""## 🏢 {company_name} 기업 규모 분석 결과
+
+{content}
+
+{reference_text}
+
+---
+{note}*본 분석은 OpenAI Search API를 통해 수집된 최신 웹 정보를 바탕으로 수행되었습니다.*
+"""
+
+def format_indexed_result(company_name, entry, note):
+    """
+    로컬 인덱스 항목을 결과로 포맷팅하는 함수
+    """
+    content = entry.get('content') or f"**기업 규모 분류:** {entry['category']}"
+    return format_size_result(company_name, content, entry.get('citations', []), note)
+
+def analyze_company_size(company_name, force_refresh=False, search_context_size=None, research=None):
     """
     OpenAI Search API를 사용하여 기업 규모를 예측하는 함수
+
+    로컬 인덱스에 최신(fresh) 항목이 있으면 웹 검색 없이 바로 반환하고,
+    오래된(stale) 항목은 search_context_size "low"로 재검증합니다.
+    research(미리 조사한 회사 자료)가 주어지면 웹 검색 대신 그 자료를 근거로 분류합니다.
     """
+    company_size_index.ensure_seeded()
+    entry, is_fresh = company_size_index.lookup(company_name)
+    if entry and is_fresh and not force_refresh:
+        print(f"기업 규모 인덱스 사용: {company_name} -> {entry['category']}")
+        return format_indexed_result(company_name, entry, "*로컬 기업 인덱스에서 조회한 결과입니다.*\n\n"), entry['category']
+    
     try:
-        # OpenAI Search API를 사용한 회사 정보 검색
-        search_response = client.responses.create(
-            model="gpt-4o",
-            tools=[
+        if research:
+            # 공유 조사 자료 사용 (웹 검색 없음)
+            tools = []
+            input_text = f"{prompt_template.format(company_name=company_name)}\n\n웹 검색 대신 아래 조사 자료를 근거로 판단하세요.\n\n[조사 자료]\n{research}"
+        else:
+            # search_context_size는 회사 조사 이력에 따라 선택 (명시값 우선)
+            if search_context_size:
+                size_reason = "explicit"
+            else:
+                search_context_size, size_reason = choose_search_context_size("company_size", company_name)
+            tools = [
                 {
                     "type": "web_search_preview",
-                    "search_context_size": "low",
+                    "search_context_size": search_context_size,
                 }
-            ],
-            input= prompt_template.format(company_name=company_name)
-        )
+            ]
+            input_text = prompt_template.format(company_name=company_name)
+        
+        # OpenAI Search API를 사용한 회사 정보 검색
+        start_time = time.time()
+        try:
+            search_response = client.responses.create(
+                model="gpt-4o",
+                tools=tools,
+                input=input_text
+            )
+        except Exception:
+            # 실패한 호출도 기록 (성공률 집계)
+            if not research:
+                record_search_call("company_size", company_name, search_context_size, size_reason,
+                                   time.time() - start_time, None, "gpt-4o", success=False)
+            raise
+        latency = time.time() - start_time
         
         # 응답에서 실제 메시지 찾기 (웹 검색 호출과 분리)
         print(search_response)
@@ -60,6 +160,9 @@ def analyze_company_size(company_name):
                 break
         
         if message_output is None:
+            if not research:
+                record_search_call("company_size", company_name, search_context_size, size_reason,
+                                   latency, search_response, "gpt-4o", success=False)
             raise Exception("응답에서 메시지 내용을 찾을 수 없습니다.")
         
         # 응답에서 내용과 URL 추출
@@ -78,27 +181,23 @@ def analyze_company_size(company_name):
         # 기업 규모 카테고리 추출
         predicted_category = parse_prediction(content)
         
-        # 참조 URL 형식화
-        reference_text = ""
-        if citations:
-            reference_text = "\n\n📚 **참고 자료:**\n"
-            for i, citation in enumerate(citations, 1):
-                reference_text += f"{i}. [{citation['title']}]({citation['url']})\n"
+        # 성공한 분류는 인덱스에 반영 (유효한 카테고리인 경우만 성공 / known)
+        is_valid = company_size_index.update(company_name, predicted_category, citations, content)
+        if not research:
+            record_search_call("company_size", company_name, search_context_size, size_reason,
+                               latency, search_response, "gpt-4o", success=is_valid)
+        learn_aliases_from_text(company_name, content)
         
         # 최종 결과 형식화 (카테고리와 분석 내용 분리 반환)
-        result_content = f"""## 🏢 {company_name} 기업 규모 분석 결과
-
-{content}
-
-{reference_text}
-
----
-*본 분석은 OpenAI Search API를 통해 수집된 최신 웹 정보를 바탕으로 수행되었습니다.*
-"""
+        result_content = format_size_result(company_name, content, citations)
         
         return result_content, predicted_category
         
     except Exception as e:
+        # 재검증에 실패하면 기존(stale) 인덱스 항목으로 대체
+        if entry:
+            print(f"기업 규모 재검증 실패, 기존 인덱스 사용: {e}")
+            return format_indexed_result(company_name, entry, "*재검증에 실패하여 이전에 저장된 결과를 표시합니다.*\n\n"), entry['category']
         error_msg = f"""## ❌ 오류 발생
 
 죄송합니다. {company_name}의 기업 규모 분석 중 오류가 발생했습니다.
@@ -107,4 +206,82 @@ def analyze_company_size(company_name):
 
 다시 시도해주시거나 다른 기업명을 입력해주세요.
 """
-        return error_msg, "오류 발생" 
\ No newline at end of file
+        return error_msg, "오류 발생"
+
+
+def request_company_size_batch(items, search_context_size=None):
+    """
+    여러 기업의 규모를 한 번의 요청으로 분류합니다.
+
+    items: [{"id", "company_name"}, ...]
+    반환: ({id: category}, response) - 응답에 없거나 카테고리가 유효하지 않은 id는 빠집니다.
+    성공한 항목은 단건 분류와 같이 기업 규모 인덱스에 반영합니다.
+    """
+    if not items:
+        return {}, None
+    company_names = [item["company_name"] for item in items]
+    if search_context_size:
+        size_reason = "explicit"
+    else:
+        search_context_size, size_reason = choose_batch_search_context_size("company_size", company_names)
+
+    payload = [{"id": str(item["id"]), "company_name": item["company_name"]} for item in items]
+    start_time = time.time()
+    try:
+        response = client.responses.create(
+            model="gpt-4o",
+            tools=[{"type": "web_search_preview", "search_context_size": search_context_size}],
+            text={
+                "format": {
+                    "type": "json_schema",
+                    "name": "company_size_batch",
+                    "schema": BATCH_SIZE_JSON_SCHEMA,
+                    "strict": True
+                }
+            },
+            input=batch_prompt_template.format(items=json.dumps(payload, ensure_ascii=False))
+        )
+    except Exception:
+        # 실패한 호출도 기록 (성공률 집계)
+        record_search_call("company_size", company_names, search_context_size, size_reason,
+                           time.time() - start_time, None, "gpt-4o", success=False)
+        raise
+    latency = time.time() - start_time
+
+    try:
+        results = json.loads(response.output_text).get("results", [])
+    except (json.JSONDecodeError, AttributeError) as e:
+        print(f"배치 기업 규모 응답 파싱 실패: {e}")
+        results = []
+
+    by_id = {str(item["id"]): item for item in items}
+    classified = {}
+    for result in results:
+        item = by_id.get(str(result.get("id")))
+        category = result.get("category")
+        if item is None or category not in company_size_index.SIZE_CATEGORIES:
+            continue
+        classified[item["id"]] = category
+        company_size_index.update(item["company_name"], category, [], result.get("reason", ""))
+    # 결과가 있는 회사만 known으로 표시
+    record_search_call("company_size", company_names, search_context_size, size_reason, latency, response, "gpt-4o",
+                       success=bool(classified), known=[by_id[item_id]["company_name"] for item_id in classified])
+    return classified, response
+
+
+def analyze_company_size_batch(items, max_batch_size=None, search_context_size=None, fallback_single=True, stats=None):
+    """
+    여러 기업을 최대 max_batch_size개씩 묶어 규모를 분류합니다.
+
+    응답에서 빠진 항목은 나눠서 다시 요청하고, 한 개까지 줄어도 실패하면(fallback_single) 단건 analyze_company_size로 처리합니다.
+    반환: 입력 순서의 [{"id", "category", "error"}] - 실패하면 category는 빈 문자열
+    """
+    def fallback(item):
+        _, category = analyze_company_size(item["company_name"], force_refresh=True, search_context_size=search_context_size)
+        return category if category in company_size_index.SIZE_CATEGORIES else None
+
+    results, errors = run_batched(
+        items, lambda chunk: request_company_size_batch(chunk, search_context_size),
+        max_batch_size or COMPANY_SIZE_BATCH_SIZE, fallback if fallback_single else None, stats
+    )
+    return [{"id": item["id"], "category": results.get(item["id"], ""), "error": errors.get(item["id"])} for item in items]
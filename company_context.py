@@ -0,0 +1,145 @@
+"""
+채팅 shared_info용 회사 컨텍스트 채우기
+
+면접 채팅의 프롬프트는 industry / company_size / core_values / context_report / recent_issue가 필요합니다.
+예전에는 example_info.json의 고정값이나 test_all.py의 하드코딩된 dict를 썼지만, 여기서는
+1. 응답 캐시에 남아 있는 산업 분류 / 기업 규모 인덱스 / 컨텍스트 리포트 결과를 먼저 읽고
+2. 빠진 분석만 동시에 실행해 채웁니다. (기업 종합 분석의 공유 조사 자료가 있으면 웹 검색 없이 사용)
+
+사용법:
+    context = build_company_context("카카오", "백엔드 개발자")
+    shared_info.update(context)
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from feature_modules import load_feature_module
+from response_cache import get_cache, make_cache_key
+from company_names import company_key
+
+# 채우는 shared_info 필드
+CONTEXT_FIELDS = ("industry", "company_size", "core_values", "context_report", "recent_issue")
+
+# 필드 묶음 -> 그 필드를 만드는 분석
+ANALYSIS_FIELDS = {
+    "industry": ("industry",),
+    "company_size": ("company_size",),
+    "context_report": ("core_values", "context_report", "recent_issue"),
+}
+
+
+def _industry_fields(tags, module):
+    labels = [module.TAG_LABELS.get(tag, tag) for tag in tags]
+    return {"industry": ", ".join(labels)} if labels else {}
+
+
+def _report_fields(report_data):
+    profile = report_data.get("company_profile", {})
+    position = report_data.get("position_analysis", {})
+    summary = " ".join(
+        text for text in (profile.get("vision_mission"), profile.get("talent_philosophy"), position.get("role_summary"))
+        if text
+    )
+    fields = {
+        "core_values": ", ".join(profile.get("core_values") or []),
+        "context_report": summary,
+        "recent_issue": profile.get("recent_news_summary", ""),
+    }
+    return {key: value for key, value in fields.items() if value}
+
+
+def _shared_research(company_name, job_title):
+    """
+    기업 종합 분석이 남긴 공유 조사 자료 (없으면 None)
+    """
+    from dossier import RESEARCH_NAMESPACE, RESEARCH_MAX_AGE_SECONDS
+    cached = get_cache().get(RESEARCH_NAMESPACE, make_cache_key(company_key(company_name), job_title), max_age=RESEARCH_MAX_AGE_SECONDS)
+    return cached["notes"] if cached else None
+
+
+def cached_company_context(company_name, job_title, experience_level="신입"):
+    """
+    응답 캐시에 이미 있는 분석 결과로 채울 수 있는 필드만 반환합니다. (LLM 호출 없음)
+    """
+    cache = get_cache()
+    context = {}
+
+    industry = load_feature_module("industry")
+    if industry is not None:
+        cached = cache.get(industry.CACHE_NAMESPACE, make_cache_key(company_key(company_name), job_title))
+        if cached:
+            context.update(_industry_fields(cached.get("tags", []), industry))
+
+    size = load_feature_module("company_size")
+    if size is not None:
+        # 오래된(stale) 항목이라도 채팅 프롬프트에는 충분합니다.
+        entry, _ = size.company_size_index.lookup(company_name)
+        if entry:
+            context["company_size"] = entry["category"]
+
+    jasoseo = load_feature_module("jasoseo")
+    if jasoseo is not None:
+        cached = cache.get(jasoseo.CACHE_NAMESPACE, make_cache_key(company_key(company_name), job_title, experience_level))
+        if cached:
+            context.update(_report_fields(cached))
+
+    return context
+
+
+def _run_analysis(analysis, company_name, job_title, experience_level, research):
+    """
+    분석 하나를 실행해 채운 필드를 반환합니다. 실패하면 빈 dict.
+    """
+    if analysis == "industry":
+        module = load_feature_module("industry")
+        if module is None:
+            return {}
+        _, tags = module.classify_industry(job_title, company_name, research=research)
+        return _industry_fields(tags, module)
+    if analysis == "company_size":
+        module = load_feature_module("company_size")
+        if module is None:
+            return {}
+        _, category = module.analyze_company_size(company_name, research=research)
+        return {"company_size": category} if category in module.company_size_index.SIZE_CATEGORIES else {}
+    module = load_feature_module("jasoseo")
+    if module is None:
+        return {}
+    result = module.generate_context_report(job_title, company_name, experience_level, research=research)
+    return _report_fields(result[1]) if len(result) > 1 and result[1] else {}
+
+
+def build_company_context(company_name, job_title, experience_level="신입"):
+    """
+    캐시된 결과로 채우고, 빠진 필드를 만드는 분석만 동시에 실행합니다.
+    채우지 못한 필드는 결과에 넣지 않으므로 호출하는 쪽의 기본값이 유지됩니다.
+    """
+    if not company_name or not job_title:
+        return {}
+    context = cached_company_context(company_name, job_title, experience_level)
+    missing = [analysis for analysis, fields in ANALYSIS_FIELDS.items()
+               if any(field not in context for field in fields)]
+    if not missing:
+        print(f"✅ 회사 컨텍스트 캐시 사용: {company_name} / {job_title}")
+        return context
+
+    print(f"🔍 회사 컨텍스트 분석 실행: {', '.join(missing)}")
+    research = _shared_research(company_name, job_title)
+    with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+        futures = [executor.submit(_run_analysis, analysis, company_name, job_title, experience_level, research)
+                   for analysis in missing]
+        for future in futures:
+            try:
+                fields = future.result()
+            except Exception as e:
+                print(f"❌ 회사 컨텍스트 분석 실패: {e}")
+                continue
+            for key, value in fields.items():
+                context.setdefault(key, value)
+    return context
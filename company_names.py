@@ -0,0 +1,265 @@
+"""
+회사명 정규화와 별칭(alias) 인덱스
+
+"토스", "토스 (비바리퍼블리카)", "Toss", "비바리퍼블리카", " 토스 "가 모두 다른 캐시 키가 되어
+같은 회사를 매번 새로 웹 검색하지 않도록, 모든 모듈의 회사 캐시 키는 company_key()를 거칩니다.
+1. 정규화: Unicode NFKC(㈜, 전각 문자 포함) + 소문자화, 괄호 속 별칭 분리,
+   법인 표기((주), 주식회사, Co., Ltd., Inc. 등) 제거, 공백/끝 문장부호 제거
+2. 별칭: 정규화된 이름 -> 대표 키. 시드(한글/영문 표기)와 함께, 입력의 괄호 표기("토스 (비바리퍼블리카)")와
+   LLM 응답 속 정식 명칭/괄호 병기에서 새 별칭을 배웁니다. 이미 다른 회사로 연결된 별칭은 덮어쓰지 않습니다.
+별칭은 응답 캐시의 "company_aliases" namespace에 저장되어 프로세스 간에 공유됩니다.
+
+사용법:
+    python company_names.py --measure                     # search_policy 로그로 캐시 적중률 비교 (기존 키 vs company_key)
+    python company_names.py --measure --log other.jsonl
+    python company_names.py --alias 비바리퍼블리카 토스    # 별칭 직접 추가
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+import unicodedata
+from collections import defaultdict
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from response_cache import get_cache
+
+ALIAS_NAMESPACE = "company_aliases"
+
+# 대표 이름 -> 별칭 (한글/영문 표기, 법인명, 통칭)
+SEED_ALIASES = {
+    "토스": ["Toss", "비바리퍼블리카", "Viva Republica"],
+    "삼성전자": ["Samsung Electronics"],
+    "카카오": ["Kakao", "Kakao Corp"],
+    "네이버": ["Naver"],
+    "LG전자": ["LG Electronics", "엘지전자"],
+    "현대자동차": ["현대차", "Hyundai Motor", "Hyundai Motor Company"],
+    "CJ제일제당": ["CJ CheilJedang", "씨제이제일제당"],
+    "하이브": ["HYBE", "빅히트", "빅히트엔터테인먼트"],
+    "쿠팡": ["Coupang"],
+    "배달의민족": ["배민", "우아한형제들", "Woowa Brothers", "Baemin"],
+    "신한은행": ["Shinhan Bank"],
+    "SKT": ["SK텔레콤", "SK Telecom", "에스케이텔레콤"],
+    "포스코": ["POSCO"],
+    "현대건설": ["Hyundai E&C", "Hyundai Engineering & Construction"],
+    "아모레퍼시픽": ["Amorepacific"],
+}
+
+# 법인 표기 (정규화 중 제거)
+LEGAL_SUFFIX_PATTERN = re.compile(
+    r"\((?:주|유|사|재)\)|주식회사|유한회사|유한책임회사|사단법인|재단법인|"
+    r"\b(?:co\.?\s*,?\s*ltd|company\s+limited|corporation|corp|inc|ltd|llc|plc|gmbh)\b\.?",
+    re.IGNORECASE
+)
+PAREN_PATTERN = re.compile(r"[(\[]([^()\[\]]*)[)\]]")
+TRAILING_PUNCTUATION = ".,·-_/&' "
+
+# 별칭으로 배우지 않는 일반 명사
+GENERIC_NAMES = {"그룹", "본사", "한국", "korea", "홀딩스", "holdings", "주", "회사", "법인", "지주사", "계열사"}
+
+_lock = threading.Lock()
+_aliases = None
+
+
+def split_aliases(name):
+    """
+    "토스 (비바리퍼블리카)" -> ("토스", ["비바리퍼블리카"]). 법인 표기만 있는 괄호는 별칭으로 보지 않습니다.
+    """
+    text = LEGAL_SUFFIX_PATTERN.sub(" ", unicodedata.normalize("NFKC", str(name or "")))
+    inner = [part.strip() for part in PAREN_PATTERN.findall(text)]
+    main = PAREN_PATTERN.sub(" ", text)
+    return " ".join(main.split()), [part for part in inner if part]
+
+
+def normalize_company_name(name):
+    """
+    캐시 키용 정규화 이름 (별칭 적용 전). 법인 표기만 남는 경우에도 빈 문자열이 되지 않도록 원문을 사용합니다.
+    """
+    text = unicodedata.normalize("NFKC", str(name or "")).casefold()
+    stripped = PAREN_PATTERN.sub(" ", LEGAL_SUFFIX_PATTERN.sub(" ", text))
+    key = "".join(stripped.split()).strip(TRAILING_PUNCTUATION)
+    return key or "".join(text.split())
+
+
+def _load():
+    global _aliases
+    if _aliases is None:
+        with _lock:
+            if _aliases is None:
+                aliases = {}
+                for canonical, names in SEED_ALIASES.items():
+                    for alias in names:
+                        aliases[normalize_company_name(alias)] = normalize_company_name(canonical)
+                for alias, value, _ in get_cache().items(ALIAS_NAMESPACE):
+                    aliases.setdefault(alias, value["canonical"])
+                _aliases = aliases
+    return _aliases
+
+
+def resolve_alias(normalized):
+    """
+    정규화된 이름의 대표 키 (별칭이 없으면 그대로)
+    """
+    return _load().get(normalized, normalized)
+
+
+def lookup_key(name):
+    """
+    company_key와 같은 키를 별칭 인덱스를 바꾸지 않고 계산합니다. (측정 / 조회 전용)
+    """
+    main, _ = split_aliases(name)
+    return resolve_alias(normalize_company_name(main or name))
+
+
+def company_key(name):
+    """
+    모든 회사 단위 캐시가 쓰는 키. 입력에 괄호 별칭이 있으면 별칭 인덱스에 함께 등록합니다.
+    """
+    key = lookup_key(name)
+    _, inner = split_aliases(name)
+    for alias in inner:
+        learn_alias(alias, key, source="input", canonical_is_key=True)
+    return key
+
+
+def _acceptable_alias(normalized):
+    if len(normalized) < 2 or len(normalized) > 30 or normalized in GENERIC_NAMES:
+        return False
+    # "2015년 설립", "매출 1조" 같은 괄호 설명은 별칭이 아님
+    return not re.search(r"\d+(?:년|월|명|원|억|조|%)", normalized)
+
+
+def learn_alias(alias, canonical, source="llm", canonical_is_key=False):
+    """
+    alias를 canonical 회사의 별칭으로 등록하고, 새로 등록했으면 True를 반환합니다.
+    이미 등록된 별칭은 (다른 회사로 연결돼 있어도) 덮어쓰지 않습니다.
+    자동으로 배우는 별칭(source가 llm / input)은 한쪽이 다른 쪽의 앞부분인 이름("카카오" / "카카오뱅크",
+    "삼성" / "삼성전자")을 계열사나 그룹으로 보고 연결하지 않습니다.
+    """
+    aliases = _load()
+    alias_key = normalize_company_name(alias)
+    target = canonical if canonical_is_key else company_key(canonical)
+    if alias_key == target or not _acceptable_alias(alias_key):
+        return False
+    if source in ("llm", "input") and (alias_key.startswith(target) or target.startswith(alias_key)):
+        return False
+    with _lock:
+        existing = aliases.get(alias_key)
+        if existing is not None:
+            return False
+        if aliases.get(target) == alias_key:
+            # 반대 방향으로 이미 연결된 경우 (순환 방지)
+            return False
+        aliases[alias_key] = target
+    get_cache().set(ALIAS_NAMESPACE, alias_key, {"canonical": target, "alias": alias, "source": source})
+    print(f"🔗 회사 별칭 등록: {alias} -> {target} ({source})")
+    return True
+
+
+def learn_aliases_from_text(company_name, text):
+    """
+    LLM 응답 속 "토스(비바리퍼블리카)", "정식 명칭: 주식회사 비바리퍼블리카" 같은 표기에서 별칭을 배웁니다.
+    ("카카오뱅크(카카오)"처럼 회사명이 괄호 안에 있는 표기는 계열사 표기인 경우가 많아 쓰지 않습니다.)
+    배운 별칭 수를 반환합니다.
+    """
+    if not company_name or not text:
+        return 0
+    main, _ = split_aliases(company_name)
+    name = re.escape(main or company_name)
+    candidates = []
+    candidates += re.findall(rf"{name}\s*[(\[]([^()\[\]\n]{{2,40}})[)\]]", text)
+    candidates += re.findall(r"(?:정식\s*(?:명칭|법인명|회사명)|법인명|영문\s*(?:명칭|사명|명))\s*[:：]\s*\**([^\n,;*()]{2,40})", text)
+    key = company_key(company_name)
+    learned = 0
+    for candidate in candidates:
+        for part in re.split(r"[,/]|\s+및\s+", candidate):
+            if learn_alias(part.strip(), key, source="llm", canonical_is_key=True):
+                learned += 1
+    return learned
+
+
+# --- 캐시 적중률 측정 ---
+
+def _legacy_key(name):
+    """
+    이 모듈 도입 전의 회사 키 (NFC + 공백 정리)
+    """
+    return " ".join(unicodedata.normalize("NFC", str(name or "")).split())
+
+
+def measure_hit_rate(records):
+    """
+    (task, company_name) 기록을 시간순으로 재생하며, 같은 작업에서 이미 본 키면 캐시 적중으로 셉니다.
+    기존 키와 company_key의 적중률을 비교합니다. 운영 중인 별칭 인덱스를 바꾸지 않도록 lookup_key로 계산합니다.
+    """
+    seen = {"legacy": defaultdict(set), "normalized": defaultdict(set)}
+    hits = {"legacy": 0, "normalized": 0}
+    merged = defaultdict(set)
+    total = 0
+    for task, company_name in records:
+        if not company_name:
+            continue
+        total += 1
+        keys = {"legacy": _legacy_key(company_name), "normalized": lookup_key(company_name)}
+        for scheme, key in keys.items():
+            if key in seen[scheme][task]:
+                hits[scheme] += 1
+            seen[scheme][task].add(key)
+        merged[keys["normalized"]].add(keys["legacy"])
+    return {
+        "requests": total,
+        "legacy_hits": hits["legacy"],
+        "normalized_hits": hits["normalized"],
+        "legacy_hit_rate": hits["legacy"] / total if total else 0.0,
+        "normalized_hit_rate": hits["normalized"] / total if total else 0.0,
+        "merged_variants": {key: sorted(names) for key, names in merged.items() if len(names) > 1},
+    }
+
+
+def load_log_records(path):
+    """
+    search_policy 로그(.jsonl)에서 (task, company_name)을 읽습니다. 여러 회사를 묶은 배치 호출은 회사별로 펼칩니다.
+    """
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            names = record.get("company_name")
+            for name in names if isinstance(names, list) else [names]:
+                records.append((record.get("task"), name))
+    return records
+
+
+def main():
+    from search_policy import LOG_PATH
+    parser = argparse.ArgumentParser(description="회사명 정규화 / 별칭 인덱스")
+    parser.add_argument("--measure", action="store_true", help="트래픽 로그로 캐시 적중률 비교")
+    parser.add_argument("--log", default=LOG_PATH, help="search_policy 로그 경로")
+    parser.add_argument("--alias", nargs=2, metavar=("ALIAS", "CANONICAL"), help="별칭 직접 추가")
+    args = parser.parse_args()
+
+    if args.alias:
+        learn_alias(args.alias[0], args.alias[1], source="manual")
+    if args.measure:
+        if not os.path.exists(args.log):
+            print(f"❌ 로그 파일이 없습니다: {args.log}")
+            return
+        report = measure_hit_rate(load_log_records(args.log))
+        print(f"📊 요청 {report['requests']}건")
+        print(f"  기존 키        적중 {report['legacy_hits']}건 ({report['legacy_hit_rate']:.1%})")
+        print(f"  company_key    적중 {report['normalized_hits']}건 ({report['normalized_hit_rate']:.1%})")
+        print(f"🔗 하나로 합쳐진 표기 {len(report['merged_variants'])}개")
+        for key, names in sorted(report["merged_variants"].items()):
+            print(f"  {key}: {', '.join(names)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,24 @@
 """
 HTML to PDF 변환 스크립트
 htmls 디렉토리의 모든 HTML 파일을 PDF로 변환합니다.
+
+- 프로세스 풀로 병렬 변환하며, 워커마다 CSS와 FontConfiguration을 한 번만 만들어 재사용합니다.
+- PDF가 원본 HTML보다 최신이면 건너뜁니다. (--force로 전체 재변환)
+- --merge로 모든 케이스 리포트를 PDF 하나로 합칠 수 있습니다.
+
+사용법:
+    python convert_html_to_pdf.py                      # CPU 수만큼 병렬 변환
+    python convert_html_to_pdf.py --workers 1          # 순차 변환
+    python convert_html_to_pdf.py --merge              # 변환 후 htmls/all_cases.pdf 생성
 """
 
 import os
 import sys
+import time
+import argparse
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     from weasyprint import HTML, CSS
@@ -17,6 +29,116 @@ except ImportError:
     print("pip install weasyprint")
     sys.exit(1)
 
+# CSS 스타일 설정 (한글 폰트 및 페이지 설정)
+PDF_CSS = """
+@page {
+    size: A4;
+    margin: 1cm;
+}
+
+body {
+    font-family: "Arial", "Helvetica", sans-serif;
+    font-size: 12px;
+    line-height: 1.4;
+    color: #333;
+}
+
+h1, h2, h3, h4, h5, h6 {
+    color: #2c3e50;
+    margin-top: 20px;
+    margin-bottom: 10px;
+}
+
+h1 { font-size: 24px; }
+h2 { font-size: 20px; }
+h3 { font-size: 16px; }
+h4 { font-size: 14px; }
+
+.progress {
+    background-color: #f8f9fa;
+    border-radius: 4px;
+    padding: 2px;
+    margin: 5px 0;
+}
+
+.progress-bar {
+    background-color: #007bff;
+    color: white;
+    text-align: center;
+    border-radius: 4px;
+    padding: 4px;
+}
+
+.step {
+    margin-bottom: 20px;
+    padding: 15px;
+    border-left: 4px solid #007bff;
+    background-color: #f8f9fa;
+}
+
+.error {
+    color: #dc3545;
+    background-color: #f8d7da;
+    padding: 10px;
+    border-radius: 4px;
+    margin: 10px 0;
+}
+
+.success {
+    color: #155724;
+    background-color: #d4edda;
+    padding: 10px;
+    border-radius: 4px;
+    margin: 10px 0;
+}
+
+pre {
+    background-color: #f4f4f4;
+    padding: 10px;
+    border-radius: 4px;
+    overflow-wrap: break-word;
+    word-wrap: break-word;
+    white-space: pre-wrap;
+}
+
+table {
+    border-collapse: collapse;
+    width: 100%;
+    margin: 10px 0;
+}
+
+th, td {
+    border: 1px solid #ddd;
+    padding: 8px;
+    text-align: left;
+}
+
+th {
+    background-color: #f2f2f2;
+    font-weight: bold;
+}
+"""
+
+DEFAULT_MERGED_NAME = "all_cases.pdf"
+
+# 워커 프로세스별로 한 번만 생성하는 리소스
+_font_config = None
+_stylesheet = None
+
+
+def _init_worker():
+    """워커 초기화: FontConfiguration과 CSS를 한 번만 만들어 이후 변환에서 재사용합니다."""
+    global _font_config, _stylesheet
+    _font_config = FontConfiguration()
+    _stylesheet = CSS(string=PDF_CSS, font_config=_font_config)
+
+
+def _resources():
+    if _stylesheet is None:
+        _init_worker()
+    return _stylesheet, _font_config
+
+
 def convert_html_to_pdf(html_file_path, pdf_file_path):
     """
     HTML 파일을 PDF로 변환합니다.
@@ -31,103 +153,10 @@ def convert_html_to_pdf(html_file_path, pdf_file_path):
     try:
         print(f"  🔄 Converting: {os.path.basename(html_file_path)}")
         
+        stylesheet, font_config = _resources()
         # HTML 파일 읽기 및 PDF 변환
         html_doc = HTML(filename=html_file_path)
-        
-        # CSS 스타일 설정 (한글 폰트 및 페이지 설정)
-        css_content = """
-        @page {
-            size: A4;
-            margin: 1cm;
-        }
-        
-        body {
-            font-family: "Arial", "Helvetica", sans-serif;
-            font-size: 12px;
-            line-height: 1.4;
-            color: #333;
-        }
-        
-        h1, h2, h3, h4, h5, h6 {
-            color: #2c3e50;
-            margin-top: 20px;
-            margin-bottom: 10px;
-        }
-        
-        h1 { font-size: 24px; }
-        h2 { font-size: 20px; }
-        h3 { font-size: 16px; }
-        h4 { font-size: 14px; }
-        
-        .progress {
-            background-color: #f8f9fa;
-            border-radius: 4px;
-            padding: 2px;
-            margin: 5px 0;
-        }
-        
-        .progress-bar {
-            background-color: #007bff;
-            color: white;
-            text-align: center;
-            border-radius: 4px;
-            padding: 4px;
-        }
-        
-        .step {
-            margin-bottom: 20px;
-            padding: 15px;
-            border-left: 4px solid #007bff;
-            background-color: #f8f9fa;
-        }
-        
-        .error {
-            color: #dc3545;
-            background-color: #f8d7da;
-            padding: 10px;
-            border-radius: 4px;
-            margin: 10px 0;
-        }
-        
-        .success {
-            color: #155724;
-            background-color: #d4edda;
-            padding: 10px;
-            border-radius: 4px;
-            margin: 10px 0;
-        }
-        
-        pre {
-            background-color: #f4f4f4;
-            padding: 10px;
-            border-radius: 4px;
-            overflow-wrap: break-word;
-            word-wrap: break-word;
-            white-space: pre-wrap;
-        }
-        
-        table {
-            border-collapse: collapse;
-            width: 100%;
-            margin: 10px 0;
-        }
-        
-        th, td {
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }
-        
-        th {
-            background-color: #f2f2f2;
-            font-weight: bold;
-        }
-        """
-        
-        css = CSS(string=css_content)
-        
-        # PDF 변환 및 저장
-        html_doc.write_pdf(pdf_file_path, stylesheets=[css])
+        html_doc.write_pdf(pdf_file_path, stylesheets=[stylesheet], font_config=font_config)
         
         print(f"  ✅ Success: {os.path.basename(pdf_file_path)}")
         return True
@@ -136,8 +165,62 @@ def convert_html_to_pdf(html_file_path, pdf_file_path):
         print(f"  ❌ Error converting {os.path.basename(html_file_path)}: {str(e)}")
         return False
 
+
+def _convert_task(paths):
+    """워커에서 실행: (html 파일명, 성공 여부, 소요 시간)"""
+    html_file, pdf_file = paths
+    start = time.perf_counter()
+    success = convert_html_to_pdf(html_file, pdf_file)
+    return os.path.basename(html_file), success, time.perf_counter() - start
+
+
+def is_up_to_date(target, sources):
+    """target이 존재하고 모든 sources보다 최신이면 True"""
+    if not target.exists():
+        return False
+    target_mtime = target.stat().st_mtime
+    return all(target_mtime > source.stat().st_mtime for source in sources)
+
+
+def merge_pdfs(pdf_files, output_path):
+    """
+    여러 PDF를 하나로 합칩니다. pypdf가 있으면 변환된 PDF를 그대로 이어 붙이고,
+    없으면 weasyprint로 원본 HTML을 다시 렌더링해 페이지를 합칩니다.
+    """
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        PdfWriter = None
+    
+    if PdfWriter is not None:
+        writer = PdfWriter()
+        for pdf_file in pdf_files:
+            writer.append(str(pdf_file))
+        with open(output_path, "wb") as f:
+            writer.write(f)
+        return
+    
+    stylesheet, font_config = _resources()
+    documents = [
+        HTML(filename=str(pdf_file.with_suffix('.html'))).render(stylesheets=[stylesheet], font_config=font_config)
+        for pdf_file in pdf_files
+    ]
+    pages = [page for document in documents for page in document.pages]
+    documents[0].copy(pages).write_pdf(output_path)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="htmls/*.html을 PDF로 변환")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="병렬 변환 프로세스 수 (1이면 순차 변환)")
+    parser.add_argument("--force", action="store_true", help="최신 PDF가 있어도 다시 변환")
+    parser.add_argument("--merge", nargs="?", const=DEFAULT_MERGED_NAME, metavar="PDF",
+                        help=f"모든 케이스 리포트를 PDF 하나로 합치기 (기본: htmls/{DEFAULT_MERGED_NAME})")
+    return parser.parse_args()
+
+
 def main():
     """메인 함수"""
+    args = parse_args()
     print("🚀 HTML to PDF 변환 시작")
     print("=" * 50)
     
@@ -147,8 +230,8 @@ def main():
         print("❌ 'htmls' 디렉토리를 찾을 수 없습니다.")
         return
     
-    # HTML 파일 찾기
-    html_files = list(htmls_dir.glob("*.html"))
+    # HTML 파일 찾기 (manifest 기반 index.html은 변환 대상이 아님)
+    html_files = sorted(f for f in htmls_dir.glob("*.html") if f.name != "index.html")
     if not html_files:
         print("❌ 'htmls' 디렉토리에 HTML 파일이 없습니다.")
         return
@@ -156,45 +239,66 @@ def main():
     print(f"📁 발견된 HTML 파일: {len(html_files)}개")
     print("-" * 50)
     
-    # 변환 통계
-    success_count = 0
-    failed_count = 0
-    
-    # 각 HTML 파일을 PDF로 변환
-    for html_file in sorted(html_files):
-        # PDF 파일명 생성 (HTML 확장자를 PDF로 변경)
+    # 이미 최신 PDF가 있는 파일은 건너뜀
+    tasks = []
+    skipped_count = 0
+    for html_file in html_files:
         pdf_file = html_file.with_suffix('.pdf')
-        
-        # 이미 PDF가 존재하는지 확인
-        if pdf_file.exists():
-            # 파일 수정 시간 비교
-            html_mtime = html_file.stat().st_mtime
-            pdf_mtime = pdf_file.stat().st_mtime
-            
-            if pdf_mtime > html_mtime:
-                print(f"  ⏭️  Skip: {pdf_file.name} (이미 최신 버전 존재)")
-                success_count += 1
-                continue
-        
-        # 변환 실행
-        if convert_html_to_pdf(str(html_file), str(pdf_file)):
-            success_count += 1
-        else:
-            failed_count += 1
+        if not args.force and is_up_to_date(pdf_file, [html_file]):
+            print(f"  ⏭️  Skip: {pdf_file.name} (이미 최신 버전 존재)")
+            skipped_count += 1
+            continue
+        tasks.append((str(html_file), str(pdf_file)))
+    
+    # 변환 실행
+    start_time = time.perf_counter()
+    workers = max(1, min(args.workers, len(tasks)))
+    if workers > 1:
+        print(f"⚙️  {workers}개 프로세스로 {len(tasks)}개 파일 변환")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            results = list(executor.map(_convert_task, tasks))
+    else:
+        results = [_convert_task(task) for task in tasks]
+    total_time = time.perf_counter() - start_time
+    
+    success_count = skipped_count + sum(1 for _, success, _ in results if success)
+    failed_count = sum(1 for _, success, _ in results if not success)
+    
+    # 파일별 소요 시간
+    if results:
+        print("-" * 50)
+        print("⏱️  파일별 변환 시간")
+        for name, success, elapsed in sorted(results, key=lambda result: -result[2]):
+            print(f"  {'✅' if success else '❌'} {elapsed:6.2f}s  {name}")
     
     # 결과 출력
     print("-" * 50)
     print("📊 변환 완료!")
-    print(f"  ✅ 성공: {success_count}개")
+    print(f"  ✅ 성공: {success_count}개 (건너뜀 {skipped_count}개)")
     print(f"  ❌ 실패: {failed_count}개")
     print(f"  📁 총 파일: {len(html_files)}개")
+    if results:
+        print(f"  ⏱️  총 {total_time:.2f}초 (파일당 평균 {sum(r[2] for r in results) / len(results):.2f}초, 워커 {workers}개)")
     
     if failed_count == 0:
         print("🎉 모든 파일이 성공적으로 변환되었습니다!")
     else:
         print(f"⚠️  {failed_count}개 파일에서 오류가 발생했습니다.")
     
+    # 케이스 리포트 병합
+    if args.merge:
+        case_pdfs = [f.with_suffix('.pdf') for f in html_files if f.name.startswith("case_") and f.with_suffix('.pdf').exists()]
+        merged_path = htmls_dir / args.merge
+        if not case_pdfs:
+            print("⚠️  병합할 케이스 PDF가 없습니다.")
+        elif not args.force and is_up_to_date(merged_path, case_pdfs):
+            print(f"  ⏭️  Skip: {merged_path.name} (이미 최신 버전 존재)")
+        else:
+            merge_start = time.perf_counter()
+            merge_pdfs(case_pdfs, merged_path)
+            print(f"📚 {len(case_pdfs)}개 케이스 병합 완료 -> {merged_path} ({time.perf_counter() - merge_start:.2f}초)")
+    
     print(f"📂 결과 파일 위치: {htmls_dir.absolute()}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,186 @@
+"""
+기업 종합 분석 (company dossier)
+
+산업 분류 / 기업 규모 / 컨텍스트 리포트 / 직무기술서를 한 번에 만듭니다.
+1. 회사/직무에 대한 웹 조사를 한 번만 수행하고(response_cache에 보관해 재사용)
+2. 네 가지 분석을 그 조사 자료로 동시에 실행해, 끝나는 순서대로 섹션을 채웁니다.
+전체 소요 시간은 네 호출의 합이 아니라 조사 + 가장 느린 분석 하나가 됩니다.
+
+사용법:
+    python dossier.py --company 토스 --job "백엔드 개발" --experience 신입
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from feature_modules import load_feature_module
+from llm_gateway import create_client
+from response_cache import get_cache, make_cache_key
+from company_names import company_key, learn_aliases_from_text
+from search_policy import choose_search_context_size, record_search_call
+
+RESEARCH_NAMESPACE = "company_research"
+# 공유 조사 자료를 재사용하는 기간
+RESEARCH_MAX_AGE_SECONDS = float(os.getenv("DOSSIER_RESEARCH_MAX_AGE_DAYS", "7")) * 24 * 3600
+
+RESEARCH_PROMPT = """당신은 채용 지원자를 돕는 기업 리서처입니다. 웹 검색으로 '{company_name}'의 최신 정보를 조사해
+'{job_title}' 직무 지원에 필요한 자료를 아래 항목별로 한국어 글머리표로 정리하세요. 확인되지 않은 내용은 추측하지 말고 '확인 불가'로 적으세요.
+
+1. 회사 개요: 정식 법인명, 영문 사명, 설립 연도, 본사, 모회사/계열(그룹), 상장 여부, 외국계/공공기관 여부
+2. 규모 지표: 최근 매출, 임직원 수, 기업 규모 구분(대기업/중견/중소/스타트업 등) 근거
+3. 주요 사업과 제품/서비스, 속한 산업 분야
+4. 인재상, 핵심 가치, 조직 문화
+5. 최근 1~2년 주요 동향(신사업, 투자, 실적, 이슈)
+6. '{job_title}' 직무의 주요 업무, 요구 역량, 우대 사항 (채용 공고가 있으면 인용)"""
+
+# 섹션 키 -> (제목, 기능 키, 실행 함수)
+SECTIONS = {
+    "industry": ("🏷️ 산업 분류", "industry",
+                 lambda module, job, company, experience, research: module.classify_industry(job, company, research=research)[0]),
+    "company_size": ("🏢 기업 규모", "company_size",
+                     lambda module, job, company, experience, research: module.analyze_company_size(company, research=research)[0]),
+    "context_report": ("📊 컨텍스트 리포트", "jasoseo",
+                       lambda module, job, company, experience, research: module.generate_context_report(job, company, experience, research=research)[0]),
+    "jd": ("📋 직무기술서", "jd_rec",
+           lambda module, job, company, experience, research: module.generate_jd_recommendation(job, company, experience, research=research)[0]),
+}
+
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+def _citations(response):
+    citations = []
+    for output in getattr(response, "output", None) or []:
+        for content in getattr(output, "content", None) or []:
+            for annotation in getattr(content, "annotations", None) or []:
+                url = getattr(annotation, "url", None)
+                if url:
+                    citations.append({"title": getattr(annotation, "title", None) or url, "url": url})
+    return citations
+
+
+def research_company(company_name, job_title, force_refresh=False):
+    """
+    네 분석이 함께 쓸 웹 조사 자료 {"notes", "citations", "cached"}를 반환합니다.
+    """
+    cache = get_cache()
+    key = make_cache_key(company_key(company_name), job_title)
+    if not force_refresh:
+        cached = cache.get(RESEARCH_NAMESPACE, key, max_age=RESEARCH_MAX_AGE_SECONDS)
+        if cached:
+            return dict(cached, cached=True)
+
+    search_context_size, size_reason = choose_search_context_size("dossier", company_name)
+    start_time = time.time()
+    try:
+        response = _get_client().responses.create(
+            model="gpt-4o",
+            tools=[{"type": "web_search_preview", "search_context_size": search_context_size}],
+            input=RESEARCH_PROMPT.format(company_name=company_name, job_title=job_title),
+        )
+    except Exception:
+        # 실패한 호출도 기록 (성공률 집계)
+        record_search_call("dossier", company_name, search_context_size, size_reason,
+                           time.time() - start_time, None, "gpt-4o", success=False)
+        raise
+    latency = time.time() - start_time
+    research = {"notes": response.output_text, "citations": _citations(response)}
+    record_search_call("dossier", company_name, search_context_size, size_reason,
+                       latency, response, "gpt-4o", success=bool((research["notes"] or "").strip()))
+    learn_aliases_from_text(company_name, research["notes"])
+    cache.set(RESEARCH_NAMESPACE, key, research)
+    return dict(research, cached=False)
+
+
+def format_dossier(company_name, job_title, research_status, sections, timings):
+    """
+    현재까지 끝난 섹션을 하나의 마크다운 문서로 합칩니다. (끝나지 않은 섹션은 진행 중 표시)
+    """
+    lines = [f"# 🗂️ {company_name} - {job_title} 기업 종합 분석", "", research_status, ""]
+    for key, (title, _, _) in SECTIONS.items():
+        elapsed = timings.get(key)
+        suffix = f" ({elapsed:.1f}초)" if elapsed is not None else ""
+        lines.append(f"## {title}{suffix}")
+        lines.append(sections.get(key, "⏳ 분석 중..."))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def generate_dossier(job_title, company_name, experience_level="신입", force_refresh=False):
+    """
+    조사 -> 네 분석 동시 실행. 섹션이 끝날 때마다 전체 마크다운을 yield합니다.
+    """
+    if not job_title or not company_name:
+        yield "직무와 회사명을 모두 입력해주세요."
+        return
+
+    start = time.time()
+    sections, timings = {}, {}
+    yield format_dossier(company_name, job_title, "🔎 웹 조사 중...", sections, timings)
+    try:
+        research = research_company(company_name, job_title, force_refresh=force_refresh)
+    except Exception as e:
+        yield f"❌ 회사 조사 중 오류가 발생했습니다: {e}"
+        return
+    source = "저장된 조사 자료 재사용" if research["cached"] else f"웹 조사 완료 ({time.time() - start:.1f}초)"
+    research_status = f"**🔎 {source}** · 참고 자료 {len(research['citations'])}건"
+    yield format_dossier(company_name, job_title, research_status, sections, timings)
+
+    def run(key):
+        _, feature, runner = SECTIONS[key]
+        module = load_feature_module(feature)
+        if module is None:
+            return "❌ 기능 모듈을 불러오지 못했습니다."
+        section_start = time.time()
+        try:
+            return runner(module, job_title, company_name, experience_level, research["notes"])
+        finally:
+            timings[key] = time.time() - section_start
+
+    with ThreadPoolExecutor(max_workers=len(SECTIONS)) as executor:
+        futures = {executor.submit(run, key): key for key in SECTIONS}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                sections[key] = future.result()
+            except Exception as e:
+                sections[key] = f"❌ 오류가 발생했습니다: {e}"
+            yield format_dossier(company_name, job_title, research_status, sections, timings)
+
+    references = "\n".join(f"{i}. [{c['title']}]({c['url']})" for i, c in enumerate(research["citations"], 1))
+    footer = f"\n---\n⏱️ 총 {time.time() - start:.1f}초 (섹션 중 가장 긴 {max(timings.values(), default=0):.1f}초)"
+    if references:
+        footer = f"\n### 📚 조사 참고 자료\n{references}\n{footer}"
+    yield format_dossier(company_name, job_title, research_status, sections, timings) + footer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기업 종합 분석")
+    parser.add_argument("--company", required=True)
+    parser.add_argument("--job", required=True)
+    parser.add_argument("--experience", default="신입")
+    parser.add_argument("--refresh", action="store_true", help="저장된 조사 자료를 무시하고 다시 조사")
+    args = parser.parse_args()
+
+    result = ""
+    for result in generate_dossier(args.job, args.company, args.experience, force_refresh=args.refresh):
+        pass
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+모든 모듈의 eval.json 통합 평가
+
+각 기능 디렉토리의 eval.json을 찾아 예제를 동시에 실행하고(공유 게이트웨이/캐시 경유),
+작업별 품질(카테고리/태그는 정확 일치, 질문 목록/텍스트는 토큰 겹침)과
+지연 시간 p50/p95, 비용을 한 표로 보여줍니다.
+결과는 eval_results/에 JSON으로 저장되며, --baseline과 비교해 품질이 떨어지면 실패(exit 1)합니다.
+로컬 산업 분류기와 기업 규모 인덱스는 같은 eval.json으로 학습/시드되므로(라벨 누출) 기본값은 둘 다 건너뛰고
+LLM 경로를 채점합니다. 캐시 경로까지 포함한 값은 --use-cache로 따로 확인합니다.
+평가 중의 캐시/인덱스/로그 쓰기는 운영 캐시를 복사한 임시 디렉터리에만 남습니다. (state_sandbox)
+
+사용법:
+    python eval_runner.py                                   # 전체 실행
+    python eval_runner.py --tasks industry company_size --limit 5
+    python eval_runner.py --use-cache                       # 로컬 분류기/인덱스/캐시 경로 포함 (라벨 누출 주의)
+    python eval_runner.py --baseline eval_results/eval_20250701_120000.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# 평가 호출이 쓰는 응답 캐시 / 로컬 분류기 / 기업 규모 인덱스 / 별칭 / 조사 이력 / 검색 로그가 운영 상태와
+# 이후 실행(특히 --use-cache)에 섞이지 않도록, 모듈을 불러오기 전에 운영 캐시의 복사본으로 격리합니다.
+from state_sandbox import isolate_state
+STATE_DIR = isolate_state("eval_state_", copy_cache=True)
+
+from feature_modules import FEATURE_MODULES, feature_dir, load_feature_module
+from llm_gateway import track_usage
+from search_policy import token_overlap
+
+RESULTS_DIR = os.path.join(project_root, "eval_results")
+
+
+# --- 채점 ---
+
+def exact_match(expected, predicted):
+    if isinstance(expected, list):
+        return 1.0 if set(expected) == set(predicted or []) else 0.0
+    return 1.0 if expected == predicted else 0.0
+
+
+def jaccard(expected, predicted):
+    expected, predicted = set(expected), set(predicted or [])
+    union = expected | predicted
+    return len(expected & predicted) / len(union) if union else 1.0
+
+
+def question_list_overlap(expected, predicted):
+    """
+    기대 질문마다 가장 비슷한 예측 질문과의 토큰 겹침을 구해 평균합니다.
+    """
+    if not expected:
+        return 0.0
+    predicted = predicted or []
+    return sum(max((token_overlap(question, p) for p in predicted), default=0.0) for question in expected) / len(expected)
+
+
+# --- 작업별 실행 함수: (module, example, use_cache) -> (score, partial_score, prediction) ---
+
+def _run_industry(module, example, use_cache):
+    _, tags = module.classify_industry(
+        example["input"]["job_title"], example["input"]["company_name"], use_local=use_cache
+    )
+    return exact_match(example["output"], tags), jaccard(example["output"], tags), tags
+
+
+def _run_company_size(module, example, use_cache):
+    _, category = module.analyze_company_size(example["input"], force_refresh=not use_cache)
+    score = exact_match(example["output"], category)
+    return score, score, category
+
+
+def _run_commonly_asked(module, example, use_cache):
+    inputs = example["input"]
+    expected = example["output"]["sample_questions"]
+    results = module.generate_interview_questions(
+        inputs["company_name"], inputs["job_title"], inputs["experience_level"],
+        inputs["common_questions"], len(expected)
+    )
+    overlap = question_list_overlap(expected, results[1])
+    return overlap, overlap, results[1]
+
+
+def _run_question_rec(module, example, use_cache):
+    import yaml
+    from llm_gateway import create_client
+    with open(feature_dir("question_rec") / "prompt.yaml", "r", encoding="utf-8") as f:
+        prompts = yaml.safe_load(f)
+    inputs = example["input"]
+    text, _ = module.generate_question_recommendation(
+        create_client(), prompts, inputs["job_title"], inputs["company_name"], inputs["experience_level"]
+    )
+    predicted = (module.parse_question_recommendation(text) or {}).get("recommended_question", "")
+    overlap = token_overlap(example["output"]["recommended_question"], predicted)
+    return overlap, overlap, predicted
+
+
+def _run_jd_rec(module, example, use_cache):
+    inputs = example["input"]
+    _, jd_content, _ = module.generate_jd_recommendation(
+        inputs["job_title"], inputs["company_name"], inputs["experience_level"]
+    )
+    overlap = token_overlap(example["output"]["recommended_jd"], jd_content)
+    return overlap, overlap, jd_content
+
+
+def _run_context_report(module, example, use_cache):
+    inputs = example["input"]
+    results = module.generate_context_report(inputs["job_title"], inputs["company_name"], inputs["experience_level"],
+                                             force_refresh=not use_cache)
+    report = results[1] if len(results) > 1 and isinstance(results[1], dict) else {}
+    expected = example["output"]
+    predicted = (report.get("company_profile", {}).get("core_values", []) +
+                 report.get("position_analysis", {}).get("keywords", []))
+    overlap = token_overlap(
+        expected["company_profile"]["core_values"] + expected["position_analysis"]["keywords"], predicted
+    )
+    return overlap, overlap, predicted
+
+
+# 기능 키 -> (작업 이름, eval.json 최상위 키, 실행 함수, 채점 방식)
+EVAL_TASKS = {
+    "industry": ("industry", "industry_classification_eval", _run_industry, "exact (tags)"),
+    "company_size": ("company_size", None, _run_company_size, "exact (category)"),
+    "commonly_asked": ("commonly_asked", "sample_question_generation_eval", _run_commonly_asked, "question overlap"),
+    "question_rec": ("question_rec", "recommended_question_generation_eval", _run_question_rec, "token overlap"),
+    "jd_rec": ("jd_rec", "jd_recommendation_eval", _run_jd_rec, "token overlap"),
+    "jasoseo": ("context_report", "context_report_generation_eval", _run_context_report, "token overlap"),
+}
+
+
+def discover_evals():
+    """
+    eval.json이 있는 기능 키 목록. 실행 함수가 없는 eval.json은 경고만 출력합니다.
+    """
+    features_by_dir = {directory: feature for feature, (directory, _) in FEATURE_MODULES.items()}
+    found = []
+    for directory in sorted(os.listdir(project_root)):
+        if not os.path.isfile(os.path.join(project_root, directory, "eval.json")):
+            continue
+        feature = features_by_dir.get(directory)
+        if feature in EVAL_TASKS:
+            found.append(feature)
+        else:
+            print(f"⚠️ {directory}/eval.json: 평가 실행 함수가 없어 건너뜁니다.")
+    return found
+
+
+def load_examples(feature):
+    _, root_key, _, _ = EVAL_TASKS[feature]
+    with open(feature_dir(feature) / "eval.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data[root_key]["examples"] if root_key else data["examples"]
+
+
+def percentile(values, q):
+    """
+    nearest-rank 백분위수 (q: 0~100)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _run_example(runner, module, example, use_cache):
+    with track_usage() as usage:
+        start = time.perf_counter()
+        try:
+            score, partial, prediction = runner(module, example, use_cache)
+            error = None
+        except Exception as e:
+            score, partial, prediction, error = 0.0, 0.0, None, str(e)
+        latency = time.perf_counter() - start
+    return {
+        "input": example["input"],
+        "expected": example["output"],
+        "prediction": prediction,
+        "score": score,
+        "partial": partial,
+        "latency": latency,
+        "cost": usage["cost"],
+        "llm_calls": usage["calls"],
+        "error": error,
+    }
+
+
+def run_task(feature, limit=None, workers=4, use_cache=False):
+    task_name, _, runner, scoring = EVAL_TASKS[feature]
+    module = load_feature_module(feature)
+    if module is None:
+        print(f"❌ {task_name}: 모듈 로드 실패, 건너뜀")
+        return None
+    examples = load_examples(feature)[:limit]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda example: _run_example(runner, module, example, use_cache), examples))
+
+    latencies = [r["latency"] for r in results]
+    count = len(results) or 1
+    return {
+        "task": task_name,
+        "scoring": scoring,
+        "examples": len(results),
+        "accuracy": sum(r["score"] for r in results) / count,
+        "partial": sum(r["partial"] for r in results) / count,
+        "p50_latency": percentile(latencies, 50),
+        "p95_latency": percentile(latencies, 95),
+        "total_cost": sum(r["cost"] for r in results),
+        "avg_cost": sum(r["cost"] for r in results) / count,
+        "llm_calls": sum(r["llm_calls"] for r in results),
+        "errors": sum(1 for r in results if r["error"]),
+        "results": results,
+    }
+
+
+def print_summary(summaries):
+    print("-" * 110)
+    print(f"{'task':<16}{'scoring':<18}{'n':>4}{'accuracy':>10}{'partial':>9}{'p50(s)':>9}{'p95(s)':>9}"
+          f"{'cost($)':>10}{'$/ex':>9}{'calls':>7}{'err':>5}")
+    for s in summaries:
+        print(f"{s['task']:<16}{s['scoring']:<18}{s['examples']:>4}{s['accuracy']:>10.3f}{s['partial']:>9.3f}"
+              f"{s['p50_latency']:>9.2f}{s['p95_latency']:>9.2f}{s['total_cost']:>10.4f}{s['avg_cost']:>9.4f}"
+              f"{s['llm_calls']:>7}{s['errors']:>5}")
+    print("-" * 110)
+
+
+def compare_with_baseline(summaries, baseline_path, tolerance):
+    """
+    기준 결과보다 정확도가 tolerance 이상 떨어진 작업 목록을 반환합니다.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {s["task"]: s for s in json.load(f)["summaries"]}
+    regressions = []
+    for s in summaries:
+        base = baseline.get(s["task"])
+        if base is None:
+            continue
+        delta = s["accuracy"] - base["accuracy"]
+        print(f"  {s['task']:<16} 정확도 {base['accuracy']:.3f} -> {s['accuracy']:.3f} ({delta:+.3f}) | "
+              f"p95 {base['p95_latency']:.2f}s -> {s['p95_latency']:.2f}s | "
+              f"$/ex {base['avg_cost']:.4f} -> {s['avg_cost']:.4f}")
+        if delta < -tolerance:
+            regressions.append(s["task"])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모든 모듈의 eval.json 통합 평가")
+    parser.add_argument("--tasks", nargs="*", choices=list(EVAL_TASKS), help="평가할 기능 키 (기본: 전체)")
+    parser.add_argument("--limit", type=int, default=None, help="작업별 최대 예제 수")
+    parser.add_argument("--workers", type=int, default=4, help="작업별 동시 실행 수")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="로컬 분류기/기업 규모 인덱스/응답 캐시 사용 (eval.json으로 학습되어 정확도가 부풀려짐)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="허용하는 정확도 하락 폭")
+    args = parser.parse_args()
+
+    features = args.tasks or discover_evals()
+    print(f"🚀 eval 실행: {', '.join(features)}")
+    summaries = []
+    for feature in features:
+        summary = run_task(feature, args.limit, args.workers, use_cache=args.use_cache)
+        if summary:
+            summaries.append(summary)
+            print(f"  ✅ {summary['task']}: 정확도 {summary['accuracy']:.3f}, p95 {summary['p95_latency']:.2f}s")
+    print_summary(summaries)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"eval_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({"created_at": datetime.now().isoformat(), "use_cache": args.use_cache, "summaries": summaries},
+                  f, ensure_ascii=False, indent=2, default=str)
+    print(f"💾 결과 저장: {result_path}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(summaries, args.baseline, args.tolerance)
+        if regressions:
+            print(f"❌ 품질 하락: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ 기준 대비 품질 하락 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+예제 버튼에 쓰는 회사 / 직무 목록
+
+main.py의 탭 예제 버튼과 cache_warmer.py의 기본 예열 대상이 같은 목록을 씁니다.
+"""
+
+EXAMPLE_COMPANIES = ["삼성전자", "토스", "카카오", "네이버", "LG전자", "현대자동차", "CJ제일제당", "하이브", "쿠팡", "배달의민족", "신한은행", "SKT", "포스코", "현대건설", "아모레퍼시픽"]
+EXAMPLE_JOBS = ["백엔드 개발", "프론트엔드 개발", "데이터 사이언티스트", "마케팅", "영업", "기획", "디자인", "HR", "재무", "A&R", "경영기획", "해외영업", "온라인마케팅", "식품마케팅", "HRM(인사운영)"]
+EXPERIENCE_LEVELS = ["신입", "경력", "인턴", "기타"]
+
+# 기업 규모 탭의 예제 기업
+EXAMPLE_SIZE_COMPANIES = ["삼성전자", "현대자동차", "SK하이닉스", "포스코홀딩스", "토스", "카카오", "네이버", "쿠팡", "배달의민족", "당근마켓"]
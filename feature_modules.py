@@ -0,0 +1,48 @@
+import importlib.util
+from pathlib import Path
+
+# 현재 디렉토리 설정
+current_dir = Path(__file__).parent
+
+# 기능 키 -> (모듈 디렉토리, 로드 시 사용할 모듈 이름)
+FEATURE_MODULES = {
+    'commonly_asked': ("commonly-asked-question", "commonly_asked_llm"),
+    'question_rec': ("question-recommendation", "question_rec_llm"),
+    'jd_rec': ("jd-recommendation", "jd_rec_llm"),
+    'industry': ("industry-classification", "industry_llm"),
+    'jasoseo': ("jasoseo-context-report", "jasoseo_llm"),
+    'company_size': ("company-size-classification", "company_size_llm"),
+}
+
+_loaded_modules = {}
+
+
+def load_module_from_path(module_name, file_path):
+    """동적으로 모듈을 로드하는 함수"""
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    except Exception as e:
+        print(f"모듈 로드 실패 {module_name}: {e}")
+        return None
+
+
+def feature_dir(feature):
+    """기능 키에 해당하는 모듈 디렉토리 경로"""
+    return current_dir / FEATURE_MODULES[feature][0]
+
+
+def load_feature_module(feature):
+    """
+    기능 키에 해당하는 llm_functions.py를 로드합니다. (프로세스당 한 번, 실패 시 None)
+    """
+    if feature not in _loaded_modules:
+        directory, module_name = FEATURE_MODULES[feature]
+        llm_functions_path = current_dir / directory / "llm_functions.py"
+        if llm_functions_path.exists():
+            _loaded_modules[feature] = load_module_from_path(module_name, llm_functions_path)
+        else:
+            _loaded_modules[feature] = None
+    return _loaded_modules[feature]
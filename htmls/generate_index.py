@@ -1,43 +1,293 @@
+"""
+htmls/ 리포트 인덱스 생성
+
+각 리포트의 회사명, 직무, 대화 턴 수, 처리 시간, 에러 수, 생성 시간을 manifest.json에 모아두고
+index.html에서 클라이언트 측 검색/필터로 보여줍니다.
+파일별 mtime/size(로컬 .manifest_stat.json)와 내용 해시(manifest.json)를 비교해
+새로 생겼거나 바뀐 파일만 다시 읽습니다.
+
+사용법:
+    python htmls/generate_index.py            # 증분 갱신
+    python htmls/generate_index.py --full     # 모든 파일 다시 읽기
+"""
+
 import os
+import re
+import sys
 import json
+import html
+import hashlib
+from datetime import datetime
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(DIR, "manifest.json")
+FILELIST_PATH = os.path.join(DIR, "filelist.json")
+# mtime은 체크아웃마다 바뀌므로 커밋되는 manifest가 아닌 로컬 파일에 둡니다.
+STAT_PATH = os.path.join(DIR, ".manifest_stat.json")
+INDEX_PATH = os.path.join(DIR, "index.html")
+
+MANIFEST_VERSION = 1
+
+FIELD_PATTERNS = {
+    "case_id": re.compile(r"<strong>케이스 ID:</strong>\s*([^<]+)"),
+    "company_name": re.compile(r"<strong>회사명:</strong>\s*([^<]+)"),
+    "position_title": re.compile(r"<strong>직무:</strong>\s*([^<]+)"),
+    "duration": re.compile(r"<strong>처리 시간:</strong>\s*([\d.]+)초"),
+    "generated_at": re.compile(r"생성 시간:\s*(\d{4})년 (\d{2})월 (\d{2})일 (\d{2}:\d{2}:\d{2})"),
+    "total_cases": re.compile(r"<strong>총 테스트 케이스:</strong>\s*(\d+)개"),
+    "failed_cases": re.compile(r"<strong>실패한 케이스:</strong>\s*(\d+)개"),
+}
+TURN_PATTERN = re.compile(r"<h4>턴 \d+</h4>")
+ERROR_LOG_MARKER = "❌ 에러 로그"
+ERROR_ITEM_PATTERN = re.compile(r'<div class="error">')
+
+
+def _match(name, text):
+    match = FIELD_PATTERNS[name].search(text)
+    return html.unescape(match.group(1).strip()) if match else None
+
+
+def extract_metadata(filename, text):
+    """
+    리포트 HTML에서 인덱스에 표시할 메타데이터를 추출합니다. (기존 리포트와 report_writer 리포트 모두 지원)
+    """
+    generated = FIELD_PATTERNS["generated_at"].search(text)
+    generated_at = f"{generated.group(1)}-{generated.group(2)}-{generated.group(3)} {generated.group(4)}" if generated else None
+
+    if filename.startswith("test_report_"):
+        total = _match("total_cases", text)
+        failed = _match("failed_cases", text)
+        return {
+            "kind": "aggregate",
+            "company_name": None,
+            "position_title": None,
+            "case_id": None,
+            "turns": None,
+            "duration": None,
+            "errors": int(failed) if failed else 0,
+            "total_cases": int(total) if total else None,
+            "generated_at": generated_at,
+        }
+
+    error_log = text.split(ERROR_LOG_MARKER, 1)
+    duration = _match("duration", text)
+    return {
+        "kind": "case",
+        "case_id": _match("case_id", text),
+        "company_name": _match("company_name", text),
+        "position_title": _match("position_title", text),
+        "turns": len(TURN_PATTERN.findall(text)),
+        "duration": float(duration) if duration else None,
+        "errors": len(ERROR_ITEM_PATTERN.findall(error_log[1])) if len(error_log) > 1 else 0,
+        "total_cases": None,
+        "generated_at": generated_at,
+    }
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {"version": MANIFEST_VERSION, "files": {}}
+
+
+def load_stats():
+    try:
+        with open(STAT_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
-DIR = "htmls"
-files = sorted([
-    f for f in os.listdir(DIR)
-    if f.endswith(".html") and f != "index.html"
-])
 
-# 1. Write filelist.json
-with open(os.path.join(DIR, "filelist.json"), "w", encoding="utf-8") as f:
-    json.dump(files, f, ensure_ascii=False, indent=2)
+def update_manifest(manifest, stats, full=False):
+    """
+    새로 생겼거나 바뀐 파일만 다시 읽어 manifest를 갱신합니다. (추가/갱신/삭제 개수 반환)
+    mtime만 바뀐 경우(예: git checkout)에는 내용 해시를 비교해 같으면 다시 파싱하지 않습니다.
+    """
+    entries = manifest["files"]
+    files = sorted(
+        f for f in os.listdir(DIR)
+        if f.endswith(".html") and f != "index.html"
+    )
+    added = updated = 0
+    for filename in files:
+        path = os.path.join(DIR, filename)
+        stat = os.stat(path)
+        entry = entries.get(filename)
+        if not full and entry and stats.get(filename) == [stat.st_mtime, stat.st_size]:
+            continue
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        stats[filename] = [stat.st_mtime, stat.st_size]
+        if not full and entry and entry["sha1"] == digest:
+            continue
+        metadata = extract_metadata(filename, raw.decode("utf-8", errors="replace"))
+        if not metadata["generated_at"]:
+            metadata["generated_at"] = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+        metadata.update({"file": filename, "size": stat.st_size, "sha1": digest})
+        if entry:
+            updated += 1
+        else:
+            added += 1
+        entries[filename] = metadata
 
-# 2. Write index.html
-with open(os.path.join(DIR, "index.html"), "w", encoding="utf-8") as f:
-    f.write("""<!DOCTYPE html>
+    removed = [filename for filename in entries if filename not in files]
+    for filename in removed:
+        del entries[filename]
+        stats.pop(filename, None)
+    return added, updated, len(removed)
+
+
+def write_manifest(manifest, stats):
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_PATH)
+    # 기존 소비자를 위한 파일명 목록
+    with open(FILELIST_PATH, "w", encoding="utf-8") as f:
+        json.dump(sorted(manifest["files"]), f, ensure_ascii=False, indent=2)
+    with open(STAT_PATH, "w", encoding="utf-8") as f:
+        json.dump(stats, f)
+
+
+INDEX_HTML = """<!DOCTYPE html>
 <html lang="ko">
 <head>
   <meta charset="UTF-8">
-  <title>HTML 파일 목록</title>
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>리포트 목록</title>
+  <style>
+    body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background: #f5f5f5; }
+    .filters { background: white; padding: 15px; border-radius: 8px; margin-bottom: 15px; }
+    .filters input, .filters select { padding: 6px; margin-right: 10px; }
+    table { border-collapse: collapse; width: 100%; background: white; }
+    th, td { border-bottom: 1px solid #e9ecef; padding: 8px; text-align: left; font-size: 14px; }
+    th { background: #34495e; color: white; cursor: pointer; user-select: none; }
+    tr.failed td { background: #fdf0f1; }
+    #count { color: #6c757d; }
+  </style>
 </head>
 <body>
-  <h1>HTML 파일 목록</h1>
-  <ul id="file-list"></ul>
+  <h1>리포트 목록</h1>
+  <div class="filters">
+    <input id="q" type="search" placeholder="회사명 / 직무 / 파일명 검색">
+    <select id="kind">
+      <option value="">전체 종류</option>
+      <option value="case">개별 케이스</option>
+      <option value="aggregate">통합 리포트</option>
+    </select>
+    <select id="status">
+      <option value="">전체 상태</option>
+      <option value="ok">에러 없음</option>
+      <option value="failed">에러 있음</option>
+    </select>
+    <span id="count"></span>
+  </div>
+  <table>
+    <thead>
+      <tr>
+        <th data-key="generated_at">생성 시간</th>
+        <th data-key="company_name">회사명</th>
+        <th data-key="position_title">직무</th>
+        <th data-key="case_id">케이스</th>
+        <th data-key="turns">턴 수</th>
+        <th data-key="duration">처리 시간(초)</th>
+        <th data-key="errors">에러 수</th>
+        <th data-key="file">파일</th>
+      </tr>
+    </thead>
+    <tbody id="rows"></tbody>
+  </table>
 
   <script>
-    fetch("filelist.json")
+    let entries = [];
+    let sortKey = "generated_at";
+    let sortDesc = true;
+
+    function text(value) {
+      return value === null || value === undefined ? "" : String(value);
+    }
+
+    function render() {
+      const q = document.getElementById("q").value.trim().toLowerCase();
+      const kind = document.getElementById("kind").value;
+      const status = document.getElementById("status").value;
+      const rows = entries.filter(e =>
+        (!kind || e.kind === kind) &&
+        (!status || (status === "failed") === (e.errors > 0)) &&
+        (!q || [e.company_name, e.position_title, e.file, e.case_id].some(v => text(v).toLowerCase().includes(q)))
+      ).sort((a, b) => {
+        const x = a[sortKey], y = b[sortKey];
+        const cmp = typeof x === "number" && typeof y === "number" ? x - y : text(x).localeCompare(text(y));
+        return sortDesc ? -cmp : cmp;
+      });
+
+      const body = document.getElementById("rows");
+      body.replaceChildren(...rows.map(e => {
+        const tr = document.createElement("tr");
+        if (e.errors > 0) tr.className = "failed";
+        for (const key of ["generated_at", "company_name", "position_title", "case_id", "turns", "duration", "errors"]) {
+          const td = document.createElement("td");
+          td.textContent = key === "company_name" && e.kind === "aggregate" ? `통합 리포트 (${text(e.total_cases)}건)` : text(e[key]);
+          tr.appendChild(td);
+        }
+        const td = document.createElement("td");
+        const a = document.createElement("a");
+        a.href = e.file;
+        a.textContent = e.file;
+        a.target = "_blank";
+        td.appendChild(a);
+        tr.appendChild(td);
+        return tr;
+      }));
+      document.getElementById("count").textContent = `${rows.length} / ${entries.length}건`;
+    }
+
+    document.querySelectorAll("th").forEach(th => th.addEventListener("click", () => {
+      sortDesc = sortKey === th.dataset.key ? !sortDesc : true;
+      sortKey = th.dataset.key;
+      render();
+    }));
+    ["q", "kind", "status"].forEach(id => document.getElementById(id).addEventListener("input", render));
+
+    fetch("manifest.json")
       .then(response => response.json())
-      .then(files => {
-        const list = document.getElementById("file-list");
-        files.forEach(file => {
-          const li = document.createElement("li");
-          const a = document.createElement("a");
-          a.href = file;
-          a.textContent = file;
-          a.target = "_blank";
-          li.appendChild(a);
-          list.appendChild(li);
-        });
+      .then(manifest => {
+        entries = Object.values(manifest.files);
+        render();
       });
   </script>
 </body>
-</html>""")
+</html>"""
+
+
+def write_index():
+    # 인덱스 페이지는 manifest.json을 읽어 그리므로 템플릿이 바뀔 때만 다시 씁니다.
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            if f.read() == INDEX_HTML:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(INDEX_PATH, "w", encoding="utf-8") as f:
+        f.write(INDEX_HTML)
+    return True
+
+
+def main():
+    full = "--full" in sys.argv[1:]
+    manifest = load_manifest()
+    stats = load_stats()
+    added, updated, removed = update_manifest(manifest, stats, full=full)
+    write_manifest(manifest, stats)
+    write_index()
+    print(f"📇 manifest 갱신: 추가 {added}개, 변경 {updated}개, 삭제 {removed}개 (전체 {len(manifest['files'])}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+산업 태그 로컬 사전 분류기
+
+eval.json의 라벨 예제와 응답 캐시(response_cache의 "industry" namespace)에 쌓인
+(회사명, 직무) -> 태그 기록으로 문자 n-gram TF-IDF 인덱스를 만들고,
+코사인 유사도가 가장 높은 예제의 태그를 반환합니다.
+신뢰도(유사도)가 임계값 이상일 때만 로컬 결과를 사용하고,
+그 외에는 웹 검색 기반 classify_industry 경로로 넘깁니다.
+
+사용법:
+    python industry_local_classifier.py   # eval.json 기준 적중률/정확도 리포트 (leave-one-out)
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import threading
+import unicodedata
+from collections import Counter
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from response_cache import get_cache
+from industry_taxonomy import validate_tags
+
+CACHE_NAMESPACE = "industry"
+eval_path = os.path.join(current_dir, 'eval.json')
+
+# 이 값 이상의 유사도에서만 로컬 결과를 사용
+DEFAULT_THRESHOLD = float(os.getenv("INDUSTRY_LOCAL_THRESHOLD", "0.85"))
+
+NGRAM_RANGE = (1, 3)
+# 산업은 주로 회사명으로 결정되므로 직무 n-gram은 낮은 가중치로만 반영
+JOB_WEIGHT = 0.2
+
+
+def _normalize(text):
+    text = unicodedata.normalize("NFC", str(text or "")).lower()
+    return "".join(text.split())
+
+
+def _char_ngrams(text, prefix):
+    text = _normalize(text)
+    if not text:
+        return []
+    padded = f"^{text}$"
+    grams = []
+    for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+        grams.extend(prefix + padded[i:i + n] for i in range(len(padded) - n + 1))
+    return grams
+
+
+def _features(company_name, job_title):
+    counts = Counter(_char_ngrams(company_name, "c:"))
+    for gram, count in Counter(_char_ngrams(job_title, "j:")).items():
+        counts[gram] += count * JOB_WEIGHT
+    return counts
+
+
+def load_eval_examples():
+    """
+    eval.json의 라벨 예제를 [(company_name, job_title, tags), ...]로 반환합니다.
+    """
+    with open(eval_path, 'r', encoding='utf-8') as f:
+        examples = json.load(f)['industry_classification_eval']['examples']
+    return [
+        (ex['input']['company_name'], ex['input']['job_title'], ex['output'])
+        for ex in examples
+    ]
+
+
+def load_cached_examples(cache=None):
+    """
+    응답 캐시에 저장된 LLM 분류 결과를 학습 예제로 반환합니다.
+    """
+    cache = cache or get_cache()
+    examples = []
+    for _, value, _ in cache.items(CACHE_NAMESPACE):
+        tags = validate_tags(value.get('tags'))
+        if tags:
+            examples.append((value.get('company_name', ''), value.get('job_title', ''), tags))
+    return examples
+
+
+class LocalIndustryClassifier:
+    """
+    문자 n-gram TF-IDF + 코사인 유사도 기반 최근접 예제 분류기.
+    """
+
+    def __init__(self, examples=()):
+        self._lock = threading.Lock()
+        self.examples = []
+        self._doc_freq = Counter()
+        self._vectors = []
+        self._weighted = []
+        self._dirty = False
+        for company_name, job_title, tags in examples:
+            self._append(company_name, job_title, tags)
+
+    def _append(self, company_name, job_title, tags):
+        features = _features(company_name, job_title)
+        self.examples.append((company_name, job_title, list(tags)))
+        self._doc_freq.update(features.keys())
+        self._vectors.append(features)
+        # IDF가 바뀌므로 가중 벡터는 다음 predict에서 한 번만 다시 계산합니다.
+        self._dirty = True
+
+    def _idf(self, gram):
+        return math.log((1 + len(self.examples)) / (1 + self._doc_freq.get(gram, 0))) + 1
+
+    def _vectorize(self, counts):
+        vector = {gram: count * self._idf(gram) for gram, count in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+        return {gram: w / norm for gram, w in vector.items()}
+
+    def _reweight(self):
+        if self._dirty:
+            self._weighted = [self._vectorize(counts) for counts in self._vectors]
+            self._dirty = False
+
+    def add_example(self, company_name, job_title, tags):
+        """
+        새로 확인된 (회사명, 직무) -> 태그 예제를 인덱스에 추가합니다.
+        재가중은 다음 predict로 미루므로, 배치 결과를 여러 개 추가해도 전체 재계산은 한 번입니다.
+        """
+        tags = validate_tags(tags)
+        if not tags:
+            return
+        with self._lock:
+            self._append(company_name, job_title, tags)
+
+    def predict(self, company_name, job_title=""):
+        """
+        (tags, confidence)를 반환합니다. 예제가 없으면 ([], 0.0).
+        """
+        with self._lock:
+            if not self.examples:
+                return [], 0.0
+            self._reweight()
+            query = self._vectorize(_features(company_name, job_title))
+            best_index, best_score = -1, 0.0
+            for i, vector in enumerate(self._weighted):
+                score = sum(w * vector.get(gram, 0.0) for gram, w in query.items())
+                if score > best_score:
+                    best_index, best_score = i, score
+            if best_index < 0:
+                return [], 0.0
+            return list(self.examples[best_index][2]), best_score
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier():
+    """
+    eval.json + 응답 캐시로 학습된 프로세스 전역 분류기를 반환합니다. (최초 호출 시 1회 학습)
+    """
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = LocalIndustryClassifier(load_eval_examples() + load_cached_examples())
+    return _classifier
+
+
+def classify_locally(company_name, job_title="", threshold=None):
+    """
+    신뢰도가 임계값 이상이면 (tags, confidence), 아니면 (None, confidence)를 반환합니다.
+    """
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    tags, confidence = get_classifier().predict(company_name, job_title)
+    if tags and confidence >= threshold:
+        return tags, confidence
+    return None, confidence
+
+
+def evaluate(threshold=None):
+    """
+    eval.json 기준으로 처음 보는 회사에 대한 로컬 분류기의 적중률(hit rate)과 정확도를 측정합니다.
+
+    leave-one-out: 예제마다 그 예제와 같은 회사의 캐시 기록을 뺀 나머지로 학습한 분류기로 예측합니다.
+    (학습 데이터에 들어 있는 예제를 그대로 예측하면 항상 맞히므로 측정값으로 쓰지 않습니다)
+    """
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+    eval_examples = load_eval_examples()
+    cached_examples = load_cached_examples()
+
+    hits, correct, latencies = 0, 0, []
+    for i, (company_name, job_title, expected) in enumerate(eval_examples):
+        train = eval_examples[:i] + eval_examples[i + 1:] + [
+            ex for ex in cached_examples if _normalize(ex[0]) != _normalize(company_name)
+        ]
+        classifier = LocalIndustryClassifier(train)
+        start = time.perf_counter()
+        tags, confidence = classifier.predict(company_name, job_title)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if tags and confidence >= threshold:
+            hits += 1
+            if set(tags) == set(expected):
+                correct += 1
+    total = len(eval_examples)
+    return {
+        "total": total,
+        "hit_rate": hits / total if total else 0.0,
+        "accuracy_on_hits": correct / hits if hits else 0.0,
+        "max_latency_ms": max(latencies) if latencies else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    print(f"🔧 임계값: {DEFAULT_THRESHOLD}")
+    stats = evaluate()
+    print(f"[처음 보는 회사, leave-one-out] 총 {stats['total']}건 | 로컬 적중률 {stats['hit_rate']*100:.1f}% | "
+          f"적중 시 정확도 {stats['accuracy_on_hits']*100:.1f}% | 최대 지연 {stats['max_latency_ms']:.2f}ms")
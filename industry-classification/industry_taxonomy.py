@@ -0,0 +1,110 @@
+import os
+import json
+
+# 산업 태그 목록은 eval.json의 industryCategories를 단일 원본으로 사용합니다.
+current_dir = os.path.dirname(os.path.abspath(__file__))
+taxonomy_path = os.path.join(current_dir, 'eval.json')
+
+
+def _load_categories():
+    """
+    eval.json에서 산업 카테고리 목록을 읽어옵니다.
+    """
+    with open(taxonomy_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['industryCategories']
+
+
+# 모듈 로드 시 한 번만 구성
+INDUSTRY_CATEGORIES = _load_categories()
+
+# tagId 목록 (프롬프트/스키마에 쓰이는 순서 유지)
+TAG_IDS = [tag['tagId'] for category in INDUSTRY_CATEGORIES for tag in category['tags']]
+
+# tagId -> 한글 라벨 ("#" 제외, 예: "platform-portal" -> "플랫폼/포털")
+TAG_LABELS = {
+    tag['tagId']: tag['tagName'].lstrip('#')
+    for category in INDUSTRY_CATEGORIES
+    for tag in category['tags']
+}
+
+# tagId -> 상위 카테고리명
+TAG_CATEGORY = {
+    tag['tagId']: category['name']
+    for category in INDUSTRY_CATEGORIES
+    for tag in category['tags']
+}
+
+_TAG_ID_SET = frozenset(TAG_IDS)
+
+# Structured Outputs용 JSON 스키마 (tagId enum으로 출력 제한)
+TAGS_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "tags": {
+            "type": "array",
+            "items": {"type": "string", "enum": TAG_IDS}
+        }
+    },
+    "required": ["tags"],
+    "additionalProperties": False
+}
+
+# 여러 항목을 한 번에 분류할 때의 스키마 (입력 id별 태그 배열)
+BATCH_TAGS_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "tags": {"type": "array", "items": {"type": "string", "enum": TAG_IDS}}
+                },
+                "required": ["id", "tags"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["results"],
+    "additionalProperties": False
+}
+
+
+def format_tag_list():
+    """
+    프롬프트에 넣을 카테고리별 태그 목록 ("- tagId: #라벨")
+    """
+    blocks = []
+    for category in INDUSTRY_CATEGORIES:
+        lines = [f"**{category['name']}**"]
+        lines += [f"- {tag['tagId']}: {tag['tagName']}" for tag in category['tags']]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def is_valid_tag(tag):
+    """
+    주어진 값이 taxonomy에 존재하는 tagId인지 확인합니다.
+    """
+    return tag in _TAG_ID_SET
+
+
+def validate_tags(tags):
+    """
+    taxonomy에 없는 태그를 제거하고 중복을 없앤 태그 리스트를 반환합니다.
+    """
+    valid_tags = []
+    for tag in tags or []:
+        if isinstance(tag, str):
+            tag = tag.strip().lstrip('#')
+        if is_valid_tag(tag) and tag not in valid_tags:
+            valid_tags.append(tag)
+    return valid_tags
+
+
+def get_tag_label(tag):
+    """
+    tagId에 해당하는 한글 라벨을 반환합니다. (없으면 tagId 그대로)
+    """
+    return TAG_LABELS.get(tag, tag)
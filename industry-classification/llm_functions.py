@@ -1,19 +1,38 @@
 import os
+import sys
 import json
 import re
+import time
 import yaml
-from openai import OpenAI
-
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 프롬프트 템플릿 로드
 import os
 current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from response_cache import get_cache, make_cache_key
+from company_names import company_key
+from search_policy import choose_batch_search_context_size, choose_search_context_size, record_search_call
+from industry_taxonomy import BATCH_TAGS_JSON_SCHEMA, TAGS_JSON_SCHEMA, TAG_LABELS, format_tag_list, validate_tags
+from industry_local_classifier import CACHE_NAMESPACE, classify_locally, get_classifier
+from llm_gateway import create_client
+from batching import run_batched
+
+# OpenAI 클라이언트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
+
 prompt_path = os.path.join(current_dir, 'prompt.yaml')
 with open(prompt_path, 'r', encoding='utf-8') as f:
     prompt_data = yaml.safe_load(f)
     prompt_template = prompt_data['prompt']
+    batch_prompt_template = prompt_data['prompt_batch']
+
+# 배치 분류 시 요청 하나에 넣는 최대 항목 수
+INDUSTRY_BATCH_SIZE = int(os.getenv("INDUSTRY_BATCH_SIZE", "20"))
 
 def parse_industry_tags(content):
     """
@@ -26,6 +45,16 @@ def parse_industry_tags(content):
         # 텍스트 전처리
         cleaned_content = content.strip()
         
+        # 0. Structured Outputs 응답 ({"tags": [...]})은 그대로 JSON 파싱
+        try:
+            parsed_json = json.loads(cleaned_content)
+            if isinstance(parsed_json, dict):
+                parsed_json = parsed_json.get('tags', [])
+            if isinstance(parsed_json, list):
+                return validate_tags(parsed_json)
+        except json.JSONDecodeError:
+            pass
+        
         # 1. JSON 코드 블록 찾기 (```json ... ``` 형식)
         json_patterns = [
             r'```json\s*(\[.*?\])\s*```',
@@ -46,40 +75,126 @@ def parse_industry_tags(content):
                 
                 try:
                     parsed_json = json.loads(json_str)
+                    if isinstance(parsed_json, dict):
+                        parsed_json = parsed_json.get('tags', [])
                     if isinstance(parsed_json, list):
-                        return parsed_json
+                        return validate_tags(parsed_json)
                 except json.JSONDecodeError as e:
                     print(f"JSON 블록 파싱 실패: {e}")
         
+        return []
         
     except Exception as e:
         print(f"태그 파싱 전체 오류: {e}")
         print(f"파싱 실패한 컨텐츠: {repr(content)}")
         return []
 
-def classify_industry(job_title, company_name):
+def format_industry_result(job_title, company_name, tags, source_note=""):
+    """
+    분류된 태그를 마크다운 결과로 포맷팅하는 함수
+    """
+    result = f"""## 🏢 {company_name} - {job_title} 산업 분류 결과
+
+### 🏷️ **분류된 산업 태그**
+
+"""
+    for i, tag in enumerate(tags, 1):
+        result += f"**{i}.** #{TAG_LABELS[tag]} (`{tag}`)\n\n"
+    
+    result += f"""
+---
+**📝 입력 정보:**
+- 회사: {company_name}
+- 직무: {job_title}
+- 분류된 태그 수: {len(tags)}개
+{source_note}
+*본 분류는 AI가 수행한 것으로, 실제와 다를 수 있습니다.*
+"""
+    return result
+
+def cached_industry_tags(company_name, job_title):
+    """
+    응답 캐시에 저장된 (정규화 회사 키, 직무)의 산업 태그 (없으면 None)
+
+    같은 캐시 파일을 쓰는 다른 프로세스(예: cache_warmer.py)가 저장한 결과도 재시작 없이 바로 보입니다.
+    """
+    cached = get_cache().get(CACHE_NAMESPACE, make_cache_key(company_key(company_name), job_title))
+    return (cached or {}).get("tags") or None
+
+
+def classify_industry(job_title, company_name, use_local=True, search_context_size=None, research=None):
     """
     OpenAI API를 사용하여 기업의 산업을 분류하는 함수
+
+    응답 캐시에 같은 회사(정규화 키) × 직무 결과가 있으면 그 결과를, 없으면 로컬 사전 분류기의 신뢰도가
+    충분할 때 그 결과를 웹 검색 없이 바로 반환합니다. use_local=False면 둘 다 건너뜁니다.
+    research(미리 조사한 회사 자료)가 주어지면 웹 검색 대신 그 자료를 근거로 분류합니다.
     """
     try:
         if not job_title or not company_name:
             return "직무와 회사명을 모두 입력해주세요.", []
         
+        if use_local:
+            cached_tags = cached_industry_tags(company_name, job_title)
+            if cached_tags:
+                note = "- 분류 방식: 캐시된 분류 결과\n"
+                return format_industry_result(job_title, company_name, cached_tags, note), cached_tags
+
+        # 로컬 사전 분류 (신뢰도 임계값 이상일 때만 사용)
+        if use_local:
+            local_tags, confidence = classify_locally(company_name, job_title)
+            if local_tags:
+                print(f"로컬 분류기 사용 (신뢰도 {confidence:.2f}): {local_tags}")
+                note = f"- 분류 방식: 로컬 분류기 (신뢰도 {confidence:.2f})\n"
+                return format_industry_result(job_title, company_name, local_tags, note), local_tags
+        
         # 프롬프트 생성
         prompt = prompt_template.format(
             job_title=job_title,
-            company_name=company_name
+            company_name=company_name,
+            tag_list=format_tag_list()
         )
         
-        # OpenAI Responses API 호출 (Web Search Preview 사용)
-        response = client.responses.create(
-            model="gpt-4o",
-            tools=[{
+        if research:
+            # 공유 조사 자료 사용 (웹 검색 없음)
+            tools = []
+            instruction = f"당신은 기업 산업 분류 전문가입니다. 아래 조사 자료를 근거로 정확한 산업 태그를 JSON 형식으로 반환해주세요.\n\n[조사 자료]\n{research}"
+        else:
+            # search_context_size는 회사 조사 이력에 따라 선택 (명시값 우선)
+            if search_context_size:
+                size_reason = "explicit"
+            else:
+                search_context_size, size_reason = choose_search_context_size("industry", company_name)
+            tools = [{
                 "type": "web_search_preview",
-                "search_context_size": "high",
-            }],
-            input=f"당신은 기업 산업 분류 전문가입니다. 웹 검색을 통해 최신 정보를 확인하고 정확한 산업 태그를 JSON 배열 형식으로 반환해주세요.\n\n{prompt}"
-        )
+                "search_context_size": search_context_size,
+            }]
+            instruction = "당신은 기업 산업 분류 전문가입니다. 웹 검색을 통해 최신 정보를 확인하고 정확한 산업 태그를 JSON 형식으로 반환해주세요."
+        
+        # OpenAI Responses API 호출 (Web Search Preview 사용)
+        # 출력은 taxonomy의 tagId enum으로 제한 (Structured Outputs)
+        start_time = time.time()
+        try:
+            response = client.responses.create(
+                model="gpt-4o",
+                tools=tools,
+                text={
+                    "format": {
+                        "type": "json_schema",
+                        "name": "industry_tags",
+                        "schema": TAGS_JSON_SCHEMA,
+                        "strict": True
+                    }
+                },
+                input=f"{instruction}\n\n{prompt}"
+            )
+        except Exception:
+            # 실패한 호출도 기록 (성공률 집계)
+            if not research:
+                record_search_call("industry", company_name, search_context_size, size_reason,
+                                   time.time() - start_time, None, "gpt-4o", success=False)
+            raise
+        latency = time.time() - start_time
         
         content = response.output_text
         print(f"=== AI 응답 원본 ===")
@@ -99,99 +214,23 @@ def classify_industry(job_title, company_name):
         print(f"=== AI 응답 끝 ===")
         
         tags = parse_industry_tags(content)
+        # 유효한 태그를 얻은 경우만 성공 (회사를 known으로 표시)
+        if not research:
+            record_search_call("industry", company_name, search_context_size, size_reason,
+                               latency, response, "gpt-4o", success=bool(tags))
         
         if not tags:
             return "산업 분류에 실패했습니다. 다시 시도해주세요.", []
         
-        # 태그명 매핑 (표시용)
-        tag_mapping = {
-            "platform-portal": "플랫폼/포털",
-            "e-commerce": "이커머스",
-            "game": "게임",
-            "it-solution-si": "IT솔루션/SI",
-            "o2o-vertical": "O2O/버티컬",
-            "ai-data": "AI/데이터",
-            "cloud-saas": "클라우드/SaaS",
-            "fintech": "핀테크",
-            "semiconductor": "반도체",
-            "electronics-home": "가전/전자제품",
-            "automotive-mobility": "자동차/모빌리티",
-            "battery": "2차전지",
-            "display": "디스플레이",
-            "heavy-industry-shipbuilding": "중공업/조선",
-            "steel-metal": "철강/금속",
-            "bank": "은행",
-            "securities": "증권",
-            "insurance": "보험",
-            "card": "카드",
-            "asset-management": "자산운용",
-            "dept-store-mart": "백화점/마트",
-            "convenience-store": "편의점",
-            "fmcg-beverage": "FMCG/식음료",
-            "fashion-beauty": "패션/뷰티",
-            "duty-free": "면세점",
-            "pharma-new-drug": "제약/신약개발",
-            "bio-cmo": "바이오/CMO",
-            "medical-device": "의료기기",
-            "digital-healthcare": "디지털헬스케어",
-            "entertainment": "엔터테인먼트",
-            "contents-video": "콘텐츠/영상제작",
-            "ad-agency": "광고대행사",
-            "webtoon-webnovel": "웹툰/웹소설",
-            "broadcasting-press": "방송/언론",
-            "construction-engineering": "건설/엔지니어링",
-            "realestate-development": "부동산개발",
-            "plant": "플랜트",
-            "interior": "인테리어",
-            "public-soc": "SOC (공항,도로,철도)",
-            "public-energy": "에너지 공기업",
-            "public-finance": "금융 공기업",
-            "public-admin": "일반행정",
-            "mpe-semiconductor": "반도체 소부장",
-            "mpe-display": "디스플레이 소부장",
-            "mpe-battery": "2차전지 소부장",
-            "auto-parts": "자동차 부품",
-            "chemical-materials": "화학/소재",
-            "hotel": "호텔",
-            "travel-agency": "여행사",
-            "airline": "항공사",
-            "leisure-resort": "레저/리조트",
-            "consulting": "컨설팅",
-            "accounting-tax": "회계/세무",
-            "law-firm": "법률 (로펌)",
-            "market-research": "리서치",
-            "logistics-delivery": "물류/택배",
-            "shipping": "해운",
-            "forwarding": "포워딩",
-            "land-transport": "육상운송",
-            "edutech": "에듀테크",
-            "private-academy": "입시/보습학원",
-            "edu-publishing": "교육출판",
-            "language-edu": "외국어교육",
-            "ngo-npo": "NGO/NPO",
-            "social-enterprise": "사회적기업",
-            "foundation": "재단"
-        }
-        
-        # 결과 포맷팅
-        result = f"""## 🏢 {company_name} - {job_title} 산업 분류 결과
-
-### 🏷️ **분류된 산업 태그**
-
-"""
-        for i, tag in enumerate(tags, 1):
-            tag_name = tag_mapping.get(tag, tag)
-            result += f"**{i}.** #{tag_name} (`{tag}`)\n\n"
+        # 응답 캐시 및 로컬 분류기에 결과 반영
+        get_cache().set(CACHE_NAMESPACE, make_cache_key(company_key(company_name), job_title), {
+            "company_name": company_name,
+            "job_title": job_title,
+            "tags": tags
+        })
+        get_classifier().add_example(company_name, job_title, tags)
         
-        result += f"""
----
-**📝 입력 정보:**
-- 회사: {company_name}
-- 직무: {job_title}
-- 분류된 태그 수: {len(tags)}개
-
-*본 분류는 AI가 수행한 것으로, 실제와 다를 수 있습니다.*
-"""
+        result = format_industry_result(job_title, company_name, tags)
         
         return result, tags
         
@@ -204,4 +243,91 @@ def classify_industry(job_title, company_name):
 
 다시 시도해주세요.
 """
-        return error_msg, [] 
\ No newline at end of file
+        return error_msg, []
+
+
+def request_industry_batch(items, search_context_size=None):
+    """
+    여러 (회사, 직무)를 한 번의 요청으로 분류합니다.
+
+    items: [{"id", "company_name", "job_title"}, ...]
+    반환: ({id: tags}, response) - 응답에 없거나 유효한 태그가 없는 id는 빠집니다.
+    성공한 항목은 단건 분류와 같이 응답 캐시와 로컬 분류기에 반영합니다.
+    """
+    if not items:
+        return {}, None
+    company_names = [item["company_name"] for item in items]
+    if search_context_size:
+        size_reason = "explicit"
+    else:
+        search_context_size, size_reason = choose_batch_search_context_size("industry", company_names)
+
+    payload = [{"id": str(item["id"]), "company_name": item["company_name"], "job_title": item.get("job_title", "")}
+               for item in items]
+    prompt = batch_prompt_template.format(tag_list=format_tag_list(), items=json.dumps(payload, ensure_ascii=False))
+
+    start_time = time.time()
+    try:
+        response = client.responses.create(
+            model="gpt-4o",
+            tools=[{"type": "web_search_preview", "search_context_size": search_context_size}],
+            text={
+                "format": {
+                    "type": "json_schema",
+                    "name": "industry_tags_batch",
+                    "schema": BATCH_TAGS_JSON_SCHEMA,
+                    "strict": True
+                }
+            },
+            input=prompt
+        )
+    except Exception:
+        # 실패한 호출도 기록 (성공률 집계)
+        record_search_call("industry", company_names, search_context_size, size_reason,
+                           time.time() - start_time, None, "gpt-4o", success=False)
+        raise
+    latency = time.time() - start_time
+
+    try:
+        results = json.loads(response.output_text).get("results", [])
+    except (json.JSONDecodeError, AttributeError) as e:
+        print(f"배치 산업 분류 응답 파싱 실패: {e}")
+        results = []
+
+    by_id = {str(item["id"]): item for item in items}
+    classified = {}
+    for result in results:
+        item = by_id.get(str(result.get("id")))
+        tags = validate_tags(result.get("tags"))
+        if item is None or not tags:
+            continue
+        classified[item["id"]] = tags
+        get_cache().set(CACHE_NAMESPACE, make_cache_key(company_key(item["company_name"]), item.get("job_title", "")), {
+            "company_name": item["company_name"],
+            "job_title": item.get("job_title", ""),
+            "tags": tags
+        })
+        get_classifier().add_example(item["company_name"], item.get("job_title", ""), tags)
+    # 결과가 있는 회사만 known으로 표시
+    record_search_call("industry", company_names, search_context_size, size_reason, latency, response, "gpt-4o",
+                       success=bool(classified), known=[by_id[item_id]["company_name"] for item_id in classified])
+    return classified, response
+
+
+def classify_industry_batch(items, max_batch_size=None, search_context_size=None, fallback_single=True, stats=None):
+    """
+    여러 (회사, 직무)를 최대 max_batch_size개씩 묶어 분류합니다.
+
+    응답에서 빠진 항목은 나눠서 다시 요청하고, 한 개까지 줄어도 실패하면(fallback_single) 단건 classify_industry로 처리합니다.
+    반환: 입력 순서의 [{"id", "tags", "error"}] - 성공하면 error는 None, 실패하면 tags는 빈 배열
+    """
+    def fallback(item):
+        _, tags = classify_industry(item.get("job_title", ""), item["company_name"], use_local=False,
+                                    search_context_size=search_context_size)
+        return tags
+
+    results, errors = run_batched(
+        items, lambda chunk: request_industry_batch(chunk, search_context_size),
+        max_batch_size or INDUSTRY_BATCH_SIZE, fallback if fallback_single else None, stats
+    )
+    return [{"id": item["id"], "tags": results.get(item["id"], []), "error": errors.get(item["id"])} for item in items]
@@ -1,5 +1,6 @@
 import gradio as gr
 from llm_functions import classify_industry
+from industry_taxonomy import TAG_LABELS
 
 # 예제 데이터
 example_companies = ["삼성전자", "신한은행", "쿠팡", "아모레퍼시픽", "현대건설", "하이브", "토스", "넥슨", "삼성바이오로직스", "HMM"]
@@ -12,76 +13,6 @@ def create_tag_cards(tags):
     if not tags:
         return "<div style='text-align: center; color: #6B7280; padding: 20px;'>분류를 실행해주세요</div>"
     
-    # 태그명 매핑
-    tag_mapping = {
-        "platform-portal": "플랫폼/포털",
-        "e-commerce": "이커머스",
-        "game": "게임",
-        "it-solution-si": "IT솔루션/SI",
-        "o2o-vertical": "O2O/버티컬",
-        "ai-data": "AI/데이터",
-        "cloud-saas": "클라우드/SaaS",
-        "fintech": "핀테크",
-        "semiconductor": "반도체",
-        "electronics-home": "가전/전자제품",
-        "automotive-mobility": "자동차/모빌리티",
-        "battery": "2차전지",
-        "display": "디스플레이",
-        "heavy-industry-shipbuilding": "중공업/조선",
-        "steel-metal": "철강/금속",
-        "bank": "은행",
-        "securities": "증권",
-        "insurance": "보험",
-        "card": "카드",
-        "asset-management": "자산운용",
-        "dept-store-mart": "백화점/마트",
-        "convenience-store": "편의점",
-        "fmcg-beverage": "FMCG/식음료",
-        "fashion-beauty": "패션/뷰티",
-        "duty-free": "면세점",
-        "pharma-new-drug": "제약/신약개발",
-        "bio-cmo": "바이오/CMO",
-        "medical-device": "의료기기",
-        "digital-healthcare": "디지털헬스케어",
-        "entertainment": "엔터테인먼트",
-        "contents-video": "콘텐츠/영상제작",
-        "ad-agency": "광고대행사",
-        "webtoon-webnovel": "웹툰/웹소설",
-        "broadcasting-press": "방송/언론",
-        "construction-engineering": "건설/엔지니어링",
-        "realestate-development": "부동산개발",
-        "plant": "플랜트",
-        "interior": "인테리어",
-        "public-soc": "SOC (공항,도로,철도)",
-        "public-energy": "에너지 공기업",
-        "public-finance": "금융 공기업",
-        "public-admin": "일반행정",
-        "mpe-semiconductor": "반도체 소부장",
-        "mpe-display": "디스플레이 소부장",
-        "mpe-battery": "2차전지 소부장",
-        "auto-parts": "자동차 부품",
-        "chemical-materials": "화학/소재",
-        "hotel": "호텔",
-        "travel-agency": "여행사",
-        "airline": "항공사",
-        "leisure-resort": "레저/리조트",
-        "consulting": "컨설팅",
-        "accounting-tax": "회계/세무",
-        "law-firm": "법률 (로펌)",
-        "market-research": "리서치",
-        "logistics-delivery": "물류/택배",
-        "shipping": "해운",
-        "forwarding": "포워딩",
-        "land-transport": "육상운송",
-        "edutech": "에듀테크",
-        "private-academy": "입시/보습학원",
-        "edu-publishing": "교육출판",
-        "language-edu": "외국어교육",
-        "ngo-npo": "NGO/NPO",
-        "social-enterprise": "사회적기업",
-        "foundation": "재단"
-    }
-    
     cards_html = "<div style='display: flex; flex-wrap: wrap; gap: 10px; justify-content: center;'>"
     
     colors = ["#EBF8FF", "#ECFDF5", "#FEF2F2", "#F5F3FF", "#FFF7ED", "#F0FDFA", "#FDF2F8"]
@@ -90,7 +21,7 @@ def create_tag_cards(tags):
     for i, tag in enumerate(tags):
         color = colors[i % len(colors)]
         border_color = border_colors[i % len(border_colors)]
-        tag_name = tag_mapping.get(tag, tag)
+        tag_name = TAG_LABELS.get(tag, tag)
         
         cards_html += f"""
         <div style="
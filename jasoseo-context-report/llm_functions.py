@@ -1,15 +1,26 @@
 import os
+import sys
 import json
 import re
+import time
 import yaml
-from openai import OpenAI
 from dotenv import load_dotenv
-from ..utils import track_api_cost
+
+# 프로젝트 루트를 path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils import track_api_cost
+from response_cache import get_cache, make_cache_key
+from company_names import company_key, learn_alias, learn_aliases_from_text
+from search_policy import choose_search_context_size, record_search_call
+from llm_gateway import create_client
 
 load_dotenv()
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# OpenAI 클라이언트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 프롬프트 템플릿 로드
 import os
@@ -19,6 +30,13 @@ with open(prompt_path, 'r', encoding='utf-8') as f:
     prompt_data = yaml.safe_load(f)
     prompt_template = prompt_data['prompt']
 
+# 응답 캐시에 리포트 데이터를 저장하는 namespace (채팅 shared_info 자동 채우기 등에서 재사용)
+CACHE_NAMESPACE = "context_report"
+# 파싱에 실패했을 때 parse_context_report가 채우는 회사 이름
+FAILED_PROFILE_NAMES = ("파싱 실패", "오류 발생")
+# 캐시된 리포트를 그대로 돌려주는 기간 (기업 종합 분석의 조사 자료와 같은 기본 7일)
+REPORT_MAX_AGE_SECONDS = float(os.getenv("CONTEXT_REPORT_MAX_AGE_DAYS", "7")) * 24 * 3600
+
 
 
 def parse_context_report(content):
@@ -110,57 +128,11 @@ def parse_context_report(content):
             }
         }, content
 
-def generate_context_report(job_title, company_name, experience_level):
+def format_context_report(job_title, company_name, experience_level, report_data, source_note=""):
     """
-    OpenAI API를 사용하여 자소서 컨텍스트 리포트를 생성하는 함수
+    리포트 데이터를 마크다운 결과로 포맷팅하는 함수
     """
-    try:
-        if not job_title or not company_name or not experience_level:
-            return "직무, 회사명, 경력 수준을 모두 입력해주세요.", {}
-        
-        # 프롬프트 생성
-        prompt = prompt_template.format(
-            job_title=job_title,
-            company_name=company_name,
-            experience_level=experience_level
-        )
-        
-        # OpenAI Responses API 호출 (Web Search Preview 사용)
-        response = client.responses.create(
-            model="gpt-4o",
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": "high",
-            }],
-            input=f"당신은 자기소개서 작성을 위한 기업 및 직무 분석 전문가입니다. 웹 검색을 통해 최신 기업 정보와 산업 동향을 확인하고 정확한 JSON 형식으로 구조화된 정보를 제공해주세요.\n\n{prompt}"
-        )
-        
-        content = response.output_text
-        print(f"=== AI 응답 원본 ===")
-        import pprint
-        pp = pprint.PrettyPrinter(indent=2)
-        pp.pprint(content)
-        print(f"=== 전체 응답 객체 ===")
-        print(response)
-        
-        # 웹 검색 참고 링크 출력
-        if hasattr(response, 'web_search_results') and response.web_search_results:
-            print(f"=== 참고한 웹 검색 링크 ===")
-            for i, result in enumerate(response.web_search_results, 1):
-                if hasattr(result, 'url'):
-                    print(f"{i}. {result.url}")
-                elif hasattr(result, 'link'):
-                    print(f"{i}. {result.link}")
-        
-        print(f"=== AI 응답 끝 ===")
-        
-        report_data, raw_content = parse_context_report(content)
-        
-        if not report_data or 'company_profile' not in report_data:
-            return "컨텍스트 리포트 생성에 실패했습니다. 다시 시도해주세요.", {}
-        
-        # 결과 포맷팅
-        result = f"""## 📊 {company_name} - {job_title} 컨텍스트 리포트
+    result = f"""## 📊 {company_name} - {job_title} 컨텍스트 리포트
 
 ### 🏢 **기업 프로필**
 
@@ -169,10 +141,10 @@ def generate_context_report(job_title, company_name, experience_level):
 
 **💎 핵심 가치**
 """
-        for i, value in enumerate(report_data['company_profile']['core_values'], 1):
-            result += f"**{i}.** {value}\n"
-        
-        result += f"""
+    for i, value in enumerate(report_data['company_profile']['core_values'], 1):
+        result += f"**{i}.** {value}\n"
+    
+    result += f"""
 **👥 인재상**
 {report_data['company_profile']['talent_philosophy']}
 
@@ -181,10 +153,10 @@ def generate_context_report(job_title, company_name, experience_level):
 
 **🛍️ 주요 제품/서비스**
 """
-        for i, service in enumerate(report_data['company_profile']['main_products_services'], 1):
-            result += f"**{i}.** {service}\n"
-        
-        result += f"""
+    for i, service in enumerate(report_data['company_profile']['main_products_services'], 1):
+        result += f"**{i}.** {service}\n"
+    
+    result += f"""
 
 ### 💼 **직무 분석**
 
@@ -195,44 +167,151 @@ def generate_context_report(job_title, company_name, experience_level):
 
 *하드 스킬:*
 """
-        for skill in report_data['position_analysis']['required_skills']['hard']:
-            result += f"• {skill}\n"
-        
-        result += "\n*소프트 스킬:*\n"
-        for skill in report_data['position_analysis']['required_skills']['soft']:
-            result += f"• {skill}\n"
-        
-        result += f"""
+    for skill in report_data['position_analysis']['required_skills']['hard']:
+        result += f"• {skill}\n"
+    
+    result += "\n*소프트 스킬:*\n"
+    for skill in report_data['position_analysis']['required_skills']['soft']:
+        result += f"• {skill}\n"
+    
+    result += f"""
 **🏷️ 핵심 키워드**
 """
-        for keyword in report_data['position_analysis']['keywords']:
-            result += f"`{keyword}` "
-        
-        result += f"""
+    for keyword in report_data['position_analysis']['keywords']:
+        result += f"`{keyword}` "
+    
+    result += f"""
 
 ### 🌐 **산업 맥락**
 
 **📈 주요 트렌드**
 """
-        for i, trend in enumerate(report_data['industry_context']['trends'], 1):
-            result += f"**{i}.** {trend}\n"
-        
-        result += f"""
+    for i, trend in enumerate(report_data['industry_context']['trends'], 1):
+        result += f"**{i}.** {trend}\n"
+    
+    result += f"""
 **🏆 주요 경쟁사**
 """
-        for i, competitor in enumerate(report_data['industry_context']['competitors'], 1):
-            result += f"**{i}.** {competitor}\n"
-        
-        result += f"""
+    for i, competitor in enumerate(report_data['industry_context']['competitors'], 1):
+        result += f"**{i}.** {competitor}\n"
+    
+    result += f"""
 
 ---
 **📝 입력 정보:**
 - 회사: {company_name}
 - 직무: {job_title}
 - 경력: {experience_level}
-
+{source_note}
 *본 리포트는 AI가 생성한 것으로, 실제 정보와 다를 수 있습니다. 자소서 작성 시 참고용으로 활용하세요.*
 """
+    return result
+
+
+def cached_context_report(job_title, company_name, experience_level):
+    """
+    REPORT_MAX_AGE_SECONDS 안에 저장된 리포트 데이터 (없으면 None)
+    """
+    return get_cache().get(CACHE_NAMESPACE, make_cache_key(company_key(company_name), job_title, experience_level),
+                           max_age=REPORT_MAX_AGE_SECONDS)
+
+
+def generate_context_report(job_title, company_name, experience_level, search_context_size=None, research=None, force_refresh=False):
+    """
+    OpenAI API를 사용하여 자소서 컨텍스트 리포트를 생성하는 함수
+
+    응답 캐시에 최근 리포트가 있으면 (force_refresh가 아닐 때) 호출 없이 그 리포트를 반환합니다.
+    research(미리 조사한 회사 자료)가 주어지면 웹 검색 대신 그 자료를 근거로 작성합니다.
+    """
+    raw_content = None
+    try:
+        if not job_title or not company_name or not experience_level:
+            return "직무, 회사명, 경력 수준을 모두 입력해주세요.", {}
+
+        if not force_refresh:
+            cached = cached_context_report(job_title, company_name, experience_level)
+            if cached:
+                note = "- 출처: 캐시된 리포트\n"
+                return format_context_report(job_title, company_name, experience_level, cached, note), cached, None
+        
+        # 프롬프트 생성
+        prompt = prompt_template.format(
+            job_title=job_title,
+            company_name=company_name,
+            experience_level=experience_level
+        )
+        
+        if research:
+            # 공유 조사 자료 사용 (웹 검색 없음)
+            tools = []
+            instruction = f"당신은 자기소개서 작성을 위한 기업 및 직무 분석 전문가입니다. 아래 조사 자료를 근거로 정확한 JSON 형식으로 구조화된 정보를 제공해주세요.\n\n[조사 자료]\n{research}"
+        else:
+            # search_context_size는 회사 조사 이력에 따라 선택 (명시값 우선)
+            if search_context_size:
+                size_reason = "explicit"
+            else:
+                search_context_size, size_reason = choose_search_context_size("context_report", company_name)
+            tools = [{
+                "type": "web_search_preview",
+                "search_context_size": search_context_size,
+            }]
+            instruction = "당신은 자기소개서 작성을 위한 기업 및 직무 분석 전문가입니다. 웹 검색을 통해 최신 기업 정보와 산업 동향을 확인하고 정확한 JSON 형식으로 구조화된 정보를 제공해주세요."
+        
+        # OpenAI Responses API 호출 (Web Search Preview 사용)
+        start_time = time.time()
+        try:
+            response = client.responses.create(
+                model="gpt-4o",
+                tools=tools,
+                input=f"{instruction}\n\n{prompt}"
+            )
+        except Exception:
+            # 실패한 호출도 기록 (성공률 집계)
+            if not research:
+                record_search_call("context_report", company_name, search_context_size, size_reason,
+                                   time.time() - start_time, None, "gpt-4o", success=False)
+            raise
+        latency = time.time() - start_time
+        
+        content = response.output_text
+        print(f"=== AI 응답 원본 ===")
+        import pprint
+        pp = pprint.PrettyPrinter(indent=2)
+        pp.pprint(content)
+        print(f"=== 전체 응답 객체 ===")
+        print(response)
+        
+        # 웹 검색 참고 링크 출력
+        if hasattr(response, 'web_search_results') and response.web_search_results:
+            print(f"=== 참고한 웹 검색 링크 ===")
+            for i, result in enumerate(response.web_search_results, 1):
+                if hasattr(result, 'url'):
+                    print(f"{i}. {result.url}")
+                elif hasattr(result, 'link'):
+                    print(f"{i}. {result.link}")
+        
+        print(f"=== AI 응답 끝 ===")
+        
+        report_data, raw_content = parse_context_report(content)
+        is_valid = bool(report_data) and 'company_profile' in report_data and report_data['company_profile'].get('name') not in FAILED_PROFILE_NAMES
+        if not research:
+            record_search_call("context_report", company_name, search_context_size, size_reason,
+                               latency, response, "gpt-4o", success=is_valid)
+        
+        if not report_data or 'company_profile' not in report_data:
+            return "컨텍스트 리포트 생성에 실패했습니다. 다시 시도해주세요.", {}
+        
+        # 파싱에 성공한 리포트만 응답 캐시에 저장
+        profile_name = report_data['company_profile'].get('name')
+        if profile_name not in FAILED_PROFILE_NAMES:
+            get_cache().set(CACHE_NAMESPACE, make_cache_key(company_key(company_name), job_title, experience_level), report_data)
+            # 리포트가 쓴 회사명 / 정식 명칭을 별칭으로 등록
+            if profile_name:
+                learn_alias(profile_name, company_name)
+            learn_aliases_from_text(company_name, raw_content or content)
+        
+        # 결과 포맷팅
+        result = format_context_report(job_title, company_name, experience_level, report_data)
         
         return result, report_data, raw_content
         
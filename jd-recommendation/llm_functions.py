@@ -1,11 +1,18 @@
 import os
+import sys
 import json
 import re
 import yaml
-from openai import OpenAI
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 프로젝트 루트를 path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from llm_gateway import create_client
+
+# OpenAI 클라이언트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 프롬프트 템플릿 로드
 import os
@@ -53,9 +60,11 @@ def parse_jd_recommendation(content):
         print(f"파싱 실패한 컨텐츠: {repr(content)}")
         return f"파싱 오류: {str(e)}"
 
-def generate_jd_recommendation(job_title, company_name, experience_level):
+def generate_jd_recommendation(job_title, company_name, experience_level, research=None):
     """
     OpenAI API를 사용하여 직무기술서를 생성하는 함수
+
+    research(미리 조사한 회사 자료)가 주어지면 프롬프트에 참고 자료로 덧붙입니다.
     """
     try:
         if not job_title or not company_name or not experience_level:
@@ -67,6 +76,8 @@ def generate_jd_recommendation(job_title, company_name, experience_level):
             company_name=company_name,
             experience_level=experience_level
         )
+        if research:
+            prompt += f"\n\n아래 조사 자료의 회사 사업/직무 정보를 반영하세요.\n\n[조사 자료]\n{research}"
         
         # OpenAI API 호출
         response = client.chat.completions.create(
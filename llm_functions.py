@@ -1,10 +1,10 @@
-from openai import OpenAI
 import yaml
 import os
 import json
+from llm_gateway import create_client
 
-# 클라이언트 및 프롬프트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 클라이언트 및 프롬프트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -19,7 +19,7 @@ except Exception as e:
         "CoverLetter": "Write a cover letter based on the conversation."
     }
 
-def get_interviewer_response(example_info):
+def get_interviewer_response(example_info, cancel_key=None):
     """
     진행률(progress)을 포함한 면접관의 응답을 스트리밍으로 생성합니다.
     """
@@ -38,12 +38,17 @@ def get_interviewer_response(example_info):
     response_stream = client.chat.completions.create(
         model="gpt-4.1",
         messages=conversation,
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
-    for chunk in response_stream:
-        yield chunk.choices[0].delta.content or ""
+    # 소비하던 쪽이 생성기를 닫으면(사용자 취소) 남은 응답을 받지 않고 연결을 닫습니다.
+    try:
+        for chunk in response_stream:
+            yield chunk.choices[0].delta.content or ""
+    finally:
+        response_stream.close()
 
-def get_student_response(example_info):
+def get_student_response(example_info, cancel_key=None):
     """학생의 AI 답변을 스트리밍으로 생성합니다."""
     system_prompt = prompts.get("Student", "").format(**example_info)
     
@@ -59,12 +64,17 @@ def get_student_response(example_info):
     response_stream = client.chat.completions.create(
         model="gpt-4o",
         messages=conversation,
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
-    for chunk in response_stream:
-        yield chunk.choices[0].delta.content or ""
+    # 소비하던 쪽이 생성기를 닫으면(사용자 취소) 남은 응답을 받지 않고 연결을 닫습니다.
+    try:
+        for chunk in response_stream:
+            yield chunk.choices[0].delta.content or ""
+    finally:
+        response_stream.close()
 
-def generate_cover_letter_response(question, conversation_history, example_info, flow, word_limit):
+def generate_cover_letter_response(question, conversation_history, example_info, flow, word_limit, cancel_key=None):
     """
     진행률을 포함하여 자기소개서 답변을 스트리밍으로 생성합니다.
     """
@@ -82,7 +92,12 @@ def generate_cover_letter_response(question, conversation_history, example_info,
     response_stream = client.chat.completions.create(
         model="gpt-4o",
         messages=[{"role": "user", "content": prompt}],
-        stream=True
+        stream=True,
+        cancel_key=cancel_key
     )
-    for chunk in response_stream:
-        yield chunk.choices[0].delta.content or "" 
\ No newline at end of file
+    # 소비하던 쪽이 생성기를 닫으면(사용자 취소) 남은 응답을 받지 않고 연결을 닫습니다.
+    try:
+        for chunk in response_stream:
+            yield chunk.choices[0].delta.content or ""
+    finally:
+        response_stream.close() 
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+OpenAI 클라이언트 게이트웨이
+
+각 모듈의 `client = OpenAI(...)`를 `client = create_client(...)`로 바꾸면
+chat.completions.create / responses.create 호출이 모두 이 게이트웨이를 거칩니다.
+호출 전에 모델별 레이트 리미터에서 요청/토큰을 확보하고, 응답 후 실제 사용량으로 보정합니다.
+일시적인 오류는 llm_policy의 재시도/백오프/서킷 브레이커 정책에 따라 처리됩니다.
+스트리밍 호출에 cancel_key를 주면 cancel_streams(cancel_key)로 다른 스레드에서도 연결을 끊을 수 있습니다.
+low_priority() 블록 안의 호출은 버킷 일부를 남겨두고 보내므로 캐시 예열 같은 백그라운드 작업이 사용자 요청의 한도를 잠식하지 않습니다.
+나머지 속성은 원본 OpenAI 클라이언트로 그대로 위임합니다.
+"""
+
+import os
+import sys
+import json
+import threading
+from contextlib import contextmanager
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from openai import OpenAI
+from rate_limiter import get_limiter, estimate_tokens
+from llm_policy import call_with_policy, PolicyStream, record_metric
+from utils import track_api_cost
+
+_usage_local = threading.local()
+_priority_local = threading.local()
+
+# low_priority() 호출이 남겨두는 레이트 리미터 버킷 비율 (0~1)
+LOW_PRIORITY_RESERVE = float(os.getenv("LLM_LOW_PRIORITY_RESERVE", "0.3"))
+
+# cancel_key -> 열려 있는 스트림 목록 (사용자가 초기화하거나 탭을 닫으면 한 번에 닫음)
+_open_streams = {}
+_open_streams_lock = threading.Lock()
+
+
+class StreamCancelledError(Exception):
+    """사용자가 생성을 취소해 스트림을 중간에 닫은 경우"""
+
+
+@contextmanager
+def track_usage():
+    """
+    with 블록 안에서 현재 스레드가 보낸 호출 수, 토큰, 비용(USD)을 모읍니다.
+    스트리밍 호출은 사용량 정보가 없으므로 호출 수만 셉니다.
+    """
+    usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+    previous = getattr(_usage_local, "usage", None)
+    _usage_local.usage = usage
+    try:
+        yield usage
+    finally:
+        _usage_local.usage = previous
+
+
+@contextmanager
+def low_priority(reserve=None):
+    """
+    with 블록 안에서 현재 스레드가 보내는 호출은 요청/토큰 버킷의 reserve 비율이 남아 있을 때만 나갑니다.
+    (버킷이 그 아래로 내려가면 사용자 요청이 먼저 쓰도록 기다립니다.)
+    """
+    previous = getattr(_priority_local, "reserve", 0.0)
+    _priority_local.reserve = min(0.9, max(0.0, LOW_PRIORITY_RESERVE if reserve is None else reserve))
+    try:
+        yield
+    finally:
+        _priority_local.reserve = previous
+
+
+def _search_context_size(kwargs):
+    for tool in kwargs.get("tools") or []:
+        if isinstance(tool, dict) and tool.get("type", "").startswith("web_search"):
+            return tool.get("search_context_size", "medium")
+    return None
+
+
+def _record_usage(kwargs, response=None):
+    usage = getattr(_usage_local, "usage", None)
+    if usage is None:
+        return
+    usage["calls"] += 1
+    if response is None:
+        return
+    tokens = getattr(response, "usage", None)
+    usage["input_tokens"] += getattr(tokens, "prompt_tokens", None) or getattr(tokens, "input_tokens", 0) or 0
+    usage["output_tokens"] += getattr(tokens, "completion_tokens", None) or getattr(tokens, "output_tokens", 0) or 0
+    usage["cost"] += track_api_cost(response, kwargs.get("model"), _search_context_size(kwargs))
+
+
+def _request_text(kwargs):
+    """
+    요청 인자에서 토큰 추정에 쓸 입력 텍스트를 뽑습니다.
+    """
+    if "messages" in kwargs:
+        return "".join(str(message.get("content", "")) for message in kwargs["messages"])
+    request_input = kwargs.get("input", "")
+    if isinstance(request_input, str):
+        return request_input
+    return json.dumps(request_input, ensure_ascii=False, default=str)
+
+
+def _usage_tokens(response):
+    """
+    응답의 총 사용 토큰 수 (Chat Completions / Responses API 모두 지원). 알 수 없으면 None.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    total = getattr(usage, "total_tokens", None)
+    if total is not None:
+        return total
+    return (getattr(usage, "input_tokens", 0) or 0) + (getattr(usage, "output_tokens", 0) or 0)
+
+
+def _chunk_text(chunk):
+    choices = getattr(chunk, "choices", None)
+    if choices:
+        return getattr(choices[0].delta, "content", None) or ""
+    return getattr(chunk, "delta", "") if isinstance(getattr(chunk, "delta", None), str) else ""
+
+
+class _RateLimitedStream:
+    """
+    스트리밍 응답을 감싸서, 끝까지 읽은 뒤 받은 텍스트 길이로 토큰 사용량을 보정합니다.
+
+    끝까지 읽기 전에 close()되거나(취소) 소비하던 생성기가 닫히면 HTTP 응답을 바로 닫고,
+    중단된 스트림 수와 그때까지 받은 출력 토큰(aborted_received_tokens)을 모델별 메트릭에 기록합니다.
+    호출에 출력 토큰 상한(max_tokens)이 있으면 상한에서 받은 토큰을 뺀 값을 절약 토큰의 상한 추정치
+    (saved_tokens_upper_bound)로 함께 기록합니다. 상한이 없으면 모델이 얼마나 더 썼을지 알 수 없으므로 기록하지 않습니다.
+    """
+
+    def __init__(self, stream, model, limiter, estimated, prompt_tokens, output_cap, cancel_key=None):
+        self._stream = stream
+        self._model = model
+        self._limiter = limiter
+        self._estimated = estimated
+        self._prompt_tokens = prompt_tokens
+        self._output_cap = output_cap
+        self._cancel_key = cancel_key
+        self._received_chars = 0
+        self._finished = False
+        self._failed = False
+        self._cancelled = False
+        self._close_lock = threading.Lock()
+        if cancel_key is not None:
+            with _open_streams_lock:
+                _open_streams.setdefault(cancel_key, []).append(self)
+
+    def __iter__(self):
+        try:
+            for chunk in self._stream:
+                self._received_chars += len(_chunk_text(chunk))
+                yield chunk
+            if self._cancelled:
+                # 닫힌 응답이 오류 없이 끝나는 경우에도 취소로 처리합니다.
+                raise StreamCancelledError("사용자가 생성을 취소했습니다.")
+            self._finished = True
+        except StreamCancelledError:
+            raise
+        except Exception as e:
+            # 다른 스레드에서 연결을 닫으면 읽던 쪽에서는 네트워크 오류로 보입니다.
+            if self._cancelled:
+                raise StreamCancelledError("사용자가 생성을 취소했습니다.") from e
+            self._failed = True
+            raise
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        스트림을 닫습니다. 끝까지 읽지 않은 상태면 중단으로 기록합니다. (여러 번 불러도 한 번만 처리)
+        """
+        with self._close_lock:
+            if self._limiter is None:
+                return
+            limiter, self._limiter = self._limiter, None
+        received_tokens = self._received_chars // 2
+        limiter.settle(self._estimated, self._prompt_tokens + received_tokens)
+        if self._cancel_key is not None:
+            with _open_streams_lock:
+                streams = _open_streams.get(self._cancel_key, [])
+                if self in streams:
+                    streams.remove(self)
+                if not streams:
+                    _open_streams.pop(self._cancel_key, None)
+        if self._finished:
+            return
+        self._cancelled = True
+        if not self._failed:
+            record_metric(self._model, "aborted_streams")
+            record_metric(self._model, "aborted_received_tokens", received_tokens)
+            if self._output_cap:
+                record_metric(self._model, "saved_tokens_upper_bound", max(0, self._output_cap - received_tokens))
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _Endpoint:
+    """
+    create(**kwargs) 호출을 레이트 리미터와 재시도 정책으로 감싸는 엔드포인트 래퍼
+    """
+
+    def __init__(self, endpoint):
+        self._endpoint = endpoint
+
+    def create(self, cancel_key=None, **kwargs):
+        model = kwargs.get("model", "default")
+        limiter = get_limiter(model)
+        output_cap = kwargs.get("max_tokens") or kwargs.get("max_output_tokens")
+        max_output = output_cap or 1000
+        text = _request_text(kwargs)
+        estimated = estimate_tokens(text, max_output)
+        reserve = getattr(_priority_local, "reserve", 0.0)
+
+        def attempt():
+            limiter.acquire(estimated, reserve)
+            try:
+                return self._endpoint.create(**kwargs)
+            except Exception:
+                # 실패한 요청은 토큰을 쓰지 않았으므로 버킷에 돌려줍니다.
+                limiter.settle(estimated, 0)
+                raise
+
+        response = call_with_policy(model, attempt)
+        if kwargs.get("stream"):
+            def reopen():
+                # 첫 청크 전에 끊긴 스트림은 토큰을 쓰지 않은 것으로 보고 다시 엽니다.
+                limiter.settle(estimated, 0)
+                return attempt()
+
+            _record_usage(kwargs)
+            stream = PolicyStream(model, response, reopen)
+            return _RateLimitedStream(stream, model, limiter, estimated, len(text) // 2, output_cap, cancel_key)
+        actual = _usage_tokens(response)
+        if actual is not None:
+            limiter.settle(estimated, actual)
+        _record_usage(kwargs, response)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._endpoint, name)
+
+
+class _Chat:
+    def __init__(self, chat):
+        self._chat = chat
+        self.completions = _Endpoint(chat.completions)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class GatewayClient:
+    """
+    OpenAI 클라이언트와 같은 인터페이스를 제공하는 레이트 리밋 적용 클라이언트
+    """
+
+    def __init__(self, **client_kwargs):
+        # 재시도는 llm_policy가 담당합니다. SDK 자체 재시도(기본 2회)가 겹치면 429 한 번이 수십 번의 요청이 되고
+        # 일시적 실패가 브레이커/메트릭에 보이지 않으므로 호출하는 쪽이 따로 지정하지 않으면 끕니다.
+        client_kwargs.setdefault("max_retries", 0)
+        self._client = OpenAI(**client_kwargs)
+        self.chat = _Chat(self._client.chat)
+        self.responses = _Endpoint(self._client.responses)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def cancel_streams(cancel_key):
+    """
+    cancel_key로 열린 스트림을 모두 닫고, 닫은 개수를 반환합니다. (Gradio 취소/세션 종료 시 호출)
+    """
+    with _open_streams_lock:
+        streams = list(_open_streams.get(cancel_key, []))
+    for stream in streams:
+        stream.close()
+    return len(streams)
+
+
+def create_client(**client_kwargs):
+    """
+    OpenAI(**client_kwargs) 대신 사용하는 게이트웨이 클라이언트 생성 함수
+    """
+    return GatewayClient(**client_kwargs)
@@ -0,0 +1,285 @@
+"""
+LLM 호출 재시도 / 백오프 / 서킷 브레이커 정책
+
+llm_gateway의 모든 create 호출은 call_with_policy()를 거칩니다.
+- 예외 클래스별 재시도 횟수 (RateLimitError, APITimeoutError, APIConnectionError, 5xx 등)
+- 지수 백오프 + full jitter, 응답에 Retry-After / retry-after-ms 헤더가 있으면 그 값을 우선 사용
+- 모델별 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 동안 호출 없이 바로 실패(CircuitOpenError)
+- 모델별 호출/성공/실패/재시도/차단 횟수 메트릭 (get_metrics())
+
+스트리밍 호출은 첫 청크를 받기 전까지만 재시도합니다. 이미 일부를 사용자에게 보낸 뒤의
+오류는 중복 출력이 생기지 않도록 그대로 올려보냅니다.
+"""
+
+import os
+import time
+import random
+import threading
+from collections import defaultdict
+
+# 예외 클래스 이름 -> 최대 재시도 횟수 (MRO를 따라 가장 먼저 일치하는 이름 사용)
+RETRY_POLICIES = {
+    "RateLimitError": 5,
+    "APITimeoutError": 3,
+    "APIConnectionError": 3,
+    "InternalServerError": 3,
+    "ConnectionError": 3,
+    "TimeoutError": 3,
+}
+# 위에 없는 APIStatusError 중 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+STATUS_RETRIES = 3
+
+BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX", "30"))
+
+# 연속 실패 BREAKER_THRESHOLD회 -> BREAKER_COOLDOWN_SECONDS 동안 차단, 이후 한 번 시험 호출(half-open)
+BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+
+class CircuitOpenError(Exception):
+    """모델의 서킷 브레이커가 열려 있어 호출하지 않고 실패한 경우"""
+
+    def __init__(self, model, retry_in):
+        super().__init__(f"{model} 호출이 일시 중단되었습니다 (상위 서비스 장애, {retry_in:.0f}초 후 재시도)")
+        self.model = model
+        self.retry_in = retry_in
+
+
+def max_retries_for(error):
+    """
+    예외에 대해 허용되는 최대 재시도 횟수. 재시도하지 않는 예외는 0.
+    """
+    for cls in type(error).__mro__:
+        if cls.__name__ in RETRY_POLICIES:
+            return RETRY_POLICIES[cls.__name__]
+    status = getattr(error, "status_code", None)
+    if status in RETRYABLE_STATUS_CODES:
+        return STATUS_RETRIES
+    return 0
+
+
+def retry_after_seconds(error):
+    """
+    예외의 응답 헤더에서 Retry-After(초) 또는 retry-after-ms 값을 읽습니다. 없으면 None.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def backoff_delay(attempt, error=None):
+    """
+    attempt번째(0부터) 재시도 전 대기 시간. Retry-After가 있으면 그 값을, 없으면 full jitter 지수 백오프.
+    """
+    hinted = retry_after_seconds(error) if error is not None else None
+    if hinted is not None:
+        return min(hinted, BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    모델 하나의 서킷 브레이커 (closed -> open -> half_open -> closed)
+    """
+
+    def __init__(self, model, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN_SECONDS):
+        self.model = model
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        호출 가능 여부를 확인합니다. 차단 중이면 CircuitOpenError를 발생시킵니다.
+        """
+        with self._lock:
+            if self.state == "open":
+                remaining = self.opened_at + self.cooldown - time.time()
+                if remaining > 0:
+                    raise CircuitOpenError(self.model, remaining)
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open":
+                if self._trial_in_flight:
+                    raise CircuitOpenError(self.model, self.cooldown)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """
+        장애로 보지 않는 실패가 났을 때 half-open 시험 호출 자리만 돌려줍니다. (다음 호출이 다시 시험 호출)
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """
+        실패를 기록합니다. 이번 실패로 브레이커가 열렸으면 True.
+        """
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.threshold:
+                opened = self.state != "open"
+                self.state = "open"
+                self.opened_at = time.time()
+                return opened
+            return False
+
+
+_breakers = {}
+_metrics = defaultdict(lambda: defaultdict(int))
+_state_lock = threading.Lock()
+
+
+def get_breaker(model):
+    with _state_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker(model)
+        return _breakers[model]
+
+
+def _count(model, name, amount=1):
+    with _state_lock:
+        _metrics[model][name] += amount
+
+
+def record_metric(model, name, amount=1):
+    """
+    정책 밖(게이트웨이 등)에서 생긴 이벤트를 같은 모델별 메트릭에 기록합니다.
+    """
+    _count(model, name, amount)
+
+
+def get_metrics():
+    """
+    모델별 메트릭 스냅샷: calls, successes, failures, retries, circuit_rejections, circuit_opens,
+    error:<예외 클래스> 횟수, 중단된 스트림(aborted_streams / aborted_received_tokens / saved_tokens_upper_bound)과 현재 브레이커 상태
+    """
+    with _state_lock:
+        snapshot = {model: dict(counters) for model, counters in _metrics.items()}
+        for model, breaker in _breakers.items():
+            snapshot.setdefault(model, {})["breaker_state"] = breaker.state
+    return snapshot
+
+
+def reset_metrics():
+    with _state_lock:
+        _metrics.clear()
+
+
+def _handle_failure(model, breaker, error, attempt):
+    """
+    실패를 기록하고, 재시도할 수 있으면 대기 시간을, 아니면 None을 반환합니다.
+    """
+    _count(model, f"error:{type(error).__name__}")
+    retries = max_retries_for(error)
+    # 재시도 대상(일시적 장애)만 브레이커 실패로 셉니다. 잘못된 요청(4xx)은 모델 장애가 아닙니다.
+    if retries:
+        if breaker.record_failure():
+            _count(model, "circuit_opens")
+    elif getattr(error, "status_code", None) is not None:
+        # 상위 서비스가 응답은 했으므로 정상으로 봅니다. (half-open 시험 호출이면 브레이커를 닫음)
+        breaker.record_success()
+    else:
+        # 요청 전 로컬 오류 등: 상태는 그대로 두고 시험 호출 자리만 돌려줍니다.
+        breaker.release_trial()
+    if attempt >= retries or breaker.state == "open":
+        _count(model, "failures")
+        return None
+    _count(model, "retries")
+    return backoff_delay(attempt, error)
+
+
+def call_with_policy(model, func):
+    """
+    func()를 모델의 재시도/서킷 브레이커 정책으로 실행합니다.
+    """
+    breaker = get_breaker(model)
+    attempt = 0
+    while True:
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            _count(model, "circuit_rejections")
+            raise
+        _count(model, "calls")
+        try:
+            result = func()
+        except Exception as e:
+            delay = _handle_failure(model, breaker, e, attempt)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        _count(model, "successes")
+        return result
+
+
+class PolicyStream:
+    """
+    스트리밍 응답 래퍼. 첫 청크를 받기 전에 실패하면 open_stream()으로 다시 열어 재시도하고,
+    첫 청크 이후의 오류는 그대로 전달합니다.
+    """
+
+    def __init__(self, model, stream, open_stream):
+        self._model = model
+        self._stream = stream
+        self._open_stream = open_stream
+        self._closed = False
+
+    def __iter__(self):
+        breaker = get_breaker(self._model)
+        attempt = 0
+        started = False
+        while True:
+            try:
+                for chunk in self._stream:
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if self._closed:
+                    # 취소로 닫힌 스트림은 실패로 세지 않고, 다시 열지도 않습니다.
+                    raise
+                if started:
+                    _count(self._model, f"error:{type(e).__name__}")
+                    _count(self._model, "failures")
+                    raise
+                delay = _handle_failure(self._model, breaker, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                self._stream = call_with_policy(self._model, self._open_stream)
+
+    def close(self):
+        self._closed = True
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            close()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
@@ -0,0 +1,346 @@
+"""
+Gradio 앱 부하 테스트
+
+gradio_client로 실제 Gradio 엔드포인트를 호출하는 가상 사용자 N명을 띄워
+시나리오(journey)를 반복 실행하고, 호출별 큐 대기 시간 / 첫 출력까지 시간(TTFT) / 완료 지연을
+히스토그램으로, 서버 프로세스의 CPU / RSS를 시간별로 보여줍니다.
+
+시나리오:
+    analysis  (main.py)  예제 회사/직무 선택 → 산업 분류 / 기업 규모 / 컨텍스트 리포트 중 하나 실행
+    chat      (app.py)   가이드 생성 → AI 답변 10턴 → 자기소개서 생성
+
+사용법:
+    # 모의 LLM 서버와 앱을 직접 띄워서 측정
+    python loadtest.py --journey chat --users 20 --launch-mock
+    # 이미 떠 있는 앱을 측정 (서버 PID를 주면 CPU/RSS도 기록)
+    python loadtest.py --journey analysis --url http://127.0.0.1:7860 --server-pid 12345
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from gradio_client import Client
+from rate_limiter import DEFAULT_LIMITS
+
+try:
+    import psutil
+except ImportError:  # /proc에서 직접 읽음 (Linux)
+    psutil = None
+
+RESULTS_DIR = os.path.join(project_root, "loadtest_results")
+
+EXAMPLE_COMPANIES = ["삼성전자", "토스", "카카오", "네이버", "LG전자", "현대자동차", "쿠팡", "신한은행"]
+EXAMPLE_JOBS = ["백엔드 개발", "데이터 사이언티스트", "마케팅", "기획", "해외영업"]
+CHAT_TURNS = 10
+# --launch-mock 실행에서는 모의 서버만 호출하므로 레이트 리미터가 측정을 막지 않도록 한도를 크게 둡니다.
+LOADTEST_RATE_LIMIT = {"rpm": 1000000, "tpm": 1000000000}
+
+# 히스토그램 구간 경계(초)
+HISTOGRAM_BOUNDS = [0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120]
+
+
+class Metrics:
+    """
+    엔드포인트별 (queue_wait, ttft, latency) 측정값 모음
+    """
+
+    def __init__(self):
+        self.samples = []
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, queue_wait, ttft, latency):
+        with self._lock:
+            self.samples.append({"endpoint": endpoint, "queue_wait": queue_wait, "ttft": ttft, "latency": latency})
+
+    def error(self, endpoint, message):
+        with self._lock:
+            self.errors.append({"endpoint": endpoint, "error": message, "time": time.time()})
+
+
+def _status_name(job):
+    try:
+        return job.status().code.name
+    except Exception:
+        return ""
+
+
+def timed_call(client, metrics, api_name, *args, poll_interval=0.02):
+    """
+    submit 후 상태를 폴링해 큐 대기(PROCESSING 진입까지), TTFT(첫 출력까지), 완료 지연을 기록합니다.
+    """
+    start = time.perf_counter()
+    queue_wait = ttft = None
+    try:
+        job = client.submit(*args, api_name=api_name)
+        while not job.done():
+            now = time.perf_counter() - start
+            if queue_wait is None and _status_name(job) in ("PROCESSING", "ITERATING", "PROGRESS"):
+                queue_wait = now
+            if ttft is None and job.outputs():
+                ttft = now
+            time.sleep(poll_interval)
+        result = job.result()
+    except Exception as e:
+        metrics.error(api_name, str(e))
+        return None
+    latency = time.perf_counter() - start
+    metrics.add(api_name, queue_wait if queue_wait is not None else 0.0,
+                ttft if ttft is not None else latency, latency)
+    return result
+
+
+# --- 시나리오 ---
+
+def journey_analysis(client, metrics, rng):
+    company, job = rng.choice(EXAMPLE_COMPANIES), rng.choice(EXAMPLE_JOBS)
+    target = rng.choice(["industry", "company_size", "context_report"])
+    if target == "industry":
+        timed_call(client, metrics, "/classify_industry", job, company)
+    elif target == "company_size":
+        timed_call(client, metrics, "/analyze_company_size", company)
+    else:
+        timed_call(client, metrics, "/generate_context_report", job, company, "신입")
+
+
+def journey_chat(client, metrics, rng):
+    company, job = rng.choice(EXAMPLE_COMPANIES), rng.choice(EXAMPLE_JOBS)
+    # 세션 ID를 직접 정해 보내므로 여러 워커 뒤에서도 같은 세션이 이어집니다.
+    session_id = uuid.uuid4().hex
+    timed_call(client, metrics, "/generate_guide",
+               company, job, f"{job} 업무를 담당합니다.", "지원 동기와 입사 후 포부를 기술하시오.", 300, session_id)
+    for _ in range(CHAT_TURNS):
+        if timed_call(client, metrics, "/ai_reply", session_id) is None:
+            return
+    timed_call(client, metrics, "/generate_cover_letters", session_id)
+
+
+JOURNEYS = {
+    "analysis": ("main.py", journey_analysis),
+    "chat": ("app.py", journey_chat),
+}
+
+
+# --- 서버 자원 샘플링 ---
+
+def _proc_sample(pid, state):
+    """
+    (cpu_percent, rss_mb). psutil이 없으면 /proc/<pid>/stat, status를 읽습니다.
+    """
+    if psutil is not None:
+        process = state.setdefault("process", psutil.Process(pid))
+        return process.cpu_percent(interval=None), process.memory_info().rss / 1024 / 1024
+    with open(f"/proc/{pid}/stat", "r") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    cpu_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    now = time.time()
+    previous = state.get("previous")
+    state["previous"] = (cpu_ticks, now)
+    cpu = 0.0
+    if previous:
+        cpu = 100.0 * (cpu_ticks - previous[0]) / os.sysconf("SC_CLK_TCK") / max(now - previous[1], 1e-6)
+    rss_kb = 0
+    with open(f"/proc/{pid}/status", "r") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                rss_kb = int(line.split()[1])
+    return cpu, rss_kb / 1024
+
+
+def sample_resources(pid, stop_event, samples, interval=1.0):
+    state = {}
+    start = time.time()
+    while not stop_event.is_set():
+        try:
+            cpu, rss = _proc_sample(pid, state)
+            samples.append({"t": round(time.time() - start, 1), "cpu": cpu, "rss_mb": rss})
+        except (OSError, ValueError):
+            break
+        stop_event.wait(interval)
+
+
+# --- 보고 ---
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered))) - 1))]
+
+
+def histogram(values):
+    counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+    for value in values:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS) if value <= bound), len(HISTOGRAM_BOUNDS))
+        counts[index] += 1
+    return counts
+
+
+def print_histogram(title, values, width=40):
+    if not values:
+        return
+    counts = histogram(values)
+    peak = max(counts) or 1
+    print(f"  {title}: p50 {percentile(values, 50):.2f}s | p95 {percentile(values, 95):.2f}s | "
+          f"p99 {percentile(values, 99):.2f}s | max {max(values):.2f}s")
+    labels = [f"≤{b}s" for b in HISTOGRAM_BOUNDS] + [f">{HISTOGRAM_BOUNDS[-1]}s"]
+    for label, count in zip(labels, counts):
+        if count:
+            print(f"    {label:>7} {'█' * max(1, count * width // peak)} {count}")
+
+
+def report(metrics, resources, elapsed):
+    endpoints = sorted({s["endpoint"] for s in metrics.samples})
+    print("=" * 70)
+    print(f"📊 {len(metrics.samples)}회 호출, 오류 {len(metrics.errors)}회, {elapsed:.1f}초 "
+          f"({len(metrics.samples) / max(elapsed, 1e-6):.2f} req/s)")
+    for endpoint in endpoints:
+        samples = [s for s in metrics.samples if s["endpoint"] == endpoint]
+        print(f"\n🔹 {endpoint} ({len(samples)}회)")
+        print_histogram("큐 대기", [s["queue_wait"] for s in samples])
+        print_histogram("TTFT", [s["ttft"] for s in samples])
+        print_histogram("완료", [s["latency"] for s in samples])
+    if resources:
+        print("\n🖥️  서버 자원 (시간별)")
+        step = max(1, len(resources) // 20)
+        for sample in resources[::step]:
+            print(f"  t={sample['t']:>6.1f}s  CPU {sample['cpu']:6.1f}%  RSS {sample['rss_mb']:8.1f}MB")
+        print(f"  최대 CPU {max(s['cpu'] for s in resources):.1f}% | 최대 RSS {max(s['rss_mb'] for s in resources):.1f}MB")
+    for error in metrics.errors[:10]:
+        print(f"  ❌ {error['endpoint']}: {error['error']}")
+
+
+# --- 실행 ---
+
+def _wait_for(url, timeout=120):
+    import urllib.request
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=2)
+            return True
+        except Exception:
+            time.sleep(1)
+    return False
+
+
+def launch_servers(app_file, port, mock_port, mock_args):
+    """
+    모의 LLM 서버와 Gradio 앱을 띄웁니다. (processes, app_pid, state_dir)
+
+    응답 캐시 / 레이트 리미터 버킷 / 세션 저장소는 실행마다 새 임시 디렉터리(state_dir)에 두므로
+    이전 실행의 캐시 적중이나 실제 운영의 레이트 리미터 상태가 측정에 섞이지 않습니다.
+    """
+    processes = []
+    state_dir = tempfile.mkdtemp(prefix="loadtest_")
+    mock = subprocess.Popen([sys.executable, os.path.join(project_root, "mock_llm_server.py"),
+                             "--port", str(mock_port)] + mock_args, cwd=project_root)
+    processes.append(mock)
+    env = dict(os.environ,
+               OPENAI_BASE_URL=f"http://127.0.0.1:{mock_port}/v1",
+               OPENAI_API_KEY=os.getenv("OPENAI_API_KEY", "mock"),
+               GRADIO_SERVER_PORT=str(port),
+               GRADIO_SHARE="0",
+               JASOSEO_CACHE_PATH=os.path.join(state_dir, "cache.sqlite3"),
+               JASOSEO_SESSION_PATH=os.path.join(state_dir, "sessions.sqlite3"),
+               JASOSEO_RATE_LIMIT_DIR=os.path.join(state_dir, "ratelimit"),
+               JASOSEO_RATE_LIMITS=json.dumps({model: LOADTEST_RATE_LIMIT for model in DEFAULT_LIMITS}))
+    app = subprocess.Popen([sys.executable, os.path.join(project_root, app_file)], cwd=project_root, env=env)
+    processes.append(app)
+    if not _wait_for(f"http://127.0.0.1:{port}/"):
+        raise RuntimeError(f"{app_file}가 {port} 포트에서 시작되지 않았습니다.")
+    return processes, app.pid, state_dir
+
+
+def run_users(url, journey, users, duration, iterations, ramp, metrics):
+    stop_at = time.time() + duration if duration else None
+
+    def user(index):
+        time.sleep(ramp * index / max(users, 1))
+        rng = random.Random(index)
+        client = Client(url, verbose=False)
+        done = 0
+        while (iterations is None or done < iterations) and (stop_at is None or time.time() < stop_at):
+            journey(client, metrics, rng)
+            done += 1
+
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gradio 앱 부하 테스트")
+    parser.add_argument("--journey", choices=list(JOURNEYS), default="analysis")
+    parser.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("--iterations", type=int, default=1, help="사용자별 시나리오 반복 횟수 (--duration과 함께 쓰면 먼저 도달하는 쪽)")
+    parser.add_argument("--duration", type=float, default=None, help="최대 실행 시간(초)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="사용자를 모두 띄우는 데 걸리는 시간(초)")
+    parser.add_argument("--url", help="이미 실행 중인 앱 주소")
+    parser.add_argument("--server-pid", type=int, help="CPU/RSS를 측정할 서버 PID")
+    parser.add_argument("--launch-mock", action="store_true", help="모의 LLM 서버와 앱을 직접 실행")
+    parser.add_argument("--port", type=int, default=7861, help="--launch-mock 시 앱 포트")
+    parser.add_argument("--mock-port", type=int, default=8900)
+    parser.add_argument("--mock-args", default="", help="mock_llm_server.py에 넘길 인자 (예: \"--ttft 0.8\")")
+    args = parser.parse_args()
+
+    app_file, journey = JOURNEYS[args.journey]
+    processes, state_dir = [], None
+    url, server_pid = args.url, args.server_pid
+    if args.launch_mock:
+        processes, server_pid, state_dir = launch_servers(app_file, args.port, args.mock_port, args.mock_args.split())
+        url = f"http://127.0.0.1:{args.port}/"
+    if not url:
+        parser.error("--url 또는 --launch-mock이 필요합니다.")
+
+    metrics = Metrics()
+    resources = []
+    stop_event = threading.Event()
+    sampler = None
+    if server_pid:
+        sampler = threading.Thread(target=sample_resources, args=(server_pid, stop_event, resources), daemon=True)
+        sampler.start()
+
+    print(f"🚀 {args.journey} 시나리오: 사용자 {args.users}명 -> {url}")
+    start = time.time()
+    try:
+        run_users(url, journey, args.users, args.duration, args.iterations, args.ramp, metrics)
+    finally:
+        elapsed = time.time() - start
+        stop_event.set()
+        if sampler:
+            sampler.join(timeout=2)
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+        if state_dir:
+            shutil.rmtree(state_dir, ignore_errors=True)
+
+    report(metrics, resources, elapsed)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"loadtest_{args.journey}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({"args": vars(args), "elapsed": elapsed, "samples": metrics.samples,
+                   "errors": metrics.errors, "resources": resources}, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {result_path}")
+
+
+if __name__ == "__main__":
+    main()
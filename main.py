@@ -1,106 +1,34 @@
 import gradio as gr
 import os
+import inspect
 import sys
-import importlib.util
+import tempfile
 from pathlib import Path
 import dotenv
+from feature_modules import FEATURE_MODULES, load_feature_module
+from workload_scheduler import FEATURE_WORKLOADS, QueueFullError, format_wait_message, get_scheduler
+from example_inputs import EXAMPLE_COMPANIES, EXAMPLE_JOBS, EXAMPLE_SIZE_COMPANIES, EXPERIENCE_LEVELS
 
 dotenv.load_dotenv()
 
 # 현재 디렉토리 설정
 current_dir = Path(__file__).parent
 
-# 각 기능별 모듈 로드 함수
-def load_module_from_path(module_name, file_path):
-    """동적으로 모듈을 로드하는 함수"""
-    try:
-        spec = importlib.util.spec_from_file_location(module_name, file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module
-    except Exception as e:
-        print(f"모듈 로드 실패 {module_name}: {e}")
-        return None
-
 # 각 기능별 모듈 및 함수 로드
 modules = {}
 available_features = {}
 
-# 1. commonly-asked-question
-try:
-    llm_functions_path = current_dir / "commonly-asked-question" / "llm_functions.py"
-    if llm_functions_path.exists():
-        modules['commonly_asked'] = load_module_from_path("commonly_asked_llm", llm_functions_path)
-        available_features['commonly_asked'] = modules['commonly_asked'] is not None
-    else:
-        available_features['commonly_asked'] = False
-except Exception as e:
-    print(f"commonly-asked-question 모듈 로드 실패: {e}")
-    available_features['commonly_asked'] = False
-
-# 2. question-recommendation
-try:
-    llm_functions_path = current_dir / "question-recommendation" / "llm_functions.py"
-    if llm_functions_path.exists():
-        modules['question_rec'] = load_module_from_path("question_rec_llm", llm_functions_path)
-        available_features['question_rec'] = modules['question_rec'] is not None
-    else:
-        available_features['question_rec'] = False
-except Exception as e:
-    print(f"question-recommendation 모듈 로드 실패: {e}")
-    available_features['question_rec'] = False
-
-# 3. jd-recommendation
-try:
-    llm_functions_path = current_dir / "jd-recommendation" / "llm_functions.py"
-    if llm_functions_path.exists():
-        modules['jd_rec'] = load_module_from_path("jd_rec_llm", llm_functions_path)
-        available_features['jd_rec'] = modules['jd_rec'] is not None
-    else:
-        available_features['jd_rec'] = False
-except Exception as e:
-    print(f"jd-recommendation 모듈 로드 실패: {e}")
-    available_features['jd_rec'] = False
-
-# 4. industry-classification
-try:
-    llm_functions_path = current_dir / "industry-classification" / "llm_functions.py"
-    if llm_functions_path.exists():
-        modules['industry'] = load_module_from_path("industry_llm", llm_functions_path)
-        available_features['industry'] = modules['industry'] is not None
-    else:
-        available_features['industry'] = False
-except Exception as e:
-    print(f"industry-classification 모듈 로드 실패: {e}")
-    available_features['industry'] = False
-
-# 5. jasoseo-context-report
-try:
-    llm_functions_path = current_dir / "jasoseo-context-report" / "llm_functions.py"
-    if llm_functions_path.exists():
-        modules['jasoseo'] = load_module_from_path("jasoseo_llm", llm_functions_path)
-        available_features['jasoseo'] = modules['jasoseo'] is not None
-    else:
-        available_features['jasoseo'] = False
-except Exception as e:
-    print(f"jasoseo-context-report 모듈 로드 실패: {e}")
-    available_features['jasoseo'] = False
-
-# 6. company-size-classification
-try:
-    llm_functions_path = current_dir / "company-size-classification" / "llm_functions.py"
-    if llm_functions_path.exists():
-        modules['company_size'] = load_module_from_path("company_size_llm", llm_functions_path)
-        available_features['company_size'] = modules['company_size'] is not None
-    else:
-        available_features['company_size'] = False
-except Exception as e:
-    print(f"company-size-classification 모듈 로드 실패: {e}")
-    available_features['company_size'] = False
+for feature, (directory, _) in FEATURE_MODULES.items():
+    try:
+        modules[feature] = load_feature_module(feature)
+        available_features[feature] = modules[feature] is not None
+    except Exception as e:
+        print(f"{directory} 모듈 로드 실패: {e}")
+        available_features[feature] = False
 
 # OpenAI 관련 모듈
 try:
-    from openai import OpenAI
+    from llm_gateway import create_client
     import yaml
     openai_available = True
 except ImportError:
@@ -109,7 +37,7 @@ except ImportError:
 # OpenAI 클라이언트 초기화
 client = None
 if openai_available and os.getenv("OPENAI_API_KEY"):
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 공통 CSS 스타일
 common_css = """
@@ -139,10 +67,31 @@ common_css = """
 }
 """
 
-# 예제 데이터
-example_companies = ["삼성전자", "토스", "카카오", "네이버", "LG전자", "현대자동차", "CJ제일제당", "하이브", "쿠팡", "배달의민족", "신한은행", "SKT", "포스코", "현대건설", "아모레퍼시픽"]
-example_jobs = ["백엔드 개발", "프론트엔드 개발", "데이터 사이언티스트", "마케팅", "영업", "기획", "디자인", "HR", "재무", "A&R", "경영기획", "해외영업", "온라인마케팅", "식품마케팅", "HRM(인사운영)"]
-experience_levels = ["신입", "경력", "인턴", "기타"]
+# 예제 데이터 (cache_warmer 예열 대상과 같은 목록)
+example_companies = EXAMPLE_COMPANIES
+example_jobs = EXAMPLE_JOBS
+experience_levels = EXPERIENCE_LEVELS
+
+scheduler = get_scheduler()
+
+def run_scheduled(feature, func, *args):
+    """
+    기능의 워크로드 클래스 슬롯 안에서 func를 실행하는 Gradio 생성기 핸들러.
+    기다리는 동안 대기 순번과 예상 대기 시간을 출력 칸에 보여줍니다. func가 생성기면 중간 결과도 그대로 내보냅니다.
+    """
+    try:
+        iterate = inspect.isgeneratorfunction(func)
+        for kind, value in scheduler.stream(FEATURE_WORKLOADS[feature], func, *args, iterate=iterate):
+            yield format_wait_message(*value) if kind == "queued" else value
+    except QueueFullError as e:
+        yield f"❌ {e}"
+
+def workload_event_options(feature):
+    """
+    같은 워크로드 클래스의 이벤트들이 하나의 Gradio 동시 실행 그룹을 공유하도록 하는 click() 옵션
+    """
+    workload = FEATURE_WORKLOADS[feature]
+    return {"concurrency_id": workload, "concurrency_limit": scheduler.capacity(workload)}
 
 # 공통 함수들
 def create_example_buttons(companies, jobs, company_input, job_input):
@@ -209,17 +158,22 @@ def create_commonly_asked_tab():
     gr.Markdown("### 📋 **생성된 면접 질문**")
     result_output = gr.Markdown("위 정보를 입력하고 '면접 질문 생성' 버튼을 클릭하세요.")
     
-    def process_question_generation(company, job, experience, selected, num):
+    def generate(company, job, experience, selected, num):
         try:
             content, _ = modules['commonly_asked'].generate_interview_questions(company, job, experience, selected, num)
             return content
         except Exception as e:
             return f"❌ 오류가 발생했습니다: {e}"
+
+    def process_question_generation(company, job, experience, selected, num):
+        yield from run_scheduled('commonly_asked', generate, company, job, experience, selected, num)
     
     generate_btn.click(
         fn=process_question_generation,
         inputs=[company_input, job_input, experience_input, selected_questions, num_questions_input],
-        outputs=result_output
+        outputs=result_output,
+        api_name="generate_interview_questions",
+        **workload_event_options('commonly_asked')
     )
 
 # 2. 면접 질문 추천 탭
@@ -248,7 +202,7 @@ def create_question_recommendation_tab():
     gr.Markdown("### 💬 **추천 면접 질문**")
     result_output = gr.Textbox(label="", placeholder="추천된 면접 질문이 여기에 표시됩니다.", lines=5, show_label=False, interactive=False)
     
-    def recommend_question(job, company, experience):
+    def recommend(job, company, experience):
         try:
             if not client: return "❌ OpenAI API 키가 설정되지 않았습니다."
             prompt_path = current_dir / "question-recommendation" / "prompt.yaml"
@@ -260,8 +214,11 @@ def create_question_recommendation_tab():
             return parsed.get('recommended_question', "질문 생성에 실패했습니다.")
         except Exception as e:
             return f"❌ 오류가 발생했습니다: {e}"
+
+    def recommend_question(job, company, experience):
+        yield from run_scheduled('question_rec', recommend, job, company, experience)
     
-    submit_btn.click(fn=recommend_question, inputs=[job_input, company_input, experience_input], outputs=result_output)
+    submit_btn.click(fn=recommend_question, inputs=[job_input, company_input, experience_input], outputs=result_output, api_name="recommend_question", **workload_event_options('question_rec'))
 
 # 3. 직무기술서 생성 탭
 def create_jd_recommendation_tab():
@@ -289,14 +246,17 @@ def create_jd_recommendation_tab():
     gr.Markdown("### 📜 **생성된 직무기술서**")
     result_output = gr.Markdown("위 정보를 입력하고 '직무기술서 생성' 버튼을 클릭하세요.")
 
-    def process_jd_generation(job, company, experience):
+    def generate(job, company, experience):
         try:
             content, _ = modules['jd_rec'].generate_jd_recommendation(job, company, experience)
             return content
         except Exception as e:
             return f"❌ 오류가 발생했습니다: {e}"
+
+    def process_jd_generation(job, company, experience):
+        yield from run_scheduled('jd_rec', generate, job, company, experience)
     
-    generate_btn.click(fn=process_jd_generation, inputs=[job_input, company_input, experience_input], outputs=result_output)
+    generate_btn.click(fn=process_jd_generation, inputs=[job_input, company_input, experience_input], outputs=result_output, api_name="generate_jd", **workload_event_options('jd_rec'))
 
 # 4. 산업 분류 탭
 def create_industry_classification_tab():
@@ -323,14 +283,17 @@ def create_industry_classification_tab():
     gr.Markdown("### 📑 **분류 결과**")
     result_output = gr.Markdown("위 정보를 입력하고 '산업 분류' 버튼을 클릭하세요.")
 
-    def process_classification(job, company):
+    def classify(job, company):
         try:
             content, _ = modules['industry'].classify_industry(job, company)
             return content
         except Exception as e:
             return f"❌ 오류가 발생했습니다: {e}"
 
-    classify_btn.click(fn=process_classification, inputs=[job_input, company_input], outputs=result_output)
+    def process_classification(job, company):
+        yield from run_scheduled('industry', classify, job, company)
+
+    classify_btn.click(fn=process_classification, inputs=[job_input, company_input], outputs=result_output, api_name="classify_industry", **workload_event_options('industry'))
 
 # 5. 자소서 컨텍스트 리포트 탭
 def create_jasoseo_context_tab():
@@ -358,14 +321,16 @@ def create_jasoseo_context_tab():
     gr.Markdown("### 📈 **컨텍스트 리포트**")
     result_output = gr.Markdown("위 정보를 입력하고 '리포트 생성' 버튼을 클릭하세요.")
 
-    def process_report_generation(job, company, experience):
+    def generate(job, company, experience):
         try:
-            content, _ = modules['jasoseo'].generate_context_report(job, company, experience)
-            return content
+            return modules['jasoseo'].generate_context_report(job, company, experience)[0]
         except Exception as e:
             return f"❌ 오류가 발생했습니다: {e}"
 
-    generate_btn.click(fn=process_report_generation, inputs=[job_input, company_input, experience_input], outputs=result_output)
+    def process_report_generation(job, company, experience):
+        yield from run_scheduled('jasoseo', generate, job, company, experience)
+
+    generate_btn.click(fn=process_report_generation, inputs=[job_input, company_input, experience_input], outputs=result_output, api_name="generate_context_report", **workload_event_options('jasoseo'))
 
 # 6. 기업 규모 분류 탭
 def create_company_size_tab():
@@ -397,7 +362,7 @@ def create_company_size_tab():
             """)
 
     gr.Markdown("### 💼 **예제 기업 선택** (클릭하면 자동 입력됩니다)")
-    example_company_names = ["삼성전자", "현대자동차", "SK하이닉스", "포스코홀딩스", "토스", "카카오", "네이버", "쿠팡", "배달의민족", "당근마켓"]
+    example_company_names = EXAMPLE_SIZE_COMPANIES
     with gr.Row():
         for company in example_company_names[:5]:
             btn = gr.Button(company, size="sm", variant="secondary")
@@ -410,14 +375,89 @@ def create_company_size_tab():
     gr.Markdown("### 📊 **분석 결과**")
     result_output = gr.Markdown("기업명을 입력하고 '기업 규모 분석' 버튼을 클릭하세요.")
     
-    def process_analysis_result(company):
+    def analyze(company):
         try:
             content, _ = modules['company_size'].analyze_company_size(company)
             return content
         except Exception as e:
             return f"❌ 오류가 발생했습니다: {e}"
+
+    def process_analysis_result(company):
+        yield from run_scheduled('company_size', analyze, company)
     
-    analyze_btn.click(fn=process_analysis_result, inputs=[company_input], outputs=result_output)
+    analyze_btn.click(fn=process_analysis_result, inputs=[company_input], outputs=result_output, api_name="analyze_company_size", **workload_event_options('company_size'))
+
+# 7. 기업 종합 분석 탭
+def create_dossier_tab():
+    required = ['industry', 'company_size', 'jasoseo', 'jd_rec']
+    if not all(available_features.get(feature) for feature in required):
+        gr.Markdown("❌ **기업 종합 분석 기능을 사용할 수 없습니다.** (산업 분류/기업 규모/컨텍스트 리포트/직무기술서 모듈 필요)")
+        return
+    from dossier import generate_dossier
+    gr.HTML("""
+    <div class="main-header">
+        <h2>🗂️ 기업 종합 분석</h2>
+        <p>산업 분류, 기업 규모, 컨텍스트 리포트, 직무기술서를 한 번의 조사로 동시에 생성합니다</p>
+    </div>
+    """)
+
+    with gr.Row():
+        with gr.Column(scale=2):
+            gr.Markdown("### 📝 **기본 정보 입력**")
+            job_input = gr.Textbox(label="💼 직무", placeholder="예: 경영기획, 백엔드 개발, 온라인마케팅 등")
+            company_input = gr.Textbox(label="🏢 회사명", placeholder="예: 삼성전자, 토스, 카카오 등")
+            experience_input = gr.Dropdown(label="📈 경력 수준", choices=experience_levels, value="신입", interactive=True)
+            generate_btn = gr.Button("🗂️ 종합 분석 시작", variant="primary", size="lg")
+
+        with gr.Column(scale=1):
+            create_example_buttons(example_companies, example_jobs, company_input, job_input)
+
+    result_output = gr.Markdown("위 정보를 입력하고 '종합 분석 시작' 버튼을 클릭하세요. 섹션은 끝나는 순서대로 채워집니다.")
+
+    def process_dossier(job, company, experience):
+        yield from run_scheduled('dossier', generate_dossier, job, company, experience)
+
+    generate_btn.click(fn=process_dossier, inputs=[job_input, company_input, experience_input], outputs=result_output, api_name="generate_dossier", **workload_event_options('dossier'))
+
+# 8. 대량 분류 탭
+def create_bulk_tab():
+    if not available_features.get('industry') or not available_features.get('company_size'):
+        gr.Markdown("❌ **대량 분류 기능을 사용할 수 없습니다.** (산업 분류/기업 규모 모듈 필요)")
+        return
+    from bulk_classify import classify_bulk
+    gr.HTML("""
+    <div class="main-header">
+        <h2>📑 대량 기업 분류</h2>
+        <p>회사 목록 CSV를 올리면 산업 태그와 기업 규모를 한 번에 분류합니다</p>
+    </div>
+    """)
+
+    with gr.Row():
+        with gr.Column(scale=2):
+            gr.Markdown("### 📝 **CSV 업로드**\n회사명 열(company_name/회사명, 없으면 첫 번째 열)과 선택적 직무 열(job_title/직무)을 사용합니다.")
+            csv_input = gr.File(label="📄 회사 목록 CSV", file_types=[".csv"], type="filepath")
+            tasks_input = gr.CheckboxGroup(label="🔧 분류 항목", choices=["산업", "규모"], value=["산업", "규모"])
+            classify_btn = gr.Button("📑 대량 분류 시작", variant="primary", size="lg")
+
+        with gr.Column(scale=1):
+            progress_output = gr.Markdown("CSV를 올리고 '대량 분류 시작' 버튼을 클릭하세요.")
+            result_file = gr.File(label="📥 결과 CSV (배치가 끝날 때마다 갱신)", interactive=False)
+
+    def process_bulk(csv_path, tasks):
+        if not csv_path:
+            yield "CSV 파일을 업로드해주세요.", None
+            return
+        if not tasks:
+            yield "분류 항목을 하나 이상 선택해주세요.", None
+            return
+        output_path = os.path.join(tempfile.mkdtemp(prefix="bulk_"), "classified.csv")
+        try:
+            for message in run_scheduled('bulk', classify_bulk, csv_path, output_path, "산업" in tasks, "규모" in tasks):
+                yield message, output_path if os.path.exists(output_path) else None
+        except Exception as e:
+            yield f"❌ 대량 분류 중 오류가 발생했습니다: {e}", output_path if os.path.exists(output_path) else None
+
+    classify_btn.click(fn=process_bulk, inputs=[csv_input, tasks_input], outputs=[progress_output, result_file], api_name="classify_bulk", **workload_event_options('bulk'))
 
 # 메인 애플리케이션 생성
 def create_main_app():
@@ -437,6 +477,13 @@ def create_main_app():
         status_items = [name for name, ok in available_features.items() if ok]
         status_text = f"✅ 사용 가능한 기능 ({len(status_items)}/{len(available_features)}): {', '.join(status_items)}" if status_items else "❌ 사용 가능한 기능이 없습니다."
         gr.Markdown(f"**{status_text}**")
+
+        with gr.Accordion("⏱️ 작업 대기 현황", open=False):
+            workload_status = gr.Markdown(scheduler.format_status())
+            refresh_btn = gr.Button("🔄 새로고침", size="sm")
+            refresh_btn.click(fn=scheduler.format_status, outputs=workload_status, queue=False)
+            if hasattr(gr, "Timer"):
+                gr.Timer(5).tick(fn=scheduler.format_status, outputs=workload_status, queue=False)
         
      
         
@@ -458,6 +505,12 @@ def create_main_app():
             
             with gr.Tab("🏢 기업 규모", elem_id="company-size-tab"):
                 create_company_size_tab()
+            
+            with gr.Tab("🗂️ 종합 분석", elem_id="dossier-tab"):
+                create_dossier_tab()
+            
+            with gr.Tab("📑 대량 분류", elem_id="bulk-tab"):
+                create_bulk_tab()
         
     return app
 
@@ -470,5 +523,13 @@ if __name__ == "__main__":
         print(f"  {'✅' if available else '❌'} {feature}")
     
     print("\n🚀 JasoSeo Agent 시작 중...")
+    # 배포 직후 예제 버튼도 캐시에서 바로 응답하도록 백그라운드 예열 (WARMUP_INTERVAL_HOURS로 주기 반복)
+    if os.getenv("WARMUP_ON_STARTUP", "0") == "1" and os.getenv("OPENAI_API_KEY"):
+        from cache_warmer import start_background_warmer
+        start_background_warmer()
+        print("🔥 캐시 예열을 백그라운드에서 시작했습니다.")
     app = create_main_app()
-    app.launch(share=True, show_error=True, debug=True) 
\ No newline at end of file
+    # 부하 테스트 등 로컬 실행 시 GRADIO_SHARE=0으로 공유 링크를 끌 수 있습니다.
+    # 대기 중인 요청도 워커 스레드를 차지하므로 모든 워크로드 클래스의 수용량만큼 스레드를 둡니다.
+    app.launch(share=os.getenv("GRADIO_SHARE", "1") != "0", show_error=True, debug=True,
+               max_threads=scheduler.total_capacity() + 10) 
\ No newline at end of file
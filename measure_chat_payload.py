@@ -0,0 +1,141 @@
+"""
+채팅 이벤트 전송량 / 직렬화 CPU 측정
+
+20턴짜리 면접 대화를 합성해 스트리밍하면서, 턴마다 브라우저 <-> 서버로 오가는 바이트 수와
+서버의 직렬화(JSON 인코딩 + diff 계산) 시간을 두 방식으로 비교합니다.
+
+    before: user_submit / bot_response 이벤트마다 chatbot 기록 전체를 입력으로 올려 보내고,
+            user_submit이 기록 전체를 출력으로 내려보냄
+    after : 두 이벤트의 입력은 세션 ID뿐이고, user_submit은 기록을 내려보내지 않음
+
+스트리밍 yield는 두 방식 모두 Gradio 4 프로토콜대로 첫 프레임 이후 이전 값과의 diff만 내려보내므로
+같은 값을 양쪽에 더합니다. (diff는 이 변경과 무관하게 원래 Gradio가 하던 일)
+diff 형식은 Gradio 4 스트리밍 프로토콜(process_generating의 diff)과 같은 [동작, 경로, 값] 목록입니다.
+gradio가 설치되어 있으면 gradio.utils.diff를 그대로 사용합니다.
+
+사용법:
+    python measure_chat_payload.py --turns 20 --chunk 8
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+try:
+    from gradio.utils import diff as gradio_diff
+except ImportError:
+    gradio_diff = None
+
+STUDENT_TEXT = "저는 학부 시절 물류 데이터 분석 프로젝트에서 배송 지연 원인을 찾아 처리 시간을 줄였습니다. " * 4
+INTERVIEWER_TEXT = "좋습니다. 그 과정에서 팀원과 의견이 달랐던 순간이 있었다면 어떻게 조율하셨는지 구체적으로 말씀해주세요. " * 3
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def history_diff(old, new):
+    """
+    대화 기록(list[list[str|None]])의 변경분. 마지막 메시지에 문자열이 덧붙은 경우 append만 기록합니다.
+    """
+    if gradio_diff is not None:
+        return gradio_diff(old, new)
+    edits = []
+    for i in range(len(new)):
+        if i >= len(old):
+            edits.append(["add", [i], new[i]])
+            continue
+        for j, value in enumerate(new[i]):
+            previous = old[i][j]
+            if value == previous:
+                continue
+            if isinstance(value, str) and isinstance(previous, str) and value.startswith(previous):
+                edits.append(["append", [i, j], value[len(previous):]])
+            else:
+                edits.append(["replace", [i, j], value])
+    return edits
+
+
+def stream_frames(history, text, slot, chunk):
+    """
+    마지막 메시지의 slot(0: 학생, 1: 면접관)에 text를 chunk 글자씩 채우면서 기록 스냅샷을 내보냅니다.
+    """
+    history[-1][slot] = ""
+    for end in range(chunk, len(text) + chunk, chunk):
+        history[-1][slot] = text[:end]
+        yield [list(message) for message in history]
+
+
+def _add(side, payload):
+    start = time.perf_counter()
+    side["bytes"] += len(_encode(payload))
+    side["cpu"] += time.perf_counter() - start
+
+
+def measure_turn(history, chunk, session_id):
+    """
+    한 턴(user_submit + 학생 답변 / 면접관 응답 스트리밍)의 before/after 바이트와 직렬화 시간
+    """
+    result = {"before": {"bytes": 0, "cpu": 0.0}, "after": {"bytes": 0, "cpu": 0.0}}
+
+    # user_submit: before는 기록 전체를 올리고 메시지가 추가된 기록 전체를 내려받음, after는 세션 ID만
+    _add(result["before"], {"data": [history]})
+    _add(result["after"], {"data": [session_id]})
+    history.append(["", None])
+    _add(result["before"], [list(message) for message in history])
+
+    # bot_response 요청: before는 기록 전체, after는 세션 ID
+    _add(result["before"], {"data": [history]})
+    _add(result["after"], {"data": [session_id]})
+
+    # 스트리밍 yield: 두 방식 모두 첫 프레임 전체 + 이후 diff
+    stream = {"bytes": 0, "cpu": 0.0}
+    previous = None
+    frames = list(stream_frames(history, STUDENT_TEXT, 0, chunk))
+    history[-1][1] = ""
+    frames += list(stream_frames(history, INTERVIEWER_TEXT, 1, chunk))
+    for frame in frames:
+        start = time.perf_counter()
+        payload = frame if previous is None else history_diff(previous, frame)
+        stream["bytes"] += len(_encode(payload))
+        stream["cpu"] += time.perf_counter() - start
+        previous = frame
+    for mode in ("before", "after"):
+        result[mode]["bytes"] += stream["bytes"]
+        result[mode]["cpu"] += stream["cpu"]
+    result["frames"] = len(frames)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="채팅 이벤트 전송량 / 직렬화 CPU 측정")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--chunk", type=int, default=8, help="스트리밍 청크 크기(글자)")
+    args = parser.parse_args()
+
+    print(f"📏 {args.turns}턴 합성 대화, 청크 {args.chunk}자 (diff: {'gradio.utils.diff' if gradio_diff else '내장 append diff'})")
+    print(f"{'turn':>5}{'frames':>8}{'before KB':>12}{'after KB':>11}{'before ms':>11}{'after ms':>10}")
+    history = []
+    totals = {"before": [0, 0.0], "after": [0, 0.0]}
+    for turn in range(1, args.turns + 1):
+        result = measure_turn(history, args.chunk, "0123456789abcdef0123456789abcdef")
+        for mode in ("before", "after"):
+            totals[mode][0] += result[mode]["bytes"]
+            totals[mode][1] += result[mode]["cpu"]
+        print(f"{turn:>5}{result['frames']:>8}{result['before']['bytes'] / 1024:>12.1f}{result['after']['bytes'] / 1024:>11.1f}"
+              f"{result['before']['cpu'] * 1000:>11.1f}{result['after']['cpu'] * 1000:>10.1f}")
+    before, after = totals["before"], totals["after"]
+    print("-" * 57)
+    print(f"📊 전체 전송량: {before[0] / 1024 / 1024:.2f}MB -> {after[0] / 1024 / 1024:.2f}MB "
+          f"({before[0] / max(after[0], 1):.0f}배 감소)")
+    print(f"⏱️  직렬화 CPU: {before[1] * 1000:.0f}ms -> {after[1] * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+OpenAI 호환 모의 LLM 서버 (부하 테스트용)
+
+/v1/chat/completions (stream 포함)와 /v1/responses를 흉내 내며, 실제 API 대신 지연 시간만 재현합니다.
+응답 본문은 각 모듈의 JSON 파서가 받아들일 수 있도록 answer/progress/guide/flow/tags 등을 모두 담습니다.
+태그와 기업 규모는 실제 분류 체계에 있는 값을 쓰고, 여러 회사를 묶은 배치 프롬프트에는 id별 results 배열을 돌려줍니다.
+면접관 응답의 progress는 대화 길이에 따라 올라가므로 약 10턴이면 100%에 도달합니다.
+
+사용법:
+    python mock_llm_server.py --port 8900 --ttft 0.4 --tokens-per-sec 60
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=mock python main.py
+"""
+
+import re
+import json
+import time
+import uuid
+import random
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SETTINGS = {
+    "ttft": 0.4,            # 첫 토큰까지 지연(초)
+    "tokens_per_sec": 60.0,  # 출력 속도
+    "jitter": 0.2,           # 지연 시간 무작위 변동 비율
+    "error_rate": 0.0,       # 5xx 응답 비율
+}
+
+# industry-classification/eval.json의 tagId, company-size-classification/eval.json의 enum 값
+SAMPLE_TAGS = ["platform-portal"]
+SAMPLE_SIZE = "대기업"
+
+SAMPLE_TEXT = "지원자는 팀 프로젝트에서 데이터 파이프라인을 설계하고 성능을 개선한 경험이 있습니다. "
+
+
+def _jittered(seconds):
+    return max(0.0, seconds * random.uniform(1 - SETTINGS["jitter"], 1 + SETTINGS["jitter"]))
+
+
+def _prompt_text(body):
+    if "messages" in body:
+        return "".join(str(message.get("content", "")) for message in body["messages"])
+    request_input = body.get("input", "")
+    return request_input if isinstance(request_input, str) else json.dumps(request_input, ensure_ascii=False)
+
+
+def build_content(prompt):
+    """
+    모든 모듈의 파서가 읽을 수 있는 JSON 응답 본문
+    """
+    turns = prompt.count("AI:")
+    # 배치 분류 프롬프트는 [{"id": "...", "company_name": ...}] 목록을 담고 있습니다.
+    batch_ids = re.findall(r'"id":\s*"([^"]+)"', prompt)
+    return json.dumps({
+        "answer": SAMPLE_TEXT * 2,
+        "progress": min(100, 10 * (turns + 1)),
+        "reasoning_for_progress": "경험의 구체성이 보강되고 있습니다.",
+        "guide": "| 단계 | 내용 |\n|---|---|\n| 도입 | " + SAMPLE_TEXT + "|",
+        "flow": "| 단계 | 내용 |\n|---|---|\n| 전개 | " + SAMPLE_TEXT + "|",
+        "memory": SAMPLE_TEXT,
+        "tags": SAMPLE_TAGS,
+        "recommended_jd": SAMPLE_TEXT * 3,
+        "recommended_question": "팀 프로젝트에서 가장 어려웠던 점은 무엇이었나요?",
+        "questions": ["지원 동기를 말씀해주세요.", "협업 경험을 말씀해주세요.", "입사 후 포부는 무엇인가요?"],
+        "company_size": SAMPLE_SIZE,
+        "results": [{"id": item_id, "tags": SAMPLE_TAGS, "category": SAMPLE_SIZE, "reason": SAMPLE_TEXT}
+                    for item_id in batch_ids],
+    }, ensure_ascii=False)
+
+
+def _usage(prompt, content):
+    prompt_tokens, completion_tokens = len(prompt) // 2, len(content) // 2
+    return prompt_tokens, completion_tokens
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if random.random() < SETTINGS["error_rate"]:
+            self._send_json(503, {"error": {"message": "mock overloaded", "type": "server_error"}})
+            return
+
+        prompt = _prompt_text(body)
+        content = build_content(prompt)
+        model = body.get("model", "gpt-4o")
+        time.sleep(_jittered(SETTINGS["ttft"]))
+
+        if self.path.endswith("/chat/completions"):
+            if body.get("stream"):
+                self._stream_chat(model, content)
+            else:
+                self._send_json(200, self._chat_completion(model, prompt, content))
+        elif self.path.endswith("/responses"):
+            time.sleep(_jittered(len(content) / 2 / SETTINGS["tokens_per_sec"]))
+            self._send_json(200, self._response(model, prompt, content))
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def _chat_completion(self, model, prompt, content):
+        time.sleep(_jittered(len(content) / 2 / SETTINGS["tokens_per_sec"]))
+        prompt_tokens, completion_tokens = _usage(prompt, content)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _stream_chat(self, model, content):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+        step = 8  # 약 4토큰씩
+        delay = step / 2 / SETTINGS["tokens_per_sec"]
+        try:
+            for start in range(0, len(content), step):
+                chunk = {
+                    "id": chunk_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[start:start + step]}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(_jittered(delay))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 클라이언트가 스트림을 취소한 경우
+        self.close_connection = True
+
+    def _response(self, model, prompt, content):
+        prompt_tokens, completion_tokens = _usage(prompt, content)
+        return {
+            "id": f"resp_{uuid.uuid4().hex}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "status": "completed",
+            "model": model,
+            "output": [{
+                "type": "message",
+                "id": f"msg_{uuid.uuid4().hex}",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": content, "annotations": []}],
+            }],
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "usage": {
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            },
+        }
+
+
+def serve(host="127.0.0.1", port=8900):
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    print(f"🧪 모의 LLM 서버: http://{host}:{port}/v1 (TTFT {SETTINGS['ttft']}s, {SETTINGS['tokens_per_sec']} tok/s)")
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 호환 모의 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--ttft", type=float, default=SETTINGS["ttft"], help="첫 토큰까지 지연(초)")
+    parser.add_argument("--tokens-per-sec", type=float, default=SETTINGS["tokens_per_sec"], help="출력 토큰 속도")
+    parser.add_argument("--jitter", type=float, default=SETTINGS["jitter"], help="지연 무작위 변동 비율")
+    parser.add_argument("--error-rate", type=float, default=SETTINGS["error_rate"], help="503 응답 비율 (재시도 정책 확인용)")
+    args = parser.parse_args()
+    SETTINGS.update(ttft=args.ttft, tokens_per_sec=args.tokens_per_sec, jitter=args.jitter, error_rate=args.error_rate)
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,21 @@
+import os
+import sys
 import json
+import time
 import logging
 
+# 프로젝트 루트를 path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from search_policy import choose_search_context_size, record_search_call
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_question_recommendation(client, prompts, job_title, company_name, experience_level):
+def generate_question_recommendation(client, prompts, job_title, company_name, experience_level, search_context_size=None):
     """
     면접 질문 추천을 생성하는 함수
     
@@ -15,6 +25,7 @@ def generate_question_recommendation(client, prompts, job_title, company_name, e
         job_title: 직무명
         company_name: 회사명
         experience_level: 경력 수준
+        search_context_size: 웹 검색 컨텍스트 크기 (None이면 search_policy가 선택)
     
     Returns:
         str: LLM 응답 결과
@@ -29,18 +40,34 @@ def generate_question_recommendation(client, prompts, job_title, company_name, e
         
         logger.info(f"면접 질문 추천 요청 - 직무: {job_title}, 회사: {company_name}, 경력: {experience_level}")
         
+        # search_context_size는 회사 조사 이력에 따라 선택 (명시값 우선)
+        if search_context_size:
+            size_reason = "explicit"
+        else:
+            search_context_size, size_reason = choose_search_context_size("question_rec", company_name)
+        
         # OpenAI Responses API 호출 (웹 검색 활성화)
-        response = client.responses.create(
-            model="gpt-4o-mini",
-            tools=[{
-                "type": "web_search_preview",
-                "search_context_size": "high",
-            }],
-            input=f"{prompts['system_prompt']}\n\n{user_prompt}"
-        )
+        start_time = time.time()
+        try:
+            response = client.responses.create(
+                model="gpt-4o-mini",
+                tools=[{
+                    "type": "web_search_preview",
+                    "search_context_size": search_context_size,
+                }],
+                input=f"{prompts['system_prompt']}\n\n{user_prompt}"
+            )
+        except Exception:
+            # 실패한 호출도 기록 (성공률 집계)
+            record_search_call("question_rec", company_name, search_context_size, size_reason,
+                               time.time() - start_time, None, "gpt-4o-mini", success=False)
+            raise
+        latency = time.time() - start_time
         
         print(response)
         result = response.output_text
+        record_search_call("question_rec", company_name, search_context_size, size_reason,
+                           latency, response, "gpt-4o-mini", success=bool((result or "").strip()))
         logger.info("면접 질문 추천 생성 완료")
         
         return result, response
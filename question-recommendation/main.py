@@ -2,11 +2,11 @@ import gradio as gr
 import yaml
 import json
 import os
-from openai import OpenAI
 from llm_functions import generate_question_recommendation, parse_question_recommendation
+from llm_gateway import create_client
 
-# OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# OpenAI 클라이언트 초기화 (레이트 리미터 게이트웨이 경유)
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 프롬프트 로드
 def load_prompts():
@@ -5,16 +5,16 @@ import json
 import multiprocessing
 import sys
 from tqdm import tqdm
-from openai import OpenAI
 import yaml
 
 # 상위 디렉토리의 utils.py를 import하기 위해 경로 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils import track_api_cost
 from llm_functions import generate_question_recommendation, parse_question_recommendation
+from llm_gateway import create_client
 
 # OpenAI 클라이언트 초기화
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = create_client(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 테스트를 위한 환경 변수 로드 (필요시)
 try:
@@ -0,0 +1,165 @@
+"""
+모델별 RPM(분당 요청 수) / TPM(분당 토큰 수) 토큰 버킷 레이트 리미터
+
+버킷 상태를 .cache/ratelimit/<model>.json에 두고 파일 잠금(fcntl.flock)으로 갱신하므로
+같은 프로세스의 여러 스레드뿐 아니라 multiprocessing.Pool 워커끼리도 같은 한도를 나눠 씁니다.
+한도에 도달하면 429를 맞는 대신 필요한 만큼만 기다렸다가 요청을 보냅니다.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 조정 없이 스레드 간에만 동작
+    fcntl = None
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.getenv(
+    "JASOSEO_RATE_LIMIT_DIR",
+    os.path.join(project_root, ".cache", "ratelimit")
+)
+
+# 모델별 기본 한도 (requests/min, tokens/min)
+DEFAULT_LIMITS = {
+    "gpt-4o": {"rpm": 500, "tpm": 30000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "gpt-4.1": {"rpm": 500, "tpm": 30000},
+    "gpt-4.1-mini": {"rpm": 500, "tpm": 200000},
+    "default": {"rpm": 500, "tpm": 30000},
+}
+
+
+def _load_limits():
+    """
+    JASOSEO_RATE_LIMITS 환경 변수(JSON)로 모델별 한도를 덮어쓸 수 있습니다.
+    예: JASOSEO_RATE_LIMITS='{"gpt-4o": {"rpm": 5000, "tpm": 800000}}'
+    """
+    limits = {model: dict(limit) for model, limit in DEFAULT_LIMITS.items()}
+    override = os.getenv("JASOSEO_RATE_LIMITS")
+    if override:
+        for model, limit in json.loads(override).items():
+            limits.setdefault(model, dict(limits["default"])).update(limit)
+    return limits
+
+
+LIMITS = _load_limits()
+
+
+class RateLimiter:
+    """
+    한 모델의 요청/토큰 버킷. acquire()는 두 버킷 모두 여유가 생길 때까지 대기합니다.
+    """
+
+    def __init__(self, model, rpm, tpm, state_dir=STATE_DIR):
+        self.model = model
+        self.rpm = float(rpm)
+        self.tpm = float(tpm)
+        os.makedirs(state_dir, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in model)
+        self.state_path = os.path.join(state_dir, f"{safe_name}.json")
+        self.lock_path = self.state_path + ".lock"
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        # 스레드 잠금 + 파일 잠금 (프로세스 간)
+        with self._thread_lock:
+            with open(self.lock_path, "a+") as fd:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _read_state(self, now):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"requests": self.rpm, "tokens": self.tpm, "updated": now}
+        # 경과 시간만큼 버킷 보충 (최대 1분치)
+        elapsed = max(0.0, now - state["updated"])
+        state["requests"] = min(self.rpm, state["requests"] + elapsed * self.rpm / 60.0)
+        state["tokens"] = min(self.tpm, state["tokens"] + elapsed * self.tpm / 60.0)
+        state["updated"] = now
+        return state
+
+    def _write_state(self, state):
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def try_acquire(self, tokens=0, reserve=0.0):
+        """
+        즉시 가져올 수 있으면 0을, 아니면 기다려야 할 시간(초)을 반환합니다.
+        reserve는 남겨둘 버킷 비율(0~1)로, 낮은 우선순위 호출이 한도를 다 쓰지 않게 합니다.
+        """
+        # 한 번의 요청이 TPM 전체보다 크면 버킷이 가득 찼을 때 통과시킵니다.
+        tokens = min(float(tokens), self.tpm * (1.0 - reserve))
+        with self._locked():
+            now = time.time()
+            state = self._read_state(now)
+            need_requests = 1.0 + self.rpm * reserve
+            need_tokens = tokens + self.tpm * reserve
+            if state["requests"] >= need_requests and state["tokens"] >= need_tokens:
+                state["requests"] -= 1.0
+                state["tokens"] -= tokens
+                self._write_state(state)
+                return 0.0
+            self._write_state(state)
+            wait_requests = (need_requests - state["requests"]) * 60.0 / self.rpm
+            wait_tokens = (need_tokens - state["tokens"]) * 60.0 / self.tpm
+            return max(wait_requests, wait_tokens, 0.01)
+
+    def acquire(self, tokens=0, reserve=0.0):
+        """
+        요청 1개와 토큰 tokens개를 사용할 수 있을 때까지 대기합니다. 총 대기 시간(초)을 반환합니다.
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire(tokens, reserve)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """
+        응답의 실제 사용량으로 토큰 버킷을 보정합니다. (추정치와의 차이만큼 반환/차감)
+        """
+        diff = float(estimated_tokens) - float(actual_tokens)
+        if abs(diff) < 1:
+            return
+        with self._locked():
+            state = self._read_state(time.time())
+            state["tokens"] = min(self.tpm, state["tokens"] + diff)
+            self._write_state(state)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model):
+    """
+    모델별 RateLimiter를 반환합니다. (한도 설정이 없는 모델은 "default" 한도 사용)
+    """
+    with _limiters_lock:
+        if model not in _limiters:
+            limit = LIMITS.get(model, LIMITS["default"])
+            _limiters[model] = RateLimiter(model, limit["rpm"], limit["tpm"])
+        return _limiters[model]
+
+
+def estimate_tokens(text, max_output_tokens=1000):
+    """
+    요청에 쓰일 토큰 수를 대략 추정합니다. (한국어 기준 약 2자당 1토큰 + 예상 출력)
+    """
+    return len(text or "") // 2 + max_output_tokens
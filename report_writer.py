@@ -0,0 +1,602 @@
+"""
+test_all.py 결과 HTML 리포트 작성기
+
+- 모든 리포트가 htmls/report.css 하나를 공유합니다. (파일마다 CSS를 넣지 않음)
+- 미리 컴파일한 string.Template으로 조각을 렌더링하고, 조각 단위로 바로 파일에 씁니다.
+- 통합 리포트는 page_size개씩 여러 페이지로 나눕니다.
+- 개별 리포트는 결과 내용의 해시를 기록해 두고, 바뀐 케이스만 다시 렌더링합니다.
+"""
+
+import os
+import json
+import hashlib
+from html import escape
+from string import Template
+from pathlib import Path
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT_DIR = os.path.join(project_root, "htmls")
+STYLESHEET_NAME = "report.css"
+RENDER_STATE_PATH = os.path.join(project_root, ".cache", "report_render_state.json")
+DEFAULT_PAGE_SIZE = int(os.getenv("REPORT_PAGE_SIZE", "50"))
+
+STYLESHEET = """body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    margin: 0;
+    padding: 20px;
+    background-color: #f5f5f5;
+    line-height: 1.6;
+}
+.header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 30px;
+    border-radius: 10px;
+    margin-bottom: 30px;
+    text-align: center;
+}
+.header.failed {
+    background: linear-gradient(135deg, #e74c3c 0%, #c0392b 100%);
+}
+.info-card, .summary {
+    background: white;
+    padding: 20px;
+    border-radius: 10px;
+    margin-bottom: 30px;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+}
+.step {
+    background: white;
+    margin-bottom: 25px;
+    border-radius: 10px;
+    overflow: hidden;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+}
+.step-header {
+    background: #34495e;
+    color: white;
+    padding: 15px 20px;
+    font-weight: bold;
+    font-size: 18px;
+}
+.step-content {
+    padding: 20px;
+}
+.test-case {
+    background: white;
+    margin-bottom: 30px;
+    border-radius: 10px;
+    overflow: hidden;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+}
+.test-case > summary {
+    color: white;
+    padding: 20px;
+    cursor: pointer;
+    list-style: none;
+}
+.test-case > summary.success {
+    background: #27ae60;
+}
+.test-case > summary.error {
+    background: #e74c3c;
+}
+.test-case > summary a {
+    color: white;
+}
+.case-content {
+    padding: 20px;
+}
+.case-content .step {
+    box-shadow: none;
+    border-radius: 0;
+    border-left: 4px solid #3498db;
+    padding-left: 15px;
+}
+.chat-turn {
+    background: #ecf0f1;
+    padding: 15px;
+    margin: 15px 0;
+    border-radius: 8px;
+    border-left: 4px solid #3498db;
+}
+.progress-bar {
+    background: #ecf0f1;
+    height: 25px;
+    border-radius: 12px;
+    overflow: hidden;
+    margin: 10px 0;
+}
+.progress-fill {
+    background: linear-gradient(90deg, #4CAF50, #8BC34A);
+    height: 100%;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    color: white;
+    font-weight: bold;
+}
+.error {
+    background: #f8d7da;
+    color: #721c24;
+    padding: 15px;
+    border-radius: 8px;
+    margin: 10px 0;
+    border-left: 4px solid #dc3545;
+}
+.success {
+    background: #d4edda;
+    color: #155724;
+    padding: 15px;
+    border-radius: 8px;
+    margin: 10px 0;
+    border-left: 4px solid #28a745;
+}
+.question-answer {
+    background: #f8f9fa;
+    padding: 20px;
+    margin: 15px 0;
+    border-radius: 8px;
+    border-left: 4px solid #007bff;
+}
+.question-title {
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 10px;
+    font-size: 16px;
+}
+pre {
+    background: #f1f3f4;
+    padding: 15px;
+    border-radius: 8px;
+    overflow-x: auto;
+    white-space: pre-wrap;
+    word-wrap: break-word;
+    border: 1px solid #e9ecef;
+    font-size: 14px;
+}
+.meta-info {
+    background: #e9ecef;
+    padding: 10px 15px;
+    border-radius: 5px;
+    margin: 10px 0;
+    font-size: 14px;
+    color: #6c757d;
+}
+.status-badge {
+    display: inline-block;
+    padding: 5px 10px;
+    border-radius: 20px;
+    font-size: 12px;
+    font-weight: bold;
+    margin: 5px 0;
+    color: white;
+}
+.status-success {
+    background: #28a745;
+}
+.status-error {
+    background: #dc3545;
+}
+.pagination {
+    text-align: center;
+    margin: 20px 0;
+}
+.pagination a, .pagination span {
+    display: inline-block;
+    padding: 5px 10px;
+    margin: 0 2px;
+    border-radius: 5px;
+    background: white;
+}
+.pagination span.current {
+    background: #667eea;
+    color: white;
+}
+"""
+
+# --- 템플릿 (모듈 로드 시 한 번만 컴파일) ---
+
+PAGE_HEAD = Template("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>$title</title>
+<link rel="stylesheet" href="$stylesheet">
+</head>
+<body>
+""")
+PAGE_TAIL = "</body>\n</html>\n"
+
+CASE_HEADER = Template("""<div class="header$header_class">
+<h1>$status_icon $case_id</h1>
+<h2>$company_name - $position_title</h2>
+<p>생성 시간: $generated_at</p>
+</div>
+<div class="info-card">
+<h2>📋 테스트 케이스 정보</h2>
+<p><strong>케이스 ID:</strong> $case_id</p>
+<p><strong>회사명:</strong> $company_name</p>
+<p><strong>직무:</strong> $position_title</p>
+<p><strong>글자수 제한:</strong> $word_limit자</p>
+<p><strong>처리 시간:</strong> $duration초</p>
+<p><strong>상태:</strong> <span class="status-badge $badge_class">$status_text</span></p>
+<h3>📄 JD (Job Description)</h3>
+<pre>$jd</pre>
+<h3>❓ 자기소개서 질문들</h3>
+<ol>$questions</ol>
+</div>
+""")
+
+STEP_OPEN = Template("""<div class="step">
+<div class="step-header">$title</div>
+<div class="step-content">
+""")
+STEP_CLOSE = "</div></div>\n"
+
+SUCCESS = Template('<div class="success">✅ $message</div>\n')
+ERROR = Template('<div class="error">❌ $message</div>\n')
+META = Template('<div class="meta-info">$label: $value</div>\n')
+PRE = Template('<pre>$text</pre>\n')
+
+CHAT_TURN = Template("""<div class="chat-turn">
+<h4>턴 $turn</h4>
+<div class="progress-bar"><div class="progress-fill" style="width: $progress%">$progress%</div></div>
+<div class="meta-info">시간: $timestamp</div>
+<p><strong>진행률 분석:</strong> $reasoning</p>
+<p><strong>면접관 질문:</strong></p>
+<pre>$question</pre>
+<p><strong>학생 답변:</strong></p>
+<pre>$answer</pre>
+</div>
+""")
+
+QUESTION_BLOCK = Template("""<div class="question-answer">
+<div class="question-title">질문 $number: $question</div>
+$status
+<div class="meta-info">생성 시간: $timestamp</div>
+$body
+</div>
+""")
+
+SUMMARY = Template("""<div class="header">
+<h1>🚀 자기소개서 생성 시스템 테스트 리포트</h1>
+<p>생성 시간: $generated_at</p>
+</div>
+<div class="summary">
+<h2>📊 테스트 요약</h2>
+<p><strong>총 테스트 케이스:</strong> $total개</p>
+<p><strong>성공한 케이스:</strong> $succeeded개</p>
+<p><strong>실패한 케이스:</strong> $failed개</p>
+<p><strong>평균 처리 시간:</strong> $avg_duration초</p>
+<p><strong>중복 제거된 호출:</strong> $dedup</p>
+<hr>
+<p><strong>📁 개별 상세 리포트:</strong> 각 케이스 제목의 링크에서 확인하세요</p>
+</div>
+""")
+
+CASE_SUMMARY_OPEN = Template("""<details class="test-case">
+<summary class="$status_class">
+<h3>📋 $case_id: $company_name - $position_title $link</h3>
+<p>상태: $status_text | 처리 시간: $duration초 | 글자수 제한: $word_limit자</p>
+</summary>
+<div class="case-content">
+""")
+CASE_SUMMARY_CLOSE = "</div>\n</details>\n"
+
+PAGE_LINK = Template('<a href="$href">$label</a>')
+
+
+def _e(value):
+    return escape(str(value if value is not None else ""))
+
+
+def _truncate(text, limit):
+    text = text or ""
+    return text[:limit] + ("..." if len(text) > limit else "")
+
+
+def _duration(results):
+    return f"{results.get('total_duration') or 0:.2f}"
+
+
+def case_digest(test_case):
+    """
+    케이스 내용(입력 + 결과)의 해시. 바뀌지 않은 케이스는 다시 렌더링하지 않습니다.
+    """
+    payload = json.dumps({
+        "case_id": test_case.case_id,
+        "company_name": test_case.company_name,
+        "position_title": test_case.position_title,
+        "jd": test_case.jd,
+        "questions": test_case.questions,
+        "word_limit": test_case.word_limit,
+        "results": test_case.results,
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def case_filename(test_case, suffix):
+    filename = f"{test_case.case_id}_{test_case.company_name}_{suffix}.html"
+    # 파일명에서 특수문자 제거
+    return "".join(c for c in filename if c.isalnum() or c in ('_', '-', '.'))
+
+
+class ReportWriter:
+    """
+    공유 스타일시트 + 템플릿 기반 리포트 작성기
+    """
+
+    def __init__(self, out_dir=DEFAULT_OUT_DIR, page_size=DEFAULT_PAGE_SIZE, state_path=RENDER_STATE_PATH):
+        self.out_dir = Path(out_dir)
+        self.page_size = max(1, page_size)
+        self.state_path = state_path
+        self._state = None
+
+    # --- 공통 ---
+
+    def ensure_stylesheet(self):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / STYLESHEET_NAME
+        if not path.exists() or path.read_text(encoding="utf-8") != STYLESHEET:
+            path.write_text(STYLESHEET, encoding="utf-8")
+        return path
+
+    def _load_state(self):
+        if self._state is None:
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._state = {}
+        return self._state
+
+    def _save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def _open_page(self, path, title):
+        f = open(path, "w", encoding="utf-8")
+        f.write(PAGE_HEAD.substitute(title=_e(title), stylesheet=STYLESHEET_NAME))
+        return f
+
+    # --- 개별 리포트 ---
+
+    def write_case(self, test_case, suffix, force=False):
+        """
+        개별 케이스 리포트를 씁니다. (path, rendered)를 반환하며,
+        내용이 이전 렌더링과 같고 파일이 남아 있으면 rendered=False로 건너뜁니다.
+        """
+        self.ensure_stylesheet()
+        path = self.out_dir / case_filename(test_case, suffix)
+        digest = case_digest(test_case)
+        state = self._load_state()
+        if not force and path.exists() and state.get(str(path)) == digest:
+            return path, False
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with self._open_page(tmp_path, f"{test_case.case_id}: {test_case.company_name} - {test_case.position_title}") as f:
+            self._render_case(f, test_case)
+            f.write(PAGE_TAIL)
+        os.replace(tmp_path, path)
+
+        state[str(path)] = digest
+        self._save_state()
+        return path, True
+
+    def _render_case(self, f, test_case):
+        results = test_case.results
+        has_errors = bool(results['errors'])
+        f.write(CASE_HEADER.substitute(
+            header_class=" failed" if has_errors else "",
+            status_icon='❌' if has_errors else '✅',
+            case_id=_e(test_case.case_id),
+            company_name=_e(test_case.company_name),
+            position_title=_e(test_case.position_title),
+            generated_at=datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S'),
+            word_limit=_e(test_case.word_limit),
+            duration=_duration(results),
+            badge_class='status-error' if has_errors else 'status-success',
+            status_text='실패' if has_errors else '성공',
+            jd=_e(test_case.jd),
+            questions="".join(f"<li>{_e(question)}</li>" for question in test_case.questions),
+        ))
+
+        # 1단계: 가이드 생성
+        f.write(STEP_OPEN.substitute(title="📝 1단계: 가이드 생성"))
+        guide_gen = results.get('guide_generation')
+        if guide_gen and guide_gen['success']:
+            f.write(SUCCESS.substitute(message="가이드 생성 성공"))
+            f.write(META.substitute(label="생성 시간", value=_e(guide_gen['timestamp'])))
+            f.write(PRE.substitute(text=_e(guide_gen['guide_text'])))
+        elif guide_gen:
+            f.write(ERROR.substitute(message=f"가이드 생성 실패: {_e(guide_gen.get('error', 'Unknown error'))}"))
+            f.write(META.substitute(label="실패 시간", value=_e(guide_gen['timestamp'])))
+        else:
+            f.write(ERROR.substitute(message="가이드 생성 정보 없음"))
+        f.write(STEP_CLOSE)
+
+        # 2단계: 채팅 시뮬레이션
+        f.write(STEP_OPEN.substitute(title="💬 2단계: 채팅 시뮬레이션"))
+        if results['chat_history']:
+            f.write(SUCCESS.substitute(message=f"총 {len(results['chat_history'])}개의 대화 턴 완료"))
+            for chat in results['chat_history']:
+                f.write(self._chat_turn(chat))
+        else:
+            f.write(ERROR.substitute(message="채팅 기록 없음 - 채팅 시뮬레이션이 실패했거나 진행되지 않았습니다."))
+            chat_errors = [error for error in results['errors'] if 'chat' in error.lower() or 'turn' in error.lower()]
+            if chat_errors:
+                items = "".join(f"<li>{_e(error)}</li>" for error in chat_errors)
+                f.write(f'<div class="error"><strong>채팅 관련 에러:</strong><ul>{items}</ul></div>\n')
+        f.write(STEP_CLOSE)
+
+        # 3단계: 답변 흐름 생성
+        f.write(STEP_OPEN.substitute(title="🔄 3단계: 답변 흐름 생성"))
+        if results['answer_flows']:
+            for flow in results['answer_flows']:
+                f.write(self._flow_block(flow))
+        else:
+            f.write(ERROR.substitute(message="답변 흐름 정보 없음"))
+        f.write(STEP_CLOSE)
+
+        # 4단계: 최종 답변 생성
+        f.write(STEP_OPEN.substitute(title="✍️ 4단계: 최종 답변 생성"))
+        if results['final_answers']:
+            for answer in results['final_answers']:
+                f.write(self._answer_block(answer))
+        else:
+            f.write(ERROR.substitute(message="최종 답변 정보 없음"))
+        f.write(STEP_CLOSE)
+
+        # 에러 로그
+        if results['errors']:
+            f.write(STEP_OPEN.substitute(title="❌ 에러 로그"))
+            for error in results['errors']:
+                f.write(f'<div class="error">{_e(error)}</div>\n')
+            f.write(STEP_CLOSE)
+
+    def _chat_turn(self, chat, preview=None):
+        question = chat.get('interviewer_question', '')
+        answer = chat.get('student_answer', '답변 없음')
+        if preview:
+            question, answer = _truncate(question, preview), _truncate(answer, preview)
+        return CHAT_TURN.substitute(
+            turn=_e(chat['turn']),
+            progress=_e(chat.get('progress', 0)),
+            timestamp=_e(chat.get('timestamp', '')),
+            reasoning=_e(chat.get('reasoning', '')),
+            question=_e(question),
+            answer=_e(answer),
+        )
+
+    def _flow_block(self, flow, preview=None):
+        text = flow['flow_text'] or '흐름 생성 실패'
+        status = (SUCCESS.substitute(message="흐름 생성 성공") if flow['success']
+                  else ERROR.substitute(message="흐름 생성 실패"))
+        return QUESTION_BLOCK.substitute(
+            number=flow['question_index'] + 1,
+            question=_e(flow['question']),
+            status=status,
+            timestamp=_e(flow['timestamp']),
+            body=PRE.substitute(text=_e(_truncate(text, preview) if preview else text)),
+        )
+
+    def _answer_block(self, answer, preview=None):
+        text = answer['answer'] or '답변 생성 실패'
+        status = (SUCCESS.substitute(message="답변 생성 성공") if answer['success']
+                  else ERROR.substitute(message="답변 생성 실패"))
+        body = "<h4>📝 최종 답변:</h4>\n" + PRE.substitute(text=_e(_truncate(text, preview) if preview else text))
+        if not preview:
+            body += "<h4>🔄 사용된 답변 흐름:</h4>\n" + PRE.substitute(text=_e(answer['flow_used'] or '흐름 정보 없음'))
+        return QUESTION_BLOCK.substitute(
+            number=answer['question_index'] + 1,
+            question=_e(answer['question']),
+            status=status,
+            timestamp=_e(answer['timestamp']),
+            body=body,
+        )
+
+    # --- 통합 리포트 ---
+
+    def write_aggregate(self, test_cases, name, dedup_summary="", case_links=None):
+        """
+        통합 리포트를 page_size개 단위 페이지로 나눠 씁니다. 페이지 경로 목록을 반환합니다.
+        case_links: case_id -> 개별 리포트 파일명 (있으면 각 케이스 제목에 링크)
+        """
+        self.ensure_stylesheet()
+        case_links = case_links or {}
+        total = len(test_cases)
+        failed = sum(1 for tc in test_cases if tc.results['errors'])
+        avg_duration = sum(tc.results.get('total_duration') or 0 for tc in test_cases) / total if total else 0.0
+        page_count = max(1, (total + self.page_size - 1) // self.page_size)
+        page_names = [f"{name}.html" if page == 0 else f"{name}_p{page + 1}.html" for page in range(page_count)]
+        summary = SUMMARY.substitute(
+            generated_at=datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S'),
+            total=total,
+            succeeded=total - failed,
+            failed=failed,
+            avg_duration=f"{avg_duration:.2f}",
+            dedup=_e(dedup_summary),
+        )
+
+        paths = []
+        for page, page_name in enumerate(page_names):
+            path = self.out_dir / page_name
+            tmp_path = path.with_name(path.name + ".tmp")
+            with self._open_page(tmp_path, f"자기소개서 생성 테스트 리포트 - {name} ({page + 1}/{page_count})") as f:
+                f.write(summary)
+                pagination = self._pagination(page_names, page)
+                f.write(pagination)
+                for test_case in test_cases[page * self.page_size:(page + 1) * self.page_size]:
+                    self._render_case_summary(f, test_case, case_links.get(test_case.case_id))
+                f.write(pagination)
+                f.write(PAGE_TAIL)
+            os.replace(tmp_path, path)
+            paths.append(path)
+        return paths
+
+    def _pagination(self, page_names, current):
+        if len(page_names) == 1:
+            return ""
+        links = []
+        for page, page_name in enumerate(page_names):
+            if page == current:
+                links.append(f'<span class="current">{page + 1}</span>')
+            else:
+                links.append(PAGE_LINK.substitute(href=_e(page_name), label=page + 1))
+        return f'<div class="pagination">{"".join(links)}</div>\n'
+
+    def _render_case_summary(self, f, test_case, link=None):
+        results = test_case.results
+        has_errors = bool(results['errors'])
+        f.write(CASE_SUMMARY_OPEN.substitute(
+            status_class="error" if has_errors else "success",
+            case_id=_e(test_case.case_id),
+            company_name=_e(test_case.company_name),
+            position_title=_e(test_case.position_title),
+            link=PAGE_LINK.substitute(href=_e(link), label="[상세]") if link else "",
+            status_text='❌ 실패' if has_errors else '✅ 성공',
+            duration=_duration(results),
+            word_limit=_e(test_case.word_limit),
+        ))
+
+        f.write(STEP_OPEN.substitute(title="📝 1단계: 가이드 생성"))
+        guide_gen = results.get('guide_generation')
+        if guide_gen and guide_gen['success']:
+            f.write(SUCCESS.substitute(message="가이드 생성 성공"))
+            f.write(PRE.substitute(text=_e(_truncate(guide_gen['guide_text'], 500))))
+        elif guide_gen:
+            f.write(ERROR.substitute(message=f"가이드 생성 실패: {_e(guide_gen.get('error', 'Unknown error'))}"))
+        f.write(STEP_CLOSE)
+
+        f.write(STEP_OPEN.substitute(title="💬 2단계: 채팅 시뮬레이션"))
+        if results['chat_history']:
+            f.write(SUCCESS.substitute(message=f"{len(results['chat_history'])}개 턴 완료"))
+            for chat in results['chat_history']:
+                f.write(self._chat_turn(chat, preview=300))
+        else:
+            f.write(ERROR.substitute(message="채팅 기록 없음"))
+        f.write(STEP_CLOSE)
+
+        f.write(STEP_OPEN.substitute(title="🔄 3단계: 답변 흐름 생성"))
+        for flow in results['answer_flows']:
+            f.write(self._flow_block(flow, preview=300))
+        f.write(STEP_CLOSE)
+
+        f.write(STEP_OPEN.substitute(title="✍️ 4단계: 최종 답변 생성"))
+        for answer in results['final_answers']:
+            f.write(self._answer_block(answer, preview=500))
+        f.write(STEP_CLOSE)
+
+        if results['errors']:
+            f.write(STEP_OPEN.substitute(title="❌ 에러 로그"))
+            for error in results['errors']:
+                f.write(f'<div class="error">{_e(error)}</div>\n')
+            f.write(STEP_CLOSE)
+
+        f.write(CASE_SUMMARY_CLOSE)
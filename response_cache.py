@@ -0,0 +1,134 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# 캐시 파일 위치 (환경 변수로 변경 가능)
+project_root = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_PATH = os.getenv(
+    "JASOSEO_CACHE_PATH",
+    os.path.join(project_root, ".cache", "response_cache.sqlite3")
+)
+
+
+def make_cache_key(*parts):
+    """
+    여러 입력값을 하나의 캐시 키 문자열로 합칩니다.
+    """
+    return "\x1f".join(str(part).strip() for part in parts)
+
+
+class ResponseCache:
+    """
+    모듈별 LLM 결과를 namespace 단위로 저장하는 SQLite 기반 캐시.
+
+    여러 스레드/프로세스(multiprocessing.Pool 워커 포함)에서 같은 파일을 공유할 수 있도록
+    요청마다 커넥션을 열고 WAL 모드를 사용합니다.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS responses (
+                            namespace TEXT NOT NULL,
+                            key TEXT NOT NULL,
+                            value TEXT NOT NULL,
+                            updated_at REAL NOT NULL,
+                            PRIMARY KEY (namespace, key)
+                        )
+                        """
+                    )
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def get_entry(self, namespace, key):
+        """
+        (value, updated_at) 튜플을 반환합니다. 없으면 None.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT value, updated_at FROM responses WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get(self, namespace, key, max_age=None):
+        """
+        캐시된 값을 반환합니다. max_age(초)보다 오래된 값은 None으로 취급합니다.
+        """
+        entry = self.get_entry(namespace, key)
+        if entry is None:
+            return None
+        value, updated_at = entry
+        if max_age is not None and time.time() - updated_at > max_age:
+            return None
+        return value
+
+    def set(self, namespace, key, value, updated_at=None):
+        """
+        값을 저장합니다. (JSON 직렬화 가능한 값만 허용)
+        """
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False),
+                 updated_at if updated_at is not None else time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, namespace, key):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM responses WHERE namespace = ? AND key = ?", (namespace, key))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def items(self, namespace):
+        """
+        namespace의 모든 (key, value, updated_at)을 반환합니다.
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT key, value, updated_at FROM responses WHERE namespace = ?",
+                (namespace,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [(key, json.loads(value), updated_at) for key, value, updated_at in rows]
+
+
+_default_cache = None
+
+
+def get_cache():
+    """
+    프로세스 전역에서 공유하는 기본 캐시 인스턴스를 반환합니다.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
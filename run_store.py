@@ -0,0 +1,105 @@
+"""
+test_all.py 실행 결과 체크포인트 저장소
+
+실행(run)마다 test_runs/<run_id>.jsonl 파일 하나에 단계 결과를 완료되는 즉시 한 줄씩 추가합니다.
+중간에 프로세스가 죽어도 이미 끝난 단계는 남아 있으므로 --resume <run_id>로 이어서 실행하거나,
+모델 호출 없이 저장된 결과만으로 리포트를 다시 만들 수 있습니다.
+
+레코드 형식: {"case_id": ..., "stage": ..., "index": ..., "data": {...}, "timestamp": ...}
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+RUNS_DIR = os.getenv("JASOSEO_RUNS_DIR", os.path.join(project_root, "test_runs"))
+
+
+def new_run_id():
+    return datetime.now().strftime("run_%Y%m%d_%H%M%S")
+
+
+def list_runs(runs_dir=RUNS_DIR):
+    """
+    저장된 run_id 목록 (오래된 순)
+    """
+    if not os.path.isdir(runs_dir):
+        return []
+    return sorted(name[:-len(".jsonl")] for name in os.listdir(runs_dir) if name.endswith(".jsonl"))
+
+
+class RunStore:
+    """
+    한 실행의 단계 결과를 JSONL로 추가 기록/조회하는 저장소
+    """
+
+    def __init__(self, run_id, runs_dir=RUNS_DIR):
+        self.run_id = run_id
+        os.makedirs(runs_dir, exist_ok=True)
+        self.path = os.path.join(runs_dir, f"{run_id}.jsonl")
+        self._lock = threading.Lock()
+        self._terminate_partial_line()
+
+    def _terminate_partial_line(self):
+        # 기록 도중 끊긴 마지막 줄 뒤에 이어 쓰지 않도록 줄바꿈을 보충합니다.
+        if not self.exists() or os.path.getsize(self.path) == 0:
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def append(self, case_id, stage, data, index=None):
+        """
+        단계 결과 한 건을 기록합니다. 디스크에 반영(fsync)된 뒤 반환합니다.
+        """
+        record = {
+            "case_id": case_id,
+            "stage": stage,
+            "index": index,
+            "data": data,
+            "timestamp": datetime.now().isoformat(),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        return record
+
+    def records(self):
+        """
+        저장된 레코드를 기록 순서대로 반환합니다. 기록 도중 끊긴 마지막 줄은 무시합니다.
+        """
+        if not self.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+    def load_cases(self):
+        """
+        case_id -> {stage: data} 또는 {stage: {index: data}} 형태로 정리한 결과.
+        같은 단계가 여러 번 기록되었으면 마지막 기록을 사용합니다.
+        """
+        cases = {}
+        for record in self.records():
+            stages = cases.setdefault(record["case_id"], {})
+            if record["index"] is None:
+                stages[record["stage"]] = record["data"]
+            else:
+                stages.setdefault(record["stage"], {})[record["index"]] = record["data"]
+        return cases
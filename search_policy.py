@@ -0,0 +1,320 @@
+"""
+웹 검색 search_context_size 선택 정책
+
+호출마다 작업 종류, 회사가 이미 조사된 적 있는지(known entity), 마지막 조사 시점(staleness)을 보고
+"low" / "medium" / "high" 중 하나를 고릅니다. 모든 웹 검색 호출의 선택 이유, 지연 시간, 비용을
+.cache/search_policy_log.jsonl에 기록해 품질/지연/비용 트레이드오프를 확인할 수 있습니다.
+
+사용법:
+    python search_policy.py --summary                          # 로그 요약
+    python search_policy.py --benchmark                        # 모든 모듈 eval.json에 대해 low/medium/high 비교
+    python search_policy.py --benchmark --tasks industry --limit 3
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from response_cache import get_cache
+from utils import track_api_cost
+from company_names import company_key
+
+SEARCH_CONTEXT_SIZES = ["low", "medium", "high"]
+
+# 작업별 기본 정책: 처음 보는 회사(unknown) / 최근 조사한 회사(known)
+TASK_POLICIES = {
+    "industry": {"unknown": "medium", "known": "low"},
+    "company_size": {"unknown": "low", "known": "low"},
+    "context_report": {"unknown": "high", "known": "medium"},
+    "commonly_asked": {"unknown": "medium", "known": "low"},
+    "question_rec": {"unknown": "medium", "known": "low"},
+    # 기업 종합 분석의 공유 조사 (네 분석이 함께 쓰므로 넓게 조사)
+    "dossier": {"unknown": "high", "known": "medium"},
+}
+
+ENTITY_NAMESPACE = "search_entities"
+# 마지막 조사 이후 이 기간이 지나면 처음 보는 회사와 같은 정책을 사용
+STALE_AFTER_SECONDS = float(os.getenv("SEARCH_POLICY_STALE_DAYS", "14")) * 24 * 3600
+# 설정 시 정책을 무시하고 항상 이 값을 사용 (예: "high")
+FORCED_SIZE = os.getenv("SEARCH_CONTEXT_SIZE")
+
+LOG_PATH = os.getenv(
+    "SEARCH_POLICY_LOG_PATH",
+    os.path.join(project_root, ".cache", "search_policy_log.jsonl")
+)
+
+_log_lock = threading.Lock()
+_local = threading.local()
+
+
+def _entity_key(company_name):
+    return company_key(company_name)
+
+
+def entity_age(company_name):
+    """
+    회사가 마지막으로 웹 검색으로 조사된 후 경과한 시간(초). 조사 기록이 없으면 None.
+    """
+    entry = get_cache().get_entry(ENTITY_NAMESPACE, _entity_key(company_name))
+    if entry is None:
+        return None
+    return time.time() - entry[1]
+
+
+def choose_search_context_size(task, company_name):
+    """
+    (search_context_size, reason)을 반환합니다.
+    """
+    if FORCED_SIZE in SEARCH_CONTEXT_SIZES:
+        return FORCED_SIZE, "forced"
+    policy = TASK_POLICIES.get(task, {"unknown": "high", "known": "medium"})
+    age = entity_age(company_name)
+    if age is None:
+        return policy["unknown"], "unknown_entity"
+    if age > STALE_AFTER_SECONDS:
+        return policy["unknown"], "stale_entity"
+    return policy["known"], "known_entity"
+
+
+def choose_batch_search_context_size(task, company_names):
+    """
+    여러 회사를 한 번에 조사하는 호출의 (search_context_size, reason).
+    가장 넓은 조사가 필요한 회사 기준으로 고릅니다.
+    """
+    choices = [choose_search_context_size(task, name) for name in company_names] or [choose_search_context_size(task, "")]
+    return max(choices, key=lambda choice: SEARCH_CONTEXT_SIZES.index(choice[0]))
+
+
+def record_search_call(task, company_name, search_context_size, reason, latency, response, model_name, success=True,
+                       known=None):
+    """
+    웹 검색 호출 결과를 로그에 남기고, 결과를 실제로 얻은 회사를 조사된(known) 상태로 표시합니다.
+    여러 회사를 한 번에 조사한 호출은 company_name에 회사명 목록을 넘깁니다.
+
+    success: 응답을 받아 유효하게 파싱했는지. 호출이 예외로 끝났으면 response=None, success=False로 기록합니다.
+    known: known으로 표시할 회사 목록 (기본: 성공이면 company_name 전체, 실패면 없음).
+           배치 호출은 응답에 유효한 결과가 있던 회사만 넘깁니다.
+    """
+    try:
+        cost = track_api_cost(response, model_name, search_context_size) if response is not None else 0.0
+    except Exception:
+        cost = 0.0
+    record = {
+        "timestamp": time.time(),
+        "task": task,
+        "company_name": company_name,
+        "search_context_size": search_context_size,
+        "reason": reason,
+        "model": model_name,
+        "latency": round(latency, 3),
+        "cost": round(cost, 6),
+        "success": bool(success),
+    }
+    _local.last_record = record
+    if known is None:
+        known = (company_name if isinstance(company_name, (list, tuple)) else [company_name]) if success else []
+    for name in known:
+        get_cache().set(ENTITY_NAMESPACE, _entity_key(name), {"company_name": name, "task": task})
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+    with _log_lock:
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+def last_call_record():
+    """
+    현재 스레드에서 마지막으로 기록된 웹 검색 호출 정보를 반환합니다.
+    reset_last_call_record() 이후 기록된 호출이 없으면 None입니다.
+    """
+    return getattr(_local, "last_record", None)
+
+
+def reset_last_call_record():
+    """
+    호출 직전에 불러서, 기록을 남기지 않은 호출(캐시 적중 등)에 이전 호출의 비용이 붙지 않게 합니다.
+    """
+    _local.last_record = None
+
+
+def summarize_log(path=LOG_PATH):
+    """
+    (task, search_context_size)별 호출 수, 평균 지연, 평균 비용, 성공률을 집계합니다.
+    """
+    groups = defaultdict(list)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    groups[(record["task"], record["search_context_size"])].append(record)
+    summary = []
+    for (task, size), records in sorted(groups.items()):
+        summary.append({
+            "task": task,
+            "search_context_size": size,
+            "calls": len(records),
+            "avg_latency": sum(r["latency"] for r in records) / len(records),
+            "avg_cost": sum(r["cost"] for r in records) / len(records),
+            "success_rate": sum(r["success"] for r in records) / len(records),
+        })
+    return summary
+
+
+# --- 벤치마크 ---
+
+def _tokens(value):
+    if isinstance(value, (list, tuple)):
+        value = " ".join(str(v) for v in value)
+    return set(str(value or "").replace(",", " ").split())
+
+
+def token_overlap(expected, predicted):
+    """
+    기대 출력 토큰 중 예측 출력에 포함된 비율 (0~1)
+    """
+    expected_tokens = _tokens(expected)
+    if not expected_tokens:
+        return 0.0
+    return len(expected_tokens & _tokens(predicted)) / len(expected_tokens)
+
+
+def _load_eval(feature, root_key):
+    from feature_modules import feature_dir
+    with open(feature_dir(feature) / "eval.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data[root_key]["examples"] if root_key else data["examples"]
+
+
+def _run_industry(module, example, size):
+    _, tags = module.classify_industry(
+        example["input"]["job_title"], example["input"]["company_name"],
+        use_local=False, search_context_size=size
+    )
+    expected = set(example["output"])
+    union = expected | set(tags)
+    return len(expected & set(tags)) / len(union) if union else 0.0
+
+
+def _run_company_size(module, example, size):
+    _, category = module.analyze_company_size(example["input"], force_refresh=True, search_context_size=size)
+    return 1.0 if category == example["output"] else 0.0
+
+
+def _run_context_report(module, example, size):
+    inputs = example["input"]
+    results = module.generate_context_report(
+        inputs["job_title"], inputs["company_name"], inputs["experience_level"], search_context_size=size,
+        force_refresh=True
+    )
+    report = results[1] if len(results) > 1 else {}
+    expected = example["output"]
+    return token_overlap(
+        expected["company_profile"]["core_values"] + expected["position_analysis"]["keywords"],
+        (report.get("company_profile", {}).get("core_values", []) +
+         report.get("position_analysis", {}).get("keywords", [])) if report else []
+    )
+
+
+def _run_commonly_asked(module, example, size):
+    inputs = example["input"]
+    expected = example["output"]["sample_questions"]
+    results = module.generate_interview_questions(
+        inputs["company_name"], inputs["job_title"], inputs["experience_level"],
+        inputs["common_questions"], len(expected), search_context_size=size
+    )
+    return token_overlap(expected, results[1])
+
+
+def _run_question_rec(module, example, size):
+    import yaml
+    from llm_gateway import create_client
+    from feature_modules import feature_dir
+    with open(feature_dir("question_rec") / "prompt.yaml", "r", encoding="utf-8") as f:
+        prompts = yaml.safe_load(f)
+    inputs = example["input"]
+    text, _ = module.generate_question_recommendation(
+        create_client(), prompts, inputs["job_title"], inputs["company_name"], inputs["experience_level"],
+        search_context_size=size
+    )
+    parsed = module.parse_question_recommendation(text) or {}
+    return token_overlap(example["output"]["recommended_question"], parsed.get("recommended_question", ""))
+
+
+# task -> (기능 키, eval.json 최상위 키, 실행/채점 함수)
+BENCHMARK_TASKS = {
+    "industry": ("industry", "industry_classification_eval", _run_industry),
+    "company_size": ("company_size", None, _run_company_size),
+    "context_report": ("jasoseo", "context_report_generation_eval", _run_context_report),
+    "commonly_asked": ("commonly_asked", "sample_question_generation_eval", _run_commonly_asked),
+    "question_rec": ("question_rec", "recommended_question_generation_eval", _run_question_rec),
+}
+
+
+def run_benchmark(tasks=None, limit=None):
+    """
+    각 모듈의 eval.json 예제를 low/medium/high로 모두 실행하여 품질/지연/비용을 비교합니다.
+    """
+    from feature_modules import load_feature_module
+    rows = []
+    for task in tasks or BENCHMARK_TASKS:
+        feature, root_key, runner = BENCHMARK_TASKS[task]
+        module = load_feature_module(feature)
+        if module is None:
+            print(f"❌ {task}: 모듈 로드 실패, 건너뜀")
+            continue
+        examples = _load_eval(feature, root_key)[:limit]
+        for size in SEARCH_CONTEXT_SIZES:
+            scores, latencies, costs = [], [], []
+            for example in examples:
+                start = time.time()
+                reset_last_call_record()
+                try:
+                    scores.append(runner(module, example, size))
+                except Exception as e:
+                    print(f"  ⚠️ {task}/{size}: {e}")
+                    scores.append(0.0)
+                latencies.append(time.time() - start)
+                record = last_call_record()
+                costs.append(record["cost"] if record else 0.0)
+            rows.append({
+                "task": task,
+                "search_context_size": size,
+                "examples": len(examples),
+                "quality": sum(scores) / len(scores) if scores else 0.0,
+                "avg_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+                "avg_cost": sum(costs) / len(costs) if costs else 0.0,
+            })
+            print(f"  {task:<15} {size:<7} 품질 {rows[-1]['quality']:.3f} | "
+                  f"평균 지연 {rows[-1]['avg_latency']:.2f}s | 평균 비용 ${rows[-1]['avg_cost']:.4f}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="search_context_size 정책 로그 요약 및 벤치마크")
+    parser.add_argument("--summary", action="store_true", help="호출 로그 요약 출력")
+    parser.add_argument("--benchmark", action="store_true", help="eval.json 기준 low/medium/high 비교 실행")
+    parser.add_argument("--tasks", nargs="*", choices=list(BENCHMARK_TASKS), help="벤치마크할 작업")
+    parser.add_argument("--limit", type=int, default=None, help="작업별 최대 예제 수")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print("🚀 search_context_size 벤치마크 시작")
+        run_benchmark(args.tasks, args.limit)
+    else:
+        for row in summarize_log():
+            print(f"{row['task']:<15} {row['search_context_size']:<7} 호출 {row['calls']:>4}회 | "
+                  f"평균 지연 {row['avg_latency']:.2f}s | 평균 비용 ${row['avg_cost']:.4f} | "
+                  f"성공률 {row['success_rate']*100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# 세션 저장소 설정 (환경 변수로 변경 가능)
+#   JASOSEO_SESSION_STORE: "memory" | "sqlite" (기본) | "redis://host:6379/0"
+#   JASOSEO_SESSION_PATH: SQLite 파일 위치
+#   JASOSEO_SESSION_TTL: 마지막 저장 이후 세션을 유지하는 시간(초)
+project_root = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SESSION_PATH = os.getenv(
+    "JASOSEO_SESSION_PATH",
+    os.path.join(project_root, ".cache", "sessions.sqlite3")
+)
+SESSION_TTL_SECONDS = int(os.getenv("JASOSEO_SESSION_TTL", str(7 * 24 * 3600)))
+
+
+def serialize_session(data):
+    """
+    세션 필드 값을 압축된 bytes로 변환합니다. (공백 없는 JSON + zlib)
+    """
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize_session(blob):
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+# 세션은 필드(info, history 등)별로 따로 저장합니다.
+# save(session_id, {"history": ...})는 넘긴 필드만 덮어쓰므로, 다른 워커가 같은 세션의
+# 다른 필드(예: 가이드 갱신으로 바뀐 info)를 동시에 저장해도 서로 지우지 않습니다.
+
+
+class MemorySessionStore:
+    """
+    프로세스 내부 dict 저장소. 워커 하나로 실행할 때나 개발용으로 사용합니다.
+    """
+
+    def __init__(self, ttl=SESSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        """저장된 필드들을 {필드: 값} dict로 반환합니다. 없거나 만료되면 None."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            fields, expires_at = entry
+            if expires_at < time.time():
+                del self._sessions[session_id]
+                return None
+            fields = dict(fields)
+        return {field: deserialize_session(blob) for field, blob in fields.items()}
+
+    def save(self, session_id, data):
+        """data에 있는 필드만 저장하고, 세션 전체의 만료 시각을 연장합니다."""
+        blobs = {field: serialize_session(value) for field, value in data.items()}
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            fields = entry[0] if entry and entry[1] >= time.time() else {}
+            fields.update(blobs)
+            self._sessions[session_id] = (fields, time.time() + self.ttl)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [session_id for session_id, (_, expires_at) in self._sessions.items() if expires_at < now]
+            for session_id in expired:
+                del self._sessions[session_id]
+        return len(expired)
+
+
+class SQLiteSessionStore:
+    """
+    로컬 SQLite 파일 저장소. 같은 서버의 여러 앱 워커 프로세스가 파일을 공유합니다.
+
+    (session_id, field)마다 한 행을 두므로 필드 하나를 저장해도 다른 필드 행은 건드리지 않습니다.
+
+    response_cache와 같이 요청마다 커넥션을 열고 WAL 모드를 사용합니다.
+    """
+
+    def __init__(self, path=DEFAULT_SESSION_PATH, ttl=SESSION_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS session_fields (
+                            session_id TEXT NOT NULL,
+                            field TEXT NOT NULL,
+                            data BLOB NOT NULL,
+                            expires_at REAL NOT NULL,
+                            PRIMARY KEY (session_id, field)
+                        )
+                        """
+                    )
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def load(self, session_id):
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT field, data FROM session_fields WHERE session_id = ? AND expires_at >= ?",
+                (session_id, time.time())
+            ).fetchall()
+        finally:
+            conn.close()
+        return {field: deserialize_session(blob) for field, blob in rows} if rows else None
+
+    def save(self, session_id, data):
+        expires_at = time.time() + self.ttl
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO session_fields (session_id, field, data, expires_at) VALUES (?, ?, ?, ?)",
+                [(session_id, field, serialize_session(value), expires_at) for field, value in data.items()]
+            )
+            # 저장하지 않은 필드도 세션과 함께 만료되도록 만료 시각을 맞춥니다.
+            conn.execute(
+                "UPDATE session_fields SET expires_at = ? WHERE session_id = ?",
+                (expires_at, session_id)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete(self, session_id):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM session_fields WHERE session_id = ?", (session_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def purge_expired(self):
+        conn = self._connect()
+        try:
+            cursor = conn.execute("DELETE FROM session_fields WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+
+class RedisSessionStore:
+    """
+    Redis 호환 서버 저장소. 여러 서버의 앱 워커가 로드 밸런서 뒤에서 세션을 공유할 때 사용합니다.
+
+    세션마다 해시 하나를 두고 필드를 해시 필드로 저장합니다. (HSET은 넘긴 필드만 바꿉니다)
+    """
+
+    KEY_PREFIX = "jasoseo:session_fields:"
+
+    def __init__(self, url, ttl=SESSION_TTL_SECONDS):
+        if redis is None:
+            raise ImportError("Redis 세션 저장소를 사용하려면 'pip install redis'가 필요합니다.")
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(url)
+
+    def load(self, session_id):
+        fields = self._client.hgetall(self.KEY_PREFIX + session_id)
+        if not fields:
+            return None
+        return {field.decode("utf-8"): deserialize_session(blob) for field, blob in fields.items()}
+
+    def save(self, session_id, data):
+        key = self.KEY_PREFIX + session_id
+        pipe = self._client.pipeline()
+        pipe.hset(key, mapping={field: serialize_session(value) for field, value in data.items()})
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def delete(self, session_id):
+        self._client.delete(self.KEY_PREFIX + session_id)
+
+    def purge_expired(self):
+        return 0  # Redis가 만료 키를 직접 지웁니다.
+
+
+def create_session_store(spec=None):
+    """
+    설정 문자열로 세션 저장소를 만듭니다. ("memory", "sqlite", "sqlite:///경로", "redis://...")
+    """
+    spec = spec or os.getenv("JASOSEO_SESSION_STORE", "sqlite")
+    if spec == "memory":
+        return MemorySessionStore()
+    if spec == "sqlite":
+        return SQLiteSessionStore()
+    if spec.startswith("sqlite:///"):
+        return SQLiteSessionStore(spec[len("sqlite:///"):])
+    if spec.startswith(("redis://", "rediss://", "unix://")):
+        return RedisSessionStore(spec)
+    raise ValueError(f"알 수 없는 세션 저장소 설정입니다: {spec}")
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """
+    프로세스 전역에서 공유하는 기본 세션 저장소 인스턴스를 반환합니다.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = create_session_store()
+        return _default_store
@@ -0,0 +1,100 @@
+"""
+단계 출력 메모이제이션 (content-addressed)
+
+단계 이름 + 입력값 + 프롬프트 파일 내용의 해시를 키로, 같은 입력의 단계 결과를 재사용합니다.
+기본은 실행(프로세스) 단위이며, cross_run=True이면 response_cache("stage_memo" namespace)에
+저장해 다음 실행에서도 재사용합니다. 프롬프트 파일이 바뀌면 키가 달라지므로 자동으로 무효화됩니다.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from collections import defaultdict
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from response_cache import get_cache
+
+CACHE_NAMESPACE = "stage_memo"
+
+_prompt_hashes = {}
+
+
+def prompt_version(prompt_path):
+    """
+    프롬프트 파일 내용의 해시 (파일이 없으면 빈 문자열)
+    """
+    if prompt_path not in _prompt_hashes:
+        try:
+            with open(prompt_path, "rb") as f:
+                _prompt_hashes[prompt_path] = hashlib.sha256(f.read()).hexdigest()[:16]
+        except OSError:
+            _prompt_hashes[prompt_path] = ""
+    return _prompt_hashes[prompt_path]
+
+
+def stage_key(stage, inputs, prompt_path=None):
+    """
+    단계 입력과 프롬프트 버전으로 만든 content-addressed 키
+    """
+    payload = json.dumps({
+        "stage": stage,
+        "inputs": inputs,
+        "prompt": prompt_version(prompt_path) if prompt_path else "",
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageMemo:
+    """
+    단계별 결과 메모. 같은 키를 동시에 계산하려는 호출은 먼저 시작한 계산이 끝날 때까지 기다립니다.
+    """
+
+    def __init__(self, cross_run=False):
+        self.cross_run = cross_run
+        self._results = {}
+        self._key_locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        # stage -> {"hits": n, "misses": n}
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def _count(self, stage, name):
+        with self._lock:
+            self.stats[stage][name] += 1
+
+    def call(self, stage, inputs, prompt_path, func, should_store=bool):
+        """
+        (result, deduplicated)를 반환합니다. 메모에 없으면 func()를 실행하고,
+        should_store(result)가 참인 결과(기본: 비어 있지 않은 결과)만 저장합니다.
+        """
+        key = stage_key(stage, inputs, prompt_path)
+        with self._lock:
+            key_lock = self._key_locks[key]
+        with key_lock:
+            if key in self._results:
+                self._count(stage, "hits")
+                return self._results[key], True
+            if self.cross_run:
+                cached = get_cache().get(CACHE_NAMESPACE, key)
+                if cached is not None:
+                    self._results[key] = cached
+                    self._count(stage, "hits")
+                    return cached, True
+            result = func()
+            self._count(stage, "misses")
+            if should_store(result):
+                self._results[key] = result
+                if self.cross_run:
+                    get_cache().set(CACHE_NAMESPACE, key, result)
+            return result, False
+
+    def summary(self):
+        """
+        {stage: {"hits", "misses"}} 스냅샷
+        """
+        with self._lock:
+            return {stage: dict(counts) for stage, counts in self.stats.items()}
@@ -0,0 +1,50 @@
+"""
+평가 / 벤치마크 실행용 임시 상태 디렉터리
+
+응답 캐시(분류 결과, 별칭 인덱스, 기업 규모 인덱스, 조사된 회사 기록)와 search_policy 로그는
+모듈을 import할 때 환경 변수로 경로를 정합니다. 평가나 벤치마크 스크립트가 프로젝트 모듈을 불러오기 전에
+isolate_state()를 부르면 그 실행의 쓰기가 모두 임시 디렉터리로 가므로, 운영 캐시와 이후 실행에 섞이지 않습니다.
+(이 모듈은 프로젝트 모듈을 import하지 않습니다)
+"""
+
+import os
+import atexit
+import shutil
+import sqlite3
+import tempfile
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+PRODUCTION_CACHE_PATH = os.getenv(
+    "JASOSEO_CACHE_PATH",
+    os.path.join(project_root, ".cache", "response_cache.sqlite3")
+)
+
+
+def _copy_sqlite(source, target):
+    """
+    WAL 모드 파일도 일관된 상태로 복사되도록 SQLite 백업 API를 사용합니다.
+    """
+    src = sqlite3.connect(source, timeout=30)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def isolate_state(prefix, copy_cache=False):
+    """
+    JASOSEO_CACHE_PATH / SEARCH_POLICY_LOG_PATH를 새 임시 디렉터리로 바꾸고 그 경로를 반환합니다.
+    copy_cache=True면 운영 응답 캐시의 복사본으로 시작합니다. (읽기는 운영 캐시와 같고 쓰기만 격리)
+    디렉터리는 프로세스가 끝날 때 지웁니다.
+    """
+    state_dir = tempfile.mkdtemp(prefix=prefix)
+    cache_path = os.path.join(state_dir, "response_cache.sqlite3")
+    if copy_cache and os.path.exists(PRODUCTION_CACHE_PATH):
+        _copy_sqlite(PRODUCTION_CACHE_PATH, cache_path)
+    os.environ["JASOSEO_CACHE_PATH"] = cache_path
+    os.environ["SEARCH_POLICY_LOG_PATH"] = os.path.join(state_dir, "search_policy_log.jsonl")
+    atexit.register(shutil.rmtree, state_dir, True)
+    print(f"🧪 임시 상태 디렉터리 사용: {state_dir}")
+    return state_dir
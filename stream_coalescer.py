@@ -0,0 +1,131 @@
+"""
+토큰 스트리밍 UI 갱신 묶기
+
+Gradio 생성기 핸들러가 청크마다 yield하면 사용자마다 토큰 하나에 메시지 하나, 컴포넌트 재렌더링 한 번이 생깁니다.
+coalesce()는 핸들러의 프레임(출력 값 목록)을 받아
+- 최소 간격(기본 1/STREAM_FPS초)이 지났거나 글자 수가 STREAM_MIN_CHARS 이상 늘었을 때만 내보내고
+- 직전에 보낸 프레임과 같은 컴포넌트는 gr.update()(변경 없음)로 바꿔 보냅니다.
+건너뛴 프레임의 컴포넌트 갱신은 다음 프레임에 컴포넌트별로 합쳐 두므로(gr.update(visible=True) 뒤에 빈 gr.update()가 와도 유지)
+마지막으로 내보내는 프레임의 화면은 묶지 않았을 때와 같습니다.
+
+사용법:
+    ai_reply_btn.click(coalesced(generate_ai_reply), ...)
+
+설정: STREAM_FPS (기본 20), STREAM_MIN_CHARS (기본 0 = 글자 수 기준 사용 안 함)
+"""
+
+import os
+import copy
+import time
+import functools
+
+try:
+    import gradio as gr
+except ImportError:
+    gr = None
+
+STREAM_FPS = float(os.getenv("STREAM_FPS", "20"))
+STREAM_MIN_CHARS = int(os.getenv("STREAM_MIN_CHARS", "0"))
+
+
+def _unchanged_marker():
+    # Gradio 4의 gr.update()는 {"__type__": "update"} dict입니다.
+    return gr.update() if gr is not None else {"__type__": "update"}
+
+
+def _as_list(frame):
+    return list(frame) if isinstance(frame, (list, tuple)) else [frame]
+
+
+def _text_size(value):
+    """
+    프레임에 담긴 문자열 길이의 합 (글자 수 기준 묶기에 사용)
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_text_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_text_size(v) for v in value)
+    return 0
+
+
+def _is_update(value):
+    return isinstance(value, dict) and value.get("__type__") == "update"
+
+
+def _merge_slot(older, newer):
+    """
+    건너뛴 프레임의 값(older) 위에 새 프레임의 값(newer)을 겹칩니다.
+    newer가 gr.update(...)면 older의 값/속성에 newer가 준 속성만 덮어쓰고, 그 외에는 newer가 그대로 이깁니다.
+    """
+    if not _is_update(newer):
+        return newer
+    merged = dict(older) if _is_update(older) else {"__type__": "update", "value": older}
+    merged.update(newer)
+    return merged
+
+
+def merge_frames(older, newer):
+    """
+    컴포넌트별로 합친 프레임 (older가 None이면 newer 그대로)
+    """
+    if older is None:
+        return newer
+    return [_merge_slot(older[i], value) if i < len(older) else value for i, value in enumerate(newer)]
+
+
+def changed_only(previous, frame, unchanged=None):
+    """
+    직전에 보낸 프레임과 값이 같은 컴포넌트를 '변경 없음' 표시로 바꾼 프레임
+    """
+    if previous is None:
+        return frame
+    marker = unchanged if unchanged is not None else _unchanged_marker()
+    return [marker if i < len(previous) and value == previous[i] else value for i, value in enumerate(frame)]
+
+
+def coalesce(frames, fps=None, min_chars=None, unchanged=None, clock=time.monotonic):
+    """
+    프레임 생성기를 fps / min_chars 기준으로 묶어 내보내는 생성기.
+    핸들러가 리스트를 제자리에서 고치므로(history 등) 보낸 프레임은 깊은 복사로 보관합니다.
+    """
+    fps = STREAM_FPS if fps is None else fps
+    min_chars = STREAM_MIN_CHARS if min_chars is None else min_chars
+    interval = 1.0 / fps if fps > 0 else 0.0
+    single = None
+    sent = None
+    sent_at = 0.0
+    sent_size = 0
+    pending = None
+    for frame in frames:
+        if single is None:
+            single = not isinstance(frame, (list, tuple))
+        # 아직 보내지 않은 프레임의 갱신(표시 여부, 값 등)이 빈 gr.update()에 덮여 사라지지 않게 합칩니다.
+        values = merge_frames(pending, _as_list(frame))
+        now = clock()
+        due = sent is None or now - sent_at >= interval
+        if not due and min_chars:
+            due = _text_size(values) - sent_size >= min_chars
+        if not due:
+            pending = values
+            continue
+        out = changed_only(sent, values, unchanged)
+        sent, sent_at, pending = copy.deepcopy(values), now, None
+        if min_chars:
+            sent_size = _text_size(values)
+        yield out[0] if single else out
+    if pending is not None:
+        out = changed_only(sent, pending, unchanged)
+        yield out[0] if single else out
+
+
+def coalesced(handler, fps=None, min_chars=None):
+    """
+    생성기 핸들러를 coalesce()로 감쌉니다. functools.wraps로 시그니처를 유지하므로
+    Gradio가 gr.Progress / gr.Request 인자를 그대로 찾습니다.
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        yield from coalesce(handler(*args, **kwargs), fps=fps, min_chars=min_chars)
+    return wrapper
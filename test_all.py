@@ -9,6 +9,7 @@ import uuid
 from pathlib import Path
 import random
 import time
+import argparse
 
 # 프로젝트 루트를 path에 추가
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '.'))
@@ -20,9 +21,25 @@ from chat.llm_functions import get_interviewer_response, get_student_response, g
 from utils import parse_json_from_response
 from guide_generation.llm_functions import generate_guide as create_guide_from_llm
 from answer_flow_generation.llm_functions import generate_answer_flow
+from llm_policy import get_metrics
+from run_store import RunStore, new_run_id
+from stage_memo import StageMemo
+from report_writer import ReportWriter, case_filename
+from company_context import cached_company_context
 
 load_dotenv()
 
+# 단계별 프롬프트 파일 (메모이제이션 키의 프롬프트 버전)
+GUIDE_PROMPT_PATH = os.path.join(project_root, 'guide_generation', 'prompt.yaml')
+FLOW_PROMPT_PATH = os.path.join(project_root, 'answer_flow_generation', 'prompt.yaml')
+CHAT_PROMPT_PATH = os.path.join(project_root, 'chat', 'prompt.yaml')
+
+# 같은 입력의 단계 결과 재사용 (--memo-cross-run 시 실행 간에도 재사용)
+stage_memo = StageMemo()
+
+# 공유 스타일시트 + 템플릿 기반 리포트 작성기
+report_writer = ReportWriter()
+
 class TestCase:
     def __init__(self, case_id, company_name, position_title, jd, questions, word_limit=300):
         self.case_id = case_id
@@ -41,6 +58,51 @@ class TestCase:
             'end_time': None,
             'total_duration': None
         }
+        self.store = None
+        # 체크포인트에서 복원된 완료 단계 (stage -> data)
+        self.completed = {}
+
+    def meta(self):
+        return {
+            'company_name': self.company_name,
+            'position_title': self.position_title,
+            'jd': self.jd,
+            'questions': self.questions,
+            'word_limit': self.word_limit
+        }
+
+    def checkpoint(self, stage, data, index=None):
+        """단계 결과를 실행 저장소에 즉시 기록합니다."""
+        if self.store is not None:
+            self.store.append(self.case_id, stage, data, index)
+
+    @classmethod
+    def from_checkpoint(cls, case_id, stages):
+        """저장된 단계 결과로 TestCase를 복원합니다."""
+        test_case = cls(case_id=case_id, **stages['case'])
+        test_case.completed = stages
+        results = test_case.results
+        guide = stages.get('guide')
+        if guide and guide['result'] and guide['result'].get('success'):
+            results['guide_generation'] = guide['result']
+            results['errors'].extend(guide['errors'])
+        # 중단된 대화도 완료된 턴까지는 이어서 사용합니다.
+        turns = stages.get('chat_turn', {})
+        results['chat_history'] = [turns[turn] for turn in sorted(turns)]
+        if 'chat' in stages:
+            results['errors'].extend(stages['chat']['errors'])
+        flows = stages.get('flow', {})
+        results['answer_flows'] = [flows[i] for i in sorted(flows)]
+        if 'flows' in stages:
+            results['errors'].extend(stages['flows']['errors'])
+        answers = stages.get('answer', {})
+        results['final_answers'] = [answers[i] for i in sorted(answers)]
+        if 'answers' in stages:
+            results['errors'].extend(stages['answers']['errors'])
+        if 'case_done' in stages:
+            for key in ('start_time', 'end_time', 'total_duration', 'errors'):
+                results[key] = stages['case_done'][key]
+        return test_case
 
 # 다양한 테스트 케이스 정의
 TEST_CASES = [
@@ -121,6 +183,9 @@ def generate_company_context(company_name, position_title):
         "recent_issue": "디지털 전환 및 혁신 진행 중",
         "core_values": "혁신성, 협업능력, 도전정신"
     })
+    context = dict(context, industry="IT/소프트웨어", company_size="대기업")
+    # 응답 캐시에 실제 분석 결과(산업/규모/컨텍스트 리포트)가 있으면 고정값 대신 사용 (LLM 호출 없음)
+    context.update(cached_company_context(company_name, position_title))
     
     return context
 
@@ -159,19 +224,21 @@ async def run_guide_generation(test_case):
         print(f"  🏢 Company: {test_case.company_name}")
         print(f"  📄 JD length: {len(test_case.jd)} characters")
         
-        guide_json, _ = create_guide_from_llm(
-            questions_str, 
-            test_case.jd, 
-            test_case.company_name, 
-            "신입"
+        guide_json, deduplicated = stage_memo.call(
+            'guide',
+            [questions_str, test_case.jd, test_case.company_name, "신입"],
+            GUIDE_PROMPT_PATH,
+            lambda: create_guide_from_llm(questions_str, test_case.jd, test_case.company_name, "신입")[0],
+            should_store=lambda result: bool(result and "guide" in result)
         )
         
         if guide_json and "guide" in guide_json:
             guide_text = guide_json["guide"]
-            print(f"  ✅ Guide generated successfully: {len(guide_text)} characters")
+            print(f"  ✅ Guide generated successfully: {len(guide_text)} characters" + (" (deduplicated)" if deduplicated else ""))
             test_case.results['guide_generation'] = {
                 'success': True,
                 'guide_text': guide_text,
+                'deduplicated': deduplicated,
                 'timestamp': datetime.now().isoformat()
             }
             return guide_text
@@ -205,10 +272,10 @@ async def run_chat_simulation(test_case, guide_text):
         # 공유 정보 설정 (example_info.json 형식에 맞춤)
         shared_info = {
             "company_name": test_case.company_name,
-            "industry": "IT/소프트웨어",
+            "industry": company_context["industry"],
             "position_title": test_case.position_title,
             "core_values": company_context["core_values"],
-            "company_size": "대기업",
+            "company_size": company_context["company_size"],
             "context_report": company_context["context_report"],
             "jd": test_case.jd,
             "recent_issue": company_context["recent_issue"],
@@ -222,13 +289,15 @@ async def run_chat_simulation(test_case, guide_text):
             "conversation": ""
         }
         
-        history = []
+        # 체크포인트에서 복원된 턴이 있으면 그 다음 턴부터 이어서 진행
+        history = [[record['student_answer'], record['interviewer_question']]
+                   for record in test_case.results['chat_history']]
         max_turns = 20  # 최대 대화 턴
         
         print(f"  🔄 {test_case.case_id}: Starting {max_turns} conversation turns...")
         
         # 대화 턴 진행
-        for turn in range(max_turns):
+        for turn in range(len(history), max_turns):
             print(f"    Turn {turn + 1}/{max_turns} processing...")
             
             try:
@@ -315,15 +384,13 @@ async def run_chat_simulation(test_case, guide_text):
                     'timestamp': datetime.now().isoformat()
                 }
                 test_case.results['chat_history'].append(chat_record)
+                test_case.checkpoint('chat_turn', chat_record, index=turn + 1)
                 
                 # 100% 달성 시 종료 (학생 답변까지 완료 후)
                 if progress >= 100:
                     print(f"      🎯 Progress reached {progress}%, ending chat simulation")
                     break
                 
-                # 잠시 대기 (API 제한 방지)
-                await asyncio.sleep(0.5)
-                
             except Exception as turn_error:
                 print(f"      ❌ Turn {turn + 1} error: {str(turn_error)}")
                 test_case.results['errors'].append(f"Turn {turn+1} error: {str(turn_error)}")
@@ -345,25 +412,33 @@ async def run_answer_flow_generation(test_case, conversation_history):
             if h[0]: conversation_str += f"학생: {h[0]}\n"
             if h[1]: conversation_str += f"AI: {h[1]}\n"
         
+        done = test_case.completed.get('flow', {})
         for i, question in enumerate(test_case.questions):
-            flow_result, _ = generate_answer_flow(
-                question=question,
-                jd=test_case.jd,
-                company_name=test_case.company_name,
-                experience_level="신입",
-                conversation=conversation_str
+            if i in done:
+                continue
+            flow_inputs = {
+                'question': question,
+                'jd': test_case.jd,
+                'company_name': test_case.company_name,
+                'experience_level': "신입",
+                'conversation': conversation_str
+            }
+            flow_result, deduplicated = stage_memo.call(
+                'flow', flow_inputs, FLOW_PROMPT_PATH,
+                lambda: generate_answer_flow(**flow_inputs)[0]
             )
             
             flow_text = flow_result.get('flow', '') if flow_result else ''
-            test_case.results['answer_flows'].append({
+            flow_record = {
                 'question_index': i,
                 'question': question,
                 'flow_text': flow_text,
                 'success': bool(flow_text),
+                'deduplicated': deduplicated,
                 'timestamp': datetime.now().isoformat()
-            })
-            
-            await asyncio.sleep(0.5)  # API 제한 방지
+            }
+            test_case.results['answer_flows'].append(flow_record)
+            test_case.checkpoint('flow', flow_record, index=i)
             
     except Exception as e:
         test_case.results['errors'].append(f"Answer flow generation error: {str(e)}")
@@ -381,10 +456,10 @@ async def run_answer_generation(test_case, conversation_history):
         
         format_info = {
             "company_name": test_case.company_name,
-            "industry": "IT/소프트웨어",
+            "industry": company_context["industry"],
             "position_title": test_case.position_title,
             "core_values": company_context["core_values"],
-            "company_size": "대기업",
+            "company_size": company_context["company_size"],
             "context_report": company_context["context_report"],
             "jd": test_case.jd,
             "recent_issue": company_context["recent_issue"],
@@ -398,16 +473,20 @@ async def run_answer_generation(test_case, conversation_history):
             "experience_level": "신입"
         }
         
+        done = test_case.completed.get('answer', {})
         for i, question in enumerate(test_case.questions):
+            if i in done:
+                continue
             # 해당 질문의 flow 가져오기
             flow_text = ""
             if i < len(test_case.results['answer_flows']):
                 flow_text = test_case.results['answer_flows'][i]['flow_text']
             
-            # 답변 생성
-            full_response = ""
-            for chunk in generate_cover_letter_response(question, [], format_info, flow_text, test_case.word_limit):
-                full_response += chunk
+            # 답변 생성 (같은 질문/대화/흐름이면 이전 결과 재사용)
+            full_response, deduplicated = stage_memo.call(
+                'answer', [question, format_info, flow_text, test_case.word_limit], CHAT_PROMPT_PATH,
+                lambda: "".join(generate_cover_letter_response(question, [], format_info, flow_text, test_case.word_limit))
+            )
             
             # 파싱
             final_data = parse_json_from_response(full_response)
@@ -416,34 +495,61 @@ async def run_answer_generation(test_case, conversation_history):
             else:
                 answer = full_response
             
-            test_case.results['final_answers'].append({
+            answer_record = {
                 'question_index': i,
                 'question': question,
                 'answer': answer,
                 'flow_used': flow_text,
                 'success': bool(answer),
+                'deduplicated': deduplicated,
                 'timestamp': datetime.now().isoformat()
-            })
-            
-            await asyncio.sleep(0.5)  # API 제한 방지
+            }
+            test_case.results['final_answers'].append(answer_record)
+            test_case.checkpoint('answer', answer_record, index=i)
             
     except Exception as e:
         test_case.results['errors'].append(f"Answer generation error: {str(e)}")
 
+async def run_stage(test_case, stage, coro_func, *args):
+    """
+    단계를 실행하고, 완료 표시와 그 단계에서 발생한 에러를 체크포인트로 남깁니다.
+    이미 완료된 단계는 건너뛰고 None을 반환합니다.
+    """
+    if stage in test_case.completed:
+        print(f"  ⏭️ {test_case.case_id}: {stage} already completed, skipping")
+        return None
+    error_count = len(test_case.results['errors'])
+    result = await coro_func(test_case, *args)
+    test_case.checkpoint(stage, {'errors': test_case.results['errors'][error_count:]})
+    return result
+
 async def process_single_case(test_case):
     """단일 테스트 케이스를 처리합니다."""
     print(f"🚀 Starting {test_case.case_id}: {test_case.company_name} - {test_case.position_title}")
     test_case.results['start_time'] = datetime.now().isoformat()
     
     try:
-        # 1단계: 가이드 생성
+        # 1단계: 가이드 생성 (실패한 가이드는 재개 시 다시 생성)
         print(f"📝 {test_case.case_id}: Guide generation...")
-        guide_text = await run_guide_generation(test_case)
+        guide = test_case.completed.get('guide')
+        if guide and guide['result'] and guide['result'].get('success'):
+            guide_text = guide['result']['guide_text']
+            print(f"  ⏭️ {test_case.case_id}: guide already completed, skipping")
+        else:
+            error_count = len(test_case.results['errors'])
+            guide_text = await run_guide_generation(test_case)
+            test_case.checkpoint('guide', {
+                'result': test_case.results['guide_generation'],
+                'errors': test_case.results['errors'][error_count:]
+            })
         print(f"  📝 Guide result: {len(guide_text)} characters")
         
         # 2단계: 채팅 시뮬레이션
         print(f"💬 {test_case.case_id}: Chat simulation...")
-        conversation_history = await run_chat_simulation(test_case, guide_text)
+        conversation_history = await run_stage(test_case, 'chat', run_chat_simulation, guide_text)
+        if conversation_history is None:
+            conversation_history = [[record['student_answer'], record['interviewer_question']]
+                                    for record in test_case.results['chat_history']]
         print(f"  💬 Chat result: {len(conversation_history)} turns, {len(test_case.results['chat_history'])} records")
         
         # 채팅 기록 확인
@@ -452,12 +558,12 @@ async def process_single_case(test_case):
         
         # 3단계: 답변 흐름 생성
         print(f"🔄 {test_case.case_id}: Answer flow generation...")
-        await run_answer_flow_generation(test_case, conversation_history)
+        await run_stage(test_case, 'flows', run_answer_flow_generation, conversation_history)
         print(f"  🔄 Flow result: {len(test_case.results['answer_flows'])} flows")
         
         # 4단계: 최종 답변 생성
         print(f"✍️ {test_case.case_id}: Final answer generation...")
-        await run_answer_generation(test_case, conversation_history)
+        await run_stage(test_case, 'answers', run_answer_generation, conversation_history)
         print(f"  ✍️ Answer result: {len(test_case.results['final_answers'])} answers")
         
         test_case.results['end_time'] = datetime.now().isoformat()
@@ -481,579 +587,108 @@ async def process_single_case(test_case):
         print(f"❌ {test_case.case_id}: Failed - {str(e)}")
         # 실패한 경우에도 HTML 생성
         generate_individual_html_report(test_case)
+        return test_case
     
+    test_case.checkpoint('case_done', {
+        key: test_case.results[key] for key in ('start_time', 'end_time', 'total_duration', 'errors')
+    })
     return test_case
 
+def report_suffix(test_case):
+    """개별 리포트 파일명 접미사 (같은 실행의 리포트는 같은 파일을 갱신)"""
+    if test_case.store is not None:
+        return test_case.store.run_id.replace("run_", "")
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
 def generate_individual_html_report(test_case):
-    """개별 테스트 케이스의 HTML 리포트를 생성합니다."""
-    # htmls 디렉토리 생성
-    htmls_dir = Path("htmls")
-    htmls_dir.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    has_errors = bool(test_case.results['errors'])
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="ko">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{test_case.case_id}: {test_case.company_name} - {test_case.position_title}</title>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-                line-height: 1.6;
-            }}
-            .header {{
-                background: linear-gradient(135deg, {'#e74c3c 0%, #c0392b 100%' if has_errors else '#667eea 0%, #764ba2 100%'});
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-                text-align: center;
-            }}
-            .info-card {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .step {{
-                background: white;
-                margin-bottom: 25px;
-                border-radius: 10px;
-                overflow: hidden;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .step-header {{
-                background: #34495e;
-                color: white;
-                padding: 15px 20px;
-                font-weight: bold;
-                font-size: 18px;
-            }}
-            .step-content {{
-                padding: 20px;
-            }}
-            .chat-turn {{
-                background: #ecf0f1;
-                padding: 15px;
-                margin: 15px 0;
-                border-radius: 8px;
-                border-left: 4px solid #3498db;
-            }}
-            .progress-bar {{
-                background: #ecf0f1;
-                height: 25px;
-                border-radius: 12px;
-                overflow: hidden;
-                margin: 10px 0;
-                position: relative;
-            }}
-            .progress-fill {{
-                background: linear-gradient(90deg, #4CAF50, #8BC34A);
-                height: 100%;
-                transition: width 0.3s ease;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                color: white;
-                font-weight: bold;
-            }}
-            .error {{
-                background: #f8d7da;
-                color: #721c24;
-                padding: 15px;
-                border-radius: 8px;
-                margin: 10px 0;
-                border-left: 4px solid #dc3545;
-            }}
-            .success {{
-                background: #d4edda;
-                color: #155724;
-                padding: 15px;
-                border-radius: 8px;
-                margin: 10px 0;
-                border-left: 4px solid #28a745;
-            }}
-            .question-answer {{
-                background: #f8f9fa;
-                padding: 20px;
-                margin: 15px 0;
-                border-radius: 8px;
-                border-left: 4px solid #007bff;
-            }}
-            .question-title {{
-                font-weight: bold;
-                color: #2c3e50;
-                margin-bottom: 10px;
-                font-size: 16px;
-            }}
-            pre {{
-                background: #f1f3f4;
-                padding: 15px;
-                border-radius: 8px;
-                overflow-x: auto;
-                white-space: pre-wrap;
-                word-wrap: break-word;
-                border: 1px solid #e9ecef;
-                font-size: 14px;
-            }}
-            .meta-info {{
-                background: #e9ecef;
-                padding: 10px 15px;
-                border-radius: 5px;
-                margin: 10px 0;
-                font-size: 14px;
-                color: #6c757d;
-            }}
-            .status-badge {{
-                display: inline-block;
-                padding: 5px 10px;
-                border-radius: 20px;
-                font-size: 12px;
-                font-weight: bold;
-                margin: 5px 0;
-            }}
-            .status-success {{
-                background: #28a745;
-                color: white;
-            }}
-            .status-error {{
-                background: #dc3545;
-                color: white;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>{'❌' if has_errors else '✅'} {test_case.case_id}</h1>
-            <h2>{test_case.company_name} - {test_case.position_title}</h2>
-            <p>생성 시간: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S')}</p>
-        </div>
-        
-        <div class="info-card">
-            <h2>📋 테스트 케이스 정보</h2>
-            <p><strong>케이스 ID:</strong> {test_case.case_id}</p>
-            <p><strong>회사명:</strong> {test_case.company_name}</p>
-            <p><strong>직무:</strong> {test_case.position_title}</p>
-            <p><strong>글자수 제한:</strong> {test_case.word_limit}자</p>
-            <p><strong>처리 시간:</strong> {test_case.results.get('total_duration', 0):.2f}초</p>
-            <p><strong>상태:</strong> <span class="status-badge {'status-error' if has_errors else 'status-success'}">{'실패' if has_errors else '성공'}</span></p>
-            
-            <h3>📄 JD (Job Description)</h3>
-            <pre>{test_case.jd}</pre>
-            
-            <h3>❓ 자기소개서 질문들</h3>
-            <ol>
-    """
-    
-    for question in test_case.questions:
-        html_content += f"<li>{question}</li>"
-    
-    html_content += """
-            </ol>
-        </div>
-    """
-    
-    # 1단계: 가이드 생성
-    html_content += """
-        <div class="step">
-            <div class="step-header">📝 1단계: 가이드 생성</div>
-            <div class="step-content">
-    """
-    guide_gen = test_case.results.get('guide_generation')
-    if guide_gen:
-        if guide_gen['success']:
-            html_content += f"""
-                <div class="success">✅ 가이드 생성 성공</div>
-                <div class="meta-info">생성 시간: {guide_gen['timestamp']}</div>
-                <pre>{guide_gen['guide_text']}</pre>
-            """
-        else:
-            html_content += f"""
-                <div class="error">❌ 가이드 생성 실패: {guide_gen.get('error', 'Unknown error')}</div>
-                <div class="meta-info">실패 시간: {guide_gen['timestamp']}</div>
-            """
-    else:
-        html_content += '<div class="error">❌ 가이드 생성 정보 없음</div>'
-    html_content += "</div></div>"
-    
-    # 2단계: 채팅 시뮬레이션
-    html_content += """
-        <div class="step">
-            <div class="step-header">💬 2단계: 채팅 시뮬레이션</div>
-            <div class="step-content">
-    """
-    if test_case.results['chat_history']:
-        html_content += f'<div class="success">✅ 총 {len(test_case.results["chat_history"])}개의 대화 턴 완료</div>'
-        for i, chat in enumerate(test_case.results['chat_history']):
-            progress = chat.get('progress', 0)
-            html_content += f"""
-                <div class="chat-turn">
-                    <h4>턴 {chat['turn']}</h4>
-                    <div class="progress-bar">
-                        <div class="progress-fill" style="width: {progress}%">{progress}%</div>
-                    </div>
-                    <div class="meta-info">시간: {chat.get('timestamp', '')}</div>
-                    <p><strong>진행률 분석:</strong> {chat.get('reasoning', '')}</p>
-                    <p><strong>면접관 질문:</strong></p>
-                    <pre>{chat.get('interviewer_question', '')}</pre>
-                    <p><strong>학생 답변:</strong></p>
-                    <pre>{chat.get('student_answer', '답변 없음')}</pre>
-                </div>
-            """
-    else:
-        html_content += '<div class="error">❌ 채팅 기록 없음 - 채팅 시뮬레이션이 실패했거나 진행되지 않았습니다.</div>'
-        # 에러 원인 분석
-        chat_errors = [error for error in test_case.results['errors'] if 'chat' in error.lower() or 'turn' in error.lower()]
-        if chat_errors:
-            html_content += '<div class="error"><strong>채팅 관련 에러:</strong><ul>'
-            for error in chat_errors:
-                html_content += f'<li>{error}</li>'
-            html_content += '</ul></div>'
-    html_content += "</div></div>"
-    
-    # 3단계: 답변 흐름 생성
-    html_content += """
-        <div class="step">
-            <div class="step-header">🔄 3단계: 답변 흐름 생성</div>
-            <div class="step-content">
-    """
-    if test_case.results['answer_flows']:
-        for flow in test_case.results['answer_flows']:
-            html_content += f"""
-                <div class="question-answer">
-                    <div class="question-title">질문 {flow['question_index'] + 1}: {flow['question']}</div>
-                    {'<div class="success">✅ 흐름 생성 성공</div>' if flow['success'] else '<div class="error">❌ 흐름 생성 실패</div>'}
-                    <div class="meta-info">생성 시간: {flow['timestamp']}</div>
-                    <pre>{flow['flow_text'] if flow['flow_text'] else '흐름 생성 실패'}</pre>
-                </div>
-            """
-    else:
-        html_content += '<div class="error">❌ 답변 흐름 정보 없음</div>'
-    html_content += "</div></div>"
-    
-    # 4단계: 최종 답변 생성
-    html_content += """
-        <div class="step">
-            <div class="step-header">✍️ 4단계: 최종 답변 생성</div>
-            <div class="step-content">
-    """
-    if test_case.results['final_answers']:
-        for answer in test_case.results['final_answers']:
-            html_content += f"""
-                <div class="question-answer">
-                    <div class="question-title">질문 {answer['question_index'] + 1}: {answer['question']}</div>
-                    {'<div class="success">✅ 답변 생성 성공</div>' if answer['success'] else '<div class="error">❌ 답변 생성 실패</div>'}
-                    <div class="meta-info">생성 시간: {answer['timestamp']}</div>
-                    
-                    <h4>📝 최종 답변:</h4>
-                    <pre>{answer['answer'] if answer['answer'] else '답변 생성 실패'}</pre>
-                    
-                    <h4>🔄 사용된 답변 흐름:</h4>
-                    <pre>{answer['flow_used'] if answer['flow_used'] else '흐름 정보 없음'}</pre>
-                </div>
-            """
+    """개별 테스트 케이스의 HTML 리포트를 생성합니다. (내용이 바뀐 경우에만 다시 렌더링)"""
+    filepath, rendered = report_writer.write_case(test_case, report_suffix(test_case))
+    if rendered:
+        print(f"📄 {test_case.case_id}: HTML 리포트 생성 완료 -> {filepath}")
     else:
-        html_content += '<div class="error">❌ 최종 답변 정보 없음</div>'
-    html_content += "</div></div>"
-    
-    # 에러 로그
-    if test_case.results['errors']:
-        html_content += """
-            <div class="step">
-                <div class="step-header">❌ 에러 로그</div>
-                <div class="step-content">
-        """
-        for error in test_case.results['errors']:
-            html_content += f'<div class="error">{error}</div>'
-        html_content += "</div></div>"
-    
-    html_content += """
-    </body>
-    </html>
-    """
-    
-    # HTML 파일 저장
-    filename = f"{test_case.case_id}_{test_case.company_name}_{timestamp}.html"
-    # 파일명에서 특수문자 제거
-    filename = "".join(c for c in filename if c.isalnum() or c in ('_', '-', '.'))
-    filepath = htmls_dir / filename
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"📄 {test_case.case_id}: HTML 리포트 생성 완료 -> {filepath}")
+        print(f"⏭️ {test_case.case_id}: 변경 없음, HTML 리포트 유지 -> {filepath}")
+    return filepath
 
-def generate_html_report(test_cases):
-    """HTML 리포트를 생성합니다."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="ko">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>자기소개서 생성 테스트 리포트 - {timestamp}</title>
-        <style>
-            body {{
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }}
-            .header {{
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                padding: 30px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-                text-align: center;
-            }}
-            .summary {{
-                background: white;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 30px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .test-case {{
-                background: white;
-                margin-bottom: 30px;
-                border-radius: 10px;
-                overflow: hidden;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .case-header {{
-                background: #2c3e50;
-                color: white;
-                padding: 20px;
-                cursor: pointer;
-            }}
-            .case-header.success {{
-                background: #27ae60;
-            }}
-            .case-header.error {{
-                background: #e74c3c;
-            }}
-            .case-content {{
-                padding: 20px;
-                display: none;
-            }}
-            .step {{
-                margin-bottom: 25px;
-                border-left: 4px solid #3498db;
-                padding-left: 15px;
-            }}
-            .step h4 {{
-                color: #2c3e50;
-                margin-bottom: 10px;
-            }}
-            .chat-turn {{
-                background: #ecf0f1;
-                padding: 10px;
-                margin: 10px 0;
-                border-radius: 5px;
-            }}
-            .progress-bar {{
-                background: #ecf0f1;
-                height: 20px;
-                border-radius: 10px;
-                overflow: hidden;
-                margin: 10px 0;
-            }}
-            .progress-fill {{
-                background: linear-gradient(90deg, #4CAF50, #8BC34A);
-                height: 100%;
-                transition: width 0.3s ease;
-            }}
-            .error {{
-                background: #f8d7da;
-                color: #721c24;
-                padding: 10px;
-                border-radius: 5px;
-                margin: 5px 0;
-            }}
-            .success {{
-                background: #d4edda;
-                color: #155724;
-                padding: 10px;
-                border-radius: 5px;
-                margin: 5px 0;
-            }}
-            .question-answer {{
-                background: #f8f9fa;
-                padding: 15px;
-                margin: 10px 0;
-                border-radius: 5px;
-                border-left: 4px solid #007bff;
-            }}
-            pre {{
-                background: #f8f9fa;
-                padding: 10px;
-                border-radius: 5px;
-                overflow-x: auto;
-                white-space: pre-wrap;
-                word-wrap: break-word;
-            }}
-        </style>
-        <script>
-            function toggleCase(caseId) {{
-                const content = document.getElementById(caseId);
-                if (content.style.display === 'none' || content.style.display === '') {{
-                    content.style.display = 'block';
-                }} else {{
-                    content.style.display = 'none';
-                }}
-            }}
-        </script>
-    </head>
-    <body>
-        <div class="header">
-            <h1>🚀 자기소개서 생성 시스템 테스트 리포트</h1>
-            <p>생성 시간: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S')}</p>
-        </div>
-        
-        <div class="summary">
-            <h2>📊 테스트 요약</h2>
-            <p><strong>총 테스트 케이스:</strong> {len(test_cases)}개</p>
-            <p><strong>성공한 케이스:</strong> {sum(1 for tc in test_cases if not tc.results['errors'])}개</p>
-            <p><strong>실패한 케이스:</strong> {sum(1 for tc in test_cases if tc.results['errors'])}개</p>
-            <p><strong>평균 처리 시간:</strong> {sum(tc.results.get('total_duration', 0) for tc in test_cases) / len(test_cases):.2f}초</p>
-            <hr>
-            <p><strong>📁 개별 상세 리포트:</strong> 각 케이스의 상세한 분석은 <strong>htmls/</strong> 디렉토리의 개별 HTML 파일에서 확인하세요</p>
-        </div>
-    """
-    
+def count_deduplicated(test_cases):
+    """단계별로 메모이제이션으로 재사용된(모델을 호출하지 않은) 결과 수를 셉니다."""
+    counts = {'guide': 0, 'flow': 0, 'answer': 0}
     for test_case in test_cases:
-        has_errors = bool(test_case.results['errors'])
-        status_class = "error" if has_errors else "success"
-        
-        html_content += f"""
-        <div class="test-case">
-            <div class="case-header {status_class}" onclick="toggleCase('{test_case.case_id}')">
-                <h3>📋 {test_case.case_id}: {test_case.company_name} - {test_case.position_title}</h3>
-                <p>상태: {'❌ 실패' if has_errors else '✅ 성공'} | 
-                   처리 시간: {test_case.results.get('total_duration', 0):.2f}초 | 
-                   글자수 제한: {test_case.word_limit}자</p>
-            </div>
-            <div class="case-content" id="{test_case.case_id}">
-        """
-        
-        # 1단계: 가이드 생성
-        html_content += """
-                <div class="step">
-                    <h4>📝 1단계: 가이드 생성</h4>
-        """
-        guide_gen = test_case.results.get('guide_generation')
-        if guide_gen:
-            if guide_gen['success']:
-                html_content += f"""
-                    <div class="success">✅ 가이드 생성 성공</div>
-                    <pre>{guide_gen['guide_text'][:500]}{'...' if len(guide_gen['guide_text']) > 500 else ''}</pre>
-                """
-            else:
-                html_content += f"""
-                    <div class="error">❌ 가이드 생성 실패: {guide_gen.get('error', 'Unknown error')}</div>
-                """
-        html_content += "</div>"
-        
-        # 2단계: 채팅 시뮬레이션
-        html_content += """
-                <div class="step">
-                    <h4>💬 2단계: 채팅 시뮬레이션</h4>
-        """
-        if test_case.results['chat_history']:
-            html_content += f'<div class="success">✅ {len(test_case.results["chat_history"])}개 턴 완료</div>'
-            for i, chat in enumerate(test_case.results['chat_history']):
-                progress = chat.get('progress', 0)
-                html_content += f"""
-                    <div class="chat-turn">
-                        <strong>턴 {chat['turn']}:</strong>
-                        <div class="progress-bar">
-                            <div class="progress-fill" style="width: {progress}%"></div>
-                        </div>
-                        <p><strong>진행률:</strong> {progress}%</p>
-                        <p><strong>이유:</strong> {chat.get('reasoning', '')}</p>
-                        <p><strong>면접관 질문:</strong> {chat.get('interviewer_question', '')}</p>
-                        <p><strong>학생 답변:</strong> {chat.get('student_answer', '')}</p>
-                    </div>
-                """
-        else:
-            html_content += '<div class="error">❌ 채팅 기록 없음</div>'
-        html_content += "</div>"
-        
-        # 3단계: 답변 흐름 생성
-        html_content += """
-                <div class="step">
-                    <h4>🔄 3단계: 답변 흐름 생성</h4>
-        """
-        for flow in test_case.results['answer_flows']:
-            html_content += f"""
-                <div class="question-answer">
-                    <h5>질문 {flow['question_index'] + 1}: {flow['question']}</h5>
-                    {'<div class="success">✅ 흐름 생성 성공</div>' if flow['success'] else '<div class="error">❌ 흐름 생성 실패</div>'}
-                    <pre>{flow['flow_text'][:300]}{'...' if len(flow['flow_text']) > 300 else ''}</pre>
-                </div>
-            """
-        html_content += "</div>"
-        
-        # 4단계: 최종 답변 생성
-        html_content += """
-                <div class="step">
-                    <h4>✍️ 4단계: 최종 답변 생성</h4>
-        """
-        for answer in test_case.results['final_answers']:
-            html_content += f"""
-                <div class="question-answer">
-                    <h5>질문 {answer['question_index'] + 1}: {answer['question']}</h5>
-                    {'<div class="success">✅ 답변 생성 성공</div>' if answer['success'] else '<div class="error">❌ 답변 생성 실패</div>'}
-                    <pre>{answer['answer'][:500]}{'...' if len(answer['answer']) > 500 else ''}</pre>
-                </div>
-            """
-        html_content += "</div>"
-        
-        # 에러 로그
-        if test_case.results['errors']:
-            html_content += """
-                <div class="step">
-                    <h4>❌ 에러 로그</h4>
-            """
-            for error in test_case.results['errors']:
-                html_content += f'<div class="error">{error}</div>'
-            html_content += "</div>"
-        
-        html_content += """
-            </div>
-        </div>
-        """
-    
-    html_content += """
-    </body>
-    </html>
-    """
-    
-    # HTML 파일 저장
-    report_filename = f"test_report_{timestamp}.html"
-    with open(report_filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        guide = test_case.results['guide_generation'] or {}
+        counts['guide'] += bool(guide.get('deduplicated'))
+        counts['flow'] += sum(bool(flow.get('deduplicated')) for flow in test_case.results['answer_flows'])
+        counts['answer'] += sum(bool(answer.get('deduplicated')) for answer in test_case.results['final_answers'])
+    return counts
+
+def format_dedup_summary(counts):
+    return f"{sum(counts.values())}회 (가이드 {counts['guide']}, 답변 흐름 {counts['flow']}, 최종 답변 {counts['answer']})"
+
+def generate_html_report(test_cases, run_id=None):
+    """통합 HTML 리포트를 생성합니다. (페이지 단위로 나눠 htmls/에 저장)"""
+    name = f"test_report_{(run_id or datetime.now().strftime('%Y%m%d_%H%M%S')).replace('run_', '')}"
+    case_links = {tc.case_id: case_filename(tc, report_suffix(tc)) for tc in test_cases}
+    paths = report_writer.write_aggregate(
+        test_cases, name,
+        dedup_summary=format_dedup_summary(count_deduplicated(test_cases)),
+        case_links=case_links
+    )
     
-    print(f"\n📄 HTML 리포트가 생성되었습니다: {report_filename}")
-    return report_filename
+    print(f"\n📄 HTML 리포트가 생성되었습니다: {paths[0]} ({len(paths)}페이지)")
+    return paths[0]
+
+def load_test_cases(store):
+    """실행 저장소에서 테스트 케이스를 복원합니다. (케이스 정의가 기록된 순서)"""
+    cases = store.load_cases()
+    return [TestCase.from_checkpoint(case_id, stages) for case_id, stages in cases.items() if 'case' in stages]
+
+def rebuild_reports(run_id):
+    """모델 호출 없이 저장된 결과만으로 개별/통합 HTML 리포트를 다시 생성합니다."""
+    store = RunStore(run_id)
+    if not store.exists():
+        print(f"❌ 실행 기록을 찾을 수 없습니다: {store.path}")
+        return None
+    test_cases = load_test_cases(store)
+    for test_case in test_cases:
+        test_case.store = store
+        generate_individual_html_report(test_case)
+    return generate_html_report(test_cases, run_id)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="자기소개서 생성 파이프라인 통합 테스트")
+    parser.add_argument("--cases", type=int, default=25, help="새 실행에서 생성할 테스트 케이스 수")
+    parser.add_argument("--resume", metavar="RUN_ID", help="중단된 실행을 이어서 진행 (완료된 단계는 건너뜀)")
+    parser.add_argument("--report-only", metavar="RUN_ID", help="저장된 결과로 리포트만 다시 생성")
+    parser.add_argument("--memo-cross-run", action="store_true", help="단계 결과 메모를 실행 간에도 재사용 (.cache)")
+    return parser.parse_args()
 
 async def main():
     """메인 실행 함수"""
-    print("🔧 테스트 케이스 생성 중...")
-    test_cases = generate_test_cases(25)
-    
-    print(f"🚀 {len(test_cases)}개의 테스트 케이스 병렬 처리 시작...")
+    args = parse_args()
+    if args.report_only:
+        rebuild_reports(args.report_only)
+        return
+    stage_memo.cross_run = args.memo_cross_run
+    
+    if args.resume:
+        store = RunStore(args.resume)
+        if not store.exists():
+            print(f"❌ 실행 기록을 찾을 수 없습니다: {store.path}")
+            return
+        test_cases = load_test_cases(store)
+        for test_case in test_cases:
+            test_case.store = store
+        print(f"♻️ {args.resume} 이어서 실행: {len(test_cases)}개 중 "
+              f"{sum('case_done' in tc.completed for tc in test_cases)}개 완료됨")
+    else:
+        print("🔧 테스트 케이스 생성 중...")
+        store = RunStore(new_run_id())
+        test_cases = generate_test_cases(args.cases)
+        for test_case in test_cases:
+            test_case.store = store
+            test_case.checkpoint('case', test_case.meta())
+        print(f"💾 실행 ID: {store.run_id} (중단 시 --resume {store.run_id})")
+    
+    pending_cases = [tc for tc in test_cases if 'case_done' not in tc.completed]
+    print(f"🚀 {len(pending_cases)}개의 테스트 케이스 병렬 처리 시작...")
     start_time = time.time()
     
     # 병렬 처리 (세마포어로 동시 실행 수 제한)
@@ -1065,7 +700,7 @@ async def main():
     
     # 모든 테스트 케이스 병렬 실행
     completed_cases = await asyncio.gather(
-        *[process_with_semaphore(tc) for tc in test_cases],
+        *[process_with_semaphore(tc) for tc in pending_cases],
         return_exceptions=True
     )
     
@@ -1074,16 +709,17 @@ async def main():
     
     print(f"\n✅ 모든 테스트 완료! 총 소요 시간: {total_time:.2f}초")
     
-    # 결과 처리
-    successful_cases = []
+    # 결과 처리 (이전 실행에서 완료된 케이스 포함)
+    successful_cases = [tc for tc in test_cases if 'case_done' in tc.completed]
     for result in completed_cases:
         if isinstance(result, Exception):
             print(f"❌ 예외 발생: {result}")
         else:
             successful_cases.append(result)
+    successful_cases.sort(key=lambda tc: tc.case_id)
     
     # HTML 리포트 생성
-    report_filename = generate_html_report(successful_cases)
+    report_filename = generate_html_report(successful_cases, store.run_id)
     
     # 간단한 통계
     success_count = sum(1 for tc in successful_cases if not tc.results['errors'])
@@ -1092,8 +728,15 @@ async def main():
     print(f"   성공: {success_count}개")
     print(f"   실패: {len(successful_cases) - success_count}개")
     print(f"   성공률: {success_count/len(successful_cases)*100:.1f}%")
+    print(f"   중복 제거된 호출: {format_dedup_summary(count_deduplicated(successful_cases))}")
+    for model, counters in get_metrics().items():
+        print(f"   [{model}] 호출 {counters.get('calls', 0)}회 | 재시도 {counters.get('retries', 0)}회 | "
+              f"실패 {counters.get('failures', 0)}회 | 차단 {counters.get('circuit_rejections', 0)}회 | "
+              f"중단 스트림 {counters.get('aborted_streams', 0)}회 (수신 토큰 {counters.get('aborted_received_tokens', 0)}, 절약 토큰 최대 {counters.get('saved_tokens_upper_bound', 0)}) | "
+              f"브레이커 {counters.get('breaker_state', 'closed')}")
     print(f"\n📁 개별 상세 리포트는 htmls/ 디렉토리에서 확인하세요")
     print(f"📄 통합 리포트: {report_filename}")
+    print(f"💾 실행 기록: {store.path}")
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+llm_policy 서킷 브레이커 회귀 테스트
+
+    python -m pytest -q test_llm_policy.py
+"""
+
+import time
+
+import pytest
+
+import llm_policy
+from llm_policy import CircuitBreaker, CircuitOpenError, call_with_policy
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _raise(error):
+    def func():
+        raise error
+    return func
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    monkeypatch.setattr(llm_policy, "backoff_delay", lambda attempt, error=None: 0.0)
+    breaker = CircuitBreaker("test-model", threshold=1, cooldown=0.05)
+    monkeypatch.setitem(llm_policy._breakers, "test-model", breaker)
+    return breaker
+
+
+def test_non_retryable_error_during_half_open_trial_closes_breaker(breaker):
+    # 503으로 열린 뒤 쿨다운이 지나고, 시험 호출이 400으로 실패
+    with pytest.raises(FakeStatusError):
+        call_with_policy("test-model", _raise(FakeStatusError(503)))
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    with pytest.raises(FakeStatusError):
+        call_with_policy("test-model", _raise(FakeStatusError(400)))
+
+    assert breaker.state == "closed"
+    assert call_with_policy("test-model", lambda: "ok") == "ok"
+
+
+def test_local_error_during_half_open_trial_releases_trial(breaker):
+    with pytest.raises(FakeStatusError):
+        call_with_policy("test-model", _raise(FakeStatusError(503)))
+    time.sleep(0.06)
+    with pytest.raises(ValueError):
+        call_with_policy("test-model", _raise(ValueError("bad input")))
+
+    assert breaker.state == "half_open"
+    assert call_with_policy("test-model", lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_trial_in_flight_rejects_concurrent_calls(breaker):
+    with pytest.raises(FakeStatusError):
+        call_with_policy("test-model", _raise(FakeStatusError(503)))
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
@@ -58,17 +58,28 @@ def track_api_cost(response, model_name, search_context_size):
             search_cost = 0.03  # $30/1000 calls = $0.03 per call
             
     generation_cost = 0
+    # Chat Completions (prompt/completion_tokens)와 Responses API (input/output_tokens) 모두 지원
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    if prompt_tokens is None:
+        prompt_tokens = getattr(usage, 'input_tokens', 0) or 0
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    if completion_tokens is None:
+        completion_tokens = getattr(usage, 'output_tokens', 0) or 0
+
     # Calculate generation cost based on model and token counts
     if model_name in ['gpt-4.1', 'gpt-4.1-2025-04-14']:
-        generation_cost = (response.usage.prompt_tokens * 0.002 / 1000) + (response.usage.completion_tokens * 0.008 / 1000)
+        generation_cost = (prompt_tokens * 0.002 / 1000) + (completion_tokens * 0.008 / 1000)
     elif model_name in ['gpt-4.1-mini', 'gpt-4.1-mini-2025-04-14']:
-        generation_cost = (response.usage.prompt_tokens * 0.0004 / 1000) + (response.usage.completion_tokens * 0.0016 / 1000)
+        generation_cost = (prompt_tokens * 0.0004 / 1000) + (completion_tokens * 0.0016 / 1000)
     elif model_name in ['gpt-4.1-nano', 'gpt-4.1-nano-2025-04-14']:
-        generation_cost = (response.usage.prompt_tokens * 0.0001 / 1000) + (response.usage.completion_tokens * 0.0004 / 1000)
+        generation_cost = (prompt_tokens * 0.0001 / 1000) + (completion_tokens * 0.0004 / 1000)
     elif model_name in ['gpt-4.5-preview', 'gpt-4.5-preview-2025-02-27']:
-        generation_cost = (response.usage.prompt_tokens * 0.075 / 1000) + (response.usage.completion_tokens * 0.15 / 1000)
+        generation_cost = (prompt_tokens * 0.075 / 1000) + (completion_tokens * 0.15 / 1000)
     elif model_name in ['gpt-4o', 'gpt-4o-2024-08-06']:
-        generation_cost = (response.usage.prompt_tokens * 0.0025 / 1000) + (response.usage.completion_tokens * 0.01 / 1000)
+        generation_cost = (prompt_tokens * 0.0025 / 1000) + (completion_tokens * 0.01 / 1000)
+    elif model_name in ['gpt-4o-mini', 'gpt-4o-mini-2024-07-18']:
+        generation_cost = (prompt_tokens * 0.00015 / 1000) + (completion_tokens * 0.0006 / 1000)
     else:
         generation_cost = 0  # Default to 0 for unknown models
         
@@ -0,0 +1,226 @@
+"""
+Gradio 이벤트용 워크로드 클래스 스케줄러
+
+웹 검색이 들어가는 긴 호출(컨텍스트 리포트, 산업 분류 등)이 짧은 일반 생성 호출의 자리를 막지 않도록
+이벤트를 워크로드 클래스로 나누고, 클래스마다 동시 실행 수 / 최대 대기열 길이를 따로 둡니다.
+- 클래스별 FIFO 대기열: 앞사람이 먼저 실행되고, 대기열이 가득 차면 바로 거절(QueueFullError)
+- 최근 처리 시간의 지수 이동 평균으로 예상 대기 시간 계산
+- stream()은 대기 중에 (대기 순번, 예상 시간) 메시지를 내보내므로 Gradio 생성기 핸들러에서 그대로 표시 가능
+
+클래스 설정은 환경 변수로 바꿀 수 있습니다. (예: WORKLOAD_WEB_SEARCH_CONCURRENCY=2, WORKLOAD_WEB_SEARCH_MAX_QUEUE=10)
+"""
+
+import os
+import math
+import time
+import threading
+from collections import deque
+
+# 클래스 이름 -> (표시 이름, 기본 동시 실행 수, 기본 최대 대기열, 초기 예상 처리 시간(초))
+WORKLOAD_DEFAULTS = {
+    "web_search": ("웹 검색", 4, 20, 30.0),
+    "generation": ("일반 생성", 8, 40, 5.0),
+    "chat_stream": ("채팅 스트리밍", 16, 64, 10.0),
+    # CSV 대량 분류 작업 자체는 한 번에 하나만 실행하고, 작업 안의 배치 호출은 web_search 슬롯을 받아 실행합니다.
+    "bulk": ("대량 분류", 1, 4, 300.0),
+}
+
+# 기능 키 -> 워크로드 클래스
+FEATURE_WORKLOADS = {
+    "commonly_asked": "web_search",
+    "question_rec": "web_search",
+    "industry": "web_search",
+    "jasoseo": "web_search",
+    "company_size": "web_search",
+    "jd_rec": "generation",
+    "dossier": "web_search",
+    "bulk": "bulk",
+}
+
+# 처리 시간 이동 평균에서 새 값의 비중
+EWMA_ALPHA = 0.3
+
+
+class QueueFullError(Exception):
+    """워크로드 클래스의 대기열이 가득 차서 요청을 받지 않은 경우"""
+
+    def __init__(self, workload):
+        super().__init__(f"{workload.label} 작업 대기열이 가득 찼습니다 ({workload.max_queue}건). 잠시 후 다시 시도해주세요.")
+        self.workload = workload.name
+
+
+class WorkloadClass:
+    """
+    한 워크로드 클래스의 동시 실행 슬롯과 FIFO 대기열
+    """
+
+    def __init__(self, name, label, concurrency, max_queue, initial_seconds):
+        self.name = name
+        self.label = label
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self.avg_seconds = initial_seconds
+        self.active = 0
+        self.waiting = deque()
+        self.completed = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self):
+        return self.concurrency + self.max_queue
+
+    def estimate_wait(self, position):
+        """
+        대기 순번(0부터)에서 실행이 시작될 때까지의 예상 시간(초)
+        """
+        return self.avg_seconds * math.ceil((position + 1) / self.concurrency)
+
+    def enqueue(self, reject_when_full=True):
+        ticket = object()
+        with self._cond:
+            if reject_when_full and len(self.waiting) >= self.max_queue and self.active >= self.concurrency:
+                self.rejected += 1
+                raise QueueFullError(self)
+            self.waiting.append(ticket)
+        return ticket
+
+    def _admit(self):
+        """
+        대기열 맨 앞 티켓에 슬롯을 줍니다. (self._cond를 잡은 상태에서 호출)
+        새 맨 앞 티켓이 poll 간격을 기다리지 않고 빈 슬롯을 바로 확인하도록 깨웁니다.
+        """
+        self.waiting.popleft()
+        self.active += 1
+        self._cond.notify_all()
+
+    def try_start(self, ticket, timeout):
+        """
+        차례가 오면 슬롯을 잡고 None, 아니면 timeout 동안 기다린 뒤 현재 대기 순번을 반환합니다.
+        """
+        with self._cond:
+            if self.waiting[0] is ticket and self.active < self.concurrency:
+                self._admit()
+                return None
+            self._cond.wait(timeout)
+            if self.waiting[0] is ticket and self.active < self.concurrency:
+                self._admit()
+                return None
+            return self.waiting.index(ticket)
+
+    def abandon(self, ticket):
+        with self._cond:
+            try:
+                self.waiting.remove(ticket)
+            except ValueError:
+                return
+            self._cond.notify_all()
+
+    def finish(self, elapsed):
+        with self._cond:
+            self.active -= 1
+            self.completed += 1
+            self.avg_seconds = EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * self.avg_seconds
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "label": self.label,
+                "active": self.active,
+                "concurrency": self.concurrency,
+                "waiting": len(self.waiting),
+                "max_queue": self.max_queue,
+                "avg_seconds": self.avg_seconds,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+class WorkloadScheduler:
+    def __init__(self, defaults=None):
+        self.classes = {}
+        for name, (label, concurrency, max_queue, initial_seconds) in (defaults or WORKLOAD_DEFAULTS).items():
+            prefix = f"WORKLOAD_{name.upper()}"
+            self.classes[name] = WorkloadClass(
+                name, label,
+                int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+                int(os.getenv(f"{prefix}_MAX_QUEUE", max_queue)),
+                initial_seconds,
+            )
+
+    def capacity(self, name):
+        """
+        Gradio 이벤트의 concurrency_limit로 쓸 값. 실행 중 + 대기 중인 요청이 모두 워커를 차지하므로 둘을 더합니다.
+        """
+        return self.classes[name].capacity
+
+    def total_capacity(self):
+        return sum(workload.capacity for workload in self.classes.values())
+
+    def stream(self, name, func, *args, poll_interval=1.0, iterate=False, reject_when_full=True, **kwargs):
+        """
+        func를 클래스 슬롯 안에서 실행하는 생성기.
+        대기 중에는 ("queued", (순번, 예상 대기 초)), 끝나면 ("done", 결과)를 내보냅니다.
+        iterate=True면 func가 돌려준 이터러블의 값을 ("partial", 값)으로 내보내는 동안 슬롯을 유지합니다.
+        생성기가 중간에 닫히면(사용자가 나감) 대기열에서 빠집니다.
+        reject_when_full=False면 대기열이 가득 차도 거절하지 않고 줄을 섭니다. (이미 받아들인 작업의 내부 호출용)
+        """
+        workload = self.classes[name]
+        ticket = workload.enqueue(reject_when_full)
+        try:
+            while True:
+                position = workload.try_start(ticket, poll_interval)
+                if position is None:
+                    break
+                yield "queued", (position + 1, workload.estimate_wait(position))
+        except BaseException:
+            workload.abandon(ticket)
+            raise
+
+        start = time.perf_counter()
+        try:
+            if iterate:
+                for value in func(*args, **kwargs):
+                    yield "partial", value
+                return
+            result = func(*args, **kwargs)
+        finally:
+            workload.finish(time.perf_counter() - start)
+        yield "done", result
+
+    def run(self, name, func, *args, **kwargs):
+        """
+        대기 상태 표시 없이 실행하고 결과만 반환합니다.
+        """
+        result = None
+        for kind, value in self.stream(name, func, *args, **kwargs):
+            if kind == "done":
+                result = value
+        return result
+
+    def format_status(self):
+        lines = ["| 작업 종류 | 실행 중 | 대기 | 평균 처리 시간 | 완료 | 거절 |", "|---|---|---|---|---|---|"]
+        for workload in self.classes.values():
+            s = workload.snapshot()
+            lines.append(
+                f"| {s['label']} | {s['active']}/{s['concurrency']} | {s['waiting']}/{s['max_queue']} | "
+                f"{s['avg_seconds']:.1f}초 | {s['completed']} | {s['rejected']} |"
+            )
+        return "\n".join(lines)
+
+
+def format_wait_message(position, eta_seconds):
+    return f"⏳ 대기 중입니다: {position}번째, 예상 대기 약 {math.ceil(eta_seconds)}초"
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WorkloadScheduler()
+        return _scheduler